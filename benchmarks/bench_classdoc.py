@@ -0,0 +1,64 @@
+"""Construction time and peak memory of ClassDoc for large classes.
+
+Builds a class with many documented methods and properties and measures
+`ClassDoc` and `SphinxClassDoc`, with ``show_class_members`` on, with and
+without reading every member description afterwards.
+
+Run as ``python benchmarks/bench_classdoc.py [n_members]``.
+
+"""
+from __future__ import division, absolute_import, print_function
+
+import os
+import sys
+import timeit
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from numpydoc.docscrape import ClassDoc
+from numpydoc.docscrape_sphinx import SphinxClassDoc
+
+from corpus import SYNTHETIC
+
+
+def make_class(n_members):
+    namespace = {'__doc__': 'A class with many members.'}
+    for i in range(n_members // 2):
+        def method(self):
+            pass
+        method.__doc__ = SYNTHETIC
+        namespace['method_%d' % i] = method
+        namespace['prop_%d' % i] = property(lambda self: None, doc=SYNTHETIC)
+    return type('Big', (object,), namespace)
+
+
+def read_all(doc):
+    for field in ('Methods', 'Attributes'):
+        for name, type_, desc in doc[field]:
+            list(desc)
+    return doc
+
+
+def bench(label, func, number):
+    best = min(timeit.repeat(func, number=number, repeat=5)) / number
+    tracemalloc.start()
+    func()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    print('%-32s %10.2f ms %10.1f KiB' % (label, best * 1e3, peak / 1024))
+
+
+def main(n_members=500, number=20):
+    cls = make_class(n_members)
+    config = {'show_class_members': True}
+    print('%d members' % n_members)
+    bench('ClassDoc', lambda: ClassDoc(cls, config=config), number)
+    bench('ClassDoc, descriptions read',
+          lambda: read_all(ClassDoc(cls, config=config)), number)
+    bench('SphinxClassDoc + str',
+          lambda: str(SphinxClassDoc(cls, config=config)), number)
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
@@ -0,0 +1,58 @@
+"""Read-phase cost of the reStructuredText and docutils node backends.
+
+For each docstring of the corpus, compares parsing it with numpydoc,
+rendering reStructuredText and parsing that with docutils (what happens
+when Sphinx reads an autodoc page) against building the nodes directly
+with ``numpydoc.docscrape_docutils``.
+
+Run as ``python benchmarks/bench_docutils.py``.
+
+"""
+from __future__ import division, absolute_import, print_function
+
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from numpydoc.docscrape_sphinx import SphinxDocString, load_template
+from numpydoc.docscrape_docutils import (DocutilsDocString, parse_rst,
+                                         get_default_settings, Parser)
+
+from corpus import docstrings
+
+
+def bench(label, func, number):
+    best = min(timeit.repeat(func, number=number, repeat=5)) / number
+    print('%-28s %10.2f ms' % (label, best * 1e3))
+    return best
+
+
+def main(number=20):
+    texts = docstrings()
+    config = {'template': load_template()}
+    settings = get_default_settings(Parser)
+    settings.report_level = 5
+    settings.halt_level = 5
+    settings.warning_stream = open(os.devnull, 'w')
+
+    def rst_path():
+        for text in texts:
+            rst = str(SphinxDocString(text, config=config))
+            parse_rst(rst.split('\n'), settings=settings)
+
+    def nodes_path():
+        for text in texts:
+            DocutilsDocString(text, config=config).to_nodes(settings=settings)
+
+    print('%d docstrings, per-corpus times' % len(texts))
+    bench('parse only', lambda: [SphinxDocString(t, config=config)
+                                 for t in texts], number)
+    rst = bench('rst + docutils parse', rst_path, number)
+    direct = bench('docutils nodes', nodes_path, number)
+    print('%-28s %10.2fx' % ('speedup', rst / direct))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,69 @@
+"""Per-docstring time of the Markdown, HTML and terminal renderers.
+
+For each format, measures parsing plus rendering, rendering an already
+parsed docstring and a cached `numpydoc.render.render` call, averaged over
+the docstrings of the corpus.  For the reStructuredText output of the Sphinx
+extension, measures loading the docstring template with and without a
+bytecode cache, and rendering through a sandboxed or a trusted template.
+
+Run as ``python benchmarks/bench_render.py``.
+
+"""
+from __future__ import division, absolute_import, print_function
+
+import os
+import shutil
+import sys
+import tempfile
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from numpydoc.docscrape import NumpyDocString
+from numpydoc.docscrape_sphinx import SphinxDocString, load_template
+from numpydoc.render import RENDERERS, render
+
+from corpus import docstrings
+
+
+def bench(label, func, number, count):
+    best = min(timeit.repeat(func, number=number, repeat=5)) / number
+    print('%-28s %10.1f us' % (label, best / count * 1e6))
+
+
+def main(number=200):
+    texts = docstrings()
+    docs = [NumpyDocString(text) for text in texts]
+    print('%d docstrings, per-docstring times' % len(texts))
+    bench('parse', lambda: [NumpyDocString(t) for t in texts], number,
+          len(texts))
+    for fmt, cls in RENDERERS.items():
+        bench('%s: parse + render' % fmt,
+              lambda: [cls(NumpyDocString(t)).render() for t in texts],
+              number, len(texts))
+        bench('%s: render' % fmt,
+              lambda: [cls(doc).render() for doc in docs], number,
+              len(texts))
+        bench('%s: cached' % fmt, lambda: [render(t, fmt) for t in texts],
+              number, len(texts))
+    bench_templates(texts, number)
+
+
+def bench_templates(texts, number):
+    cache_dir = tempfile.mkdtemp()
+    try:
+        bench('template: compile', load_template, 20, 1)
+        load_template(cache_dir=cache_dir)
+        bench('template: bytecode cache',
+              lambda: load_template(cache_dir=cache_dir), 20, 1)
+    finally:
+        shutil.rmtree(cache_dir)
+    for label, trusted in (('sandboxed', False), ('trusted', True)):
+        config = {'template': load_template(trusted=trusted)}
+        docs = [SphinxDocString(text, config=config) for text in texts]
+        bench('rst: render, %s' % label,
+              lambda: [str(doc) for doc in docs], number, len(texts))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,64 @@
+"""Round-trip and throughput of serialized parsed docstrings.
+
+Compares re-parsing the docstring text with restoring it from the binary
+encoding of ``numpydoc.serialize``, JSON of ``NumpyDocString.to_dict`` and
+a pickle of the whole parsed object.
+
+Run as ``python benchmarks/bench_serialize.py``.
+
+"""
+from __future__ import division, absolute_import, print_function
+
+import json
+import os
+import pickle
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from numpydoc.docscrape import NumpyDocString
+from numpydoc import serialize
+
+from corpus import docstrings
+
+
+def bench(label, func, number):
+    best = min(timeit.repeat(func, number=number, repeat=5)) / number
+    print('%-28s %10.1f us' % (label, best * 1e6))
+
+
+def main(number=200):
+    texts = docstrings()
+    docs = [NumpyDocString(text) for text in texts]
+
+    # round trip
+    for doc in docs:
+        assert dict(serialize.loads(serialize.dumps(doc))) == dict(doc)
+        assert dict(NumpyDocString.from_dict(doc.to_dict())) == dict(doc)
+
+    encoded = [serialize.dumps(doc) for doc in docs]
+    dicts = [json.dumps(doc.to_dict()) for doc in docs]
+    pickled = [pickle.dumps(doc, -1) for doc in docs]
+
+    print('%d docstrings, per-corpus times' % len(texts))
+    print('%-28s %10s' % ('size: text', sum(len(t.encode('utf-8'))
+                                            for t in texts)))
+    print('%-28s %10s' % ('size: binary', sum(len(e) for e in encoded)))
+    print('%-28s %10s' % ('size: json', sum(len(d) for d in dicts)))
+    print('%-28s %10s' % ('size: pickle', sum(len(p) for p in pickled)))
+
+    bench('parse', lambda: [NumpyDocString(t) for t in texts], number)
+    bench('binary dumps', lambda: [serialize.dumps(d) for d in docs], number)
+    bench('binary decode', lambda: [serialize.decode(e) for e in encoded],
+          number)
+    bench('binary loads', lambda: [serialize.loads(e) for e in encoded],
+          number)
+    bench('json loads + from_dict',
+          lambda: [NumpyDocString.from_dict(json.loads(d)) for d in dicts],
+          number)
+    bench('pickle loads', lambda: [pickle.loads(p) for p in pickled], number)
+
+
+if __name__ == '__main__':
+    main()
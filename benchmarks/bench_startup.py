@@ -0,0 +1,199 @@
+"""Import time and first-call latency of numpydoc.
+
+Each measurement runs in a fresh interpreter, repeated a few times keeping
+the fastest:
+
+- ``import``: cumulative ``python -X importtime`` of the ``numpydoc``
+  package and of each of its modules, including the packages they pull in
+  (Sphinx, docutils, Jinja, ...).  The package itself only loads the
+  Sphinx extension when ``setup`` is called, so that Sphinx is not part of
+  the import time of the modules that do not need it;
+- ``render``: the first ``str(get_doc_object(...))`` of a process, which
+  compiles the docstring template, then the same call again;
+- ``setup``: loading the extension into a minimal Sphinx project with
+  autodoc, i.e. importing ``numpydoc.numpydoc`` once Sphinx is imported,
+  and running ``numpydoc.setup(app)``.
+
+Times are divided by the import time of a reference module,
+``docutils.core``, measured in the same way, so that baselines recorded on
+one machine carry over to others.  These ratios are compared with those
+stored in ``startup_baseline.json`` and the script exits with status 1 if
+any got larger by more than the tolerance.  Record new baselines with
+``--update``.
+
+Run as ``python benchmarks/bench_startup.py [--update]``.
+
+"""
+from __future__ import division, absolute_import, print_function
+
+import argparse
+import json
+import os
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                        'startup_baseline.json')
+
+REFERENCE = 'docutils.core'
+
+MODULES = ['diagnostics', 'docscrape', 'docscrape_sphinx',
+           'docscrape_docutils', 'numpydoc', 'nameindex', 'prefetch',
+           'render', 'serialize', 'docdb', 'validate', 'examples', 'server']
+
+RENDER_SCRIPT = """
+import timeit
+from numpydoc.docscrape_sphinx import get_doc_object, load_template
+
+times = []
+for i in range(2):
+    start = timeit.default_timer()
+    str(get_doc_object(load_template, 'function'))
+    times.append(timeit.default_timer() - start)
+print(*times)
+"""
+
+SETUP_SCRIPT = """
+import sys
+import timeit
+from sphinx.application import Sphinx
+
+src, out = sys.argv[1:3]
+app = Sphinx(src, src, out, out + '/.doctrees', 'html', status=None,
+             warning=None)
+start = timeit.default_timer()
+import numpydoc.numpydoc
+imported = timeit.default_timer()
+app.setup_extension('numpydoc')
+print(imported - start, timeit.default_timer() - imported)
+"""
+
+_importtime_re = re.compile(r'^import time:\s+(\d+) \|\s+(\d+) \|(\s*)(\S+)')
+
+
+def _run(args, env=None):
+    full_env = dict(os.environ)
+    full_env['PYTHONPATH'] = os.pathsep.join(
+        [ROOT] + [p for p in [full_env.get('PYTHONPATH')] if p])
+    full_env.update(env or {})
+    proc = subprocess.Popen([sys.executable] + args, stdout=subprocess.PIPE,
+                            stderr=subprocess.PIPE, env=full_env,
+                            universal_newlines=True)
+    out, err = proc.communicate()
+    if proc.returncode:
+        raise RuntimeError('%s failed:\n%s' % (' '.join(args), err))
+    return out, err
+
+
+def import_time(module):
+    """Cumulative import time of ``module``, in seconds"""
+    out, err = _run(['-X', 'importtime', '-c', 'import ' + module])
+    for line in err.splitlines():
+        m = _importtime_re.match(line)
+        # the top-level entry, which includes the imports it triggered
+        if m and m.group(4) == module and len(m.group(3)) == 1:
+            return int(m.group(2)) * 1e-6
+    raise RuntimeError('no import time reported for %s' % module)
+
+
+def render_times():
+    """Time of the first and second render in a new process"""
+    out, err = _run(['-c', RENDER_SCRIPT])
+    cold, warm = out.split()
+    return float(cold), float(warm)
+
+
+def setup_times(project_dir):
+    """Time of importing numpydoc and of setup(app) in a Sphinx project"""
+    out, err = _run(['-c', SETUP_SCRIPT, project_dir,
+                     os.path.join(project_dir, '_build')])
+    imported, setup = out.split()[-2:]
+    return float(imported), float(setup)
+
+
+def measure(repeat=5):
+    """Fastest times over ``repeat`` processes, by measurement name"""
+    results = {}
+
+    def keep(name, value):
+        results[name] = min(value, results.get(name, value))
+
+    project_dir = tempfile.mkdtemp()
+    try:
+        with open(os.path.join(project_dir, 'conf.py'), 'w') as f:
+            # numpydoc connects to the events of autodoc
+            f.write("extensions = ['sphinx.ext.autodoc']\n")
+        with open(os.path.join(project_dir, 'index.rst'), 'w') as f:
+            f.write('Test\n====\n')
+        for i in range(repeat):
+            keep('reference', import_time(REFERENCE))
+            keep('import: numpydoc', import_time('numpydoc'))
+            for module in MODULES:
+                keep('import: numpydoc.%s' % module,
+                     import_time('numpydoc.' + module))
+            cold, warm = render_times()
+            keep('render: first (cold)', cold)
+            keep('render: second (warm)', warm)
+            imported, setup = setup_times(project_dir)
+            keep('setup: import in sphinx project', imported)
+            keep('setup: setup(app)', setup)
+    finally:
+        shutil.rmtree(project_dir)
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--update', action='store_true',
+                        help='store the times as the new baseline')
+    parser.add_argument('--tolerance', type=float, default=1.5,
+                        help='slowdown factor reported as a regression '
+                             '(default: %(default)s)')
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args(argv)
+
+    if sys.version_info < (3, 7):
+        parser.error('-X importtime needs Python 3.7 or later')
+
+    results = measure(args.repeat)
+    reference = results.pop('reference')
+    ratios = dict((name, value / reference)
+                  for name, value in results.items())
+    baseline = {}
+    if os.path.exists(BASELINE):
+        with open(BASELINE) as f:
+            baseline = json.load(f)
+
+    regressions = []
+    print('reference, import %s: %.1f ms' % (REFERENCE, reference * 1e3))
+    print('%-36s %10s %10s %10s' % ('', 'ms', 'ratio', 'baseline'))
+    for name in sorted(results):
+        ratio = ratios[name]
+        base = baseline.get(name)
+        flag = ''
+        if base is not None and ratio > base * args.tolerance:
+            flag = '  REGRESSION'
+            regressions.append(name)
+        print('%-36s %10.1f %10.3f %10s%s'
+              % (name, results[name] * 1e3, ratio,
+                 '' if base is None else '%.3f' % base, flag))
+
+    if args.update:
+        with open(BASELINE, 'w') as f:
+            json.dump(dict((name, round(ratio, 4))
+                           for name, ratio in ratios.items()),
+                      f, indent=1, sort_keys=True)
+            f.write('\n')
+        print('baseline written to %s' % BASELINE)
+    elif regressions:
+        print('%d startup regressions' % len(regressions))
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
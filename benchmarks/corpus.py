@@ -0,0 +1,80 @@
+"""Docstrings shared by the benchmarks.
+
+The docstrings of ``doc/example.py`` are read from its source, so that
+neither numpy nor matplotlib need to be installed, and are combined with
+a synthetic docstring exercising every section.
+
+"""
+from __future__ import division, absolute_import, print_function
+
+import ast
+import io
+import os
+import textwrap
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SYNTHETIC = '''
+    Summary line of a synthetic docstring.
+
+    Extended summary, referring to `x` and to a citation [1]_.
+
+    Parameters
+    ----------
+    x : (N,) array_like
+        Input values.  The description of this parameter is long enough
+        to span a couple of lines.
+    axis : int, optional
+        Axis along which to operate.
+    out : ndarray, optional
+        Alternative output array.
+
+    Returns
+    -------
+    y : ndarray
+        The result.
+
+    Raises
+    ------
+    ValueError
+        If ``x`` is empty.
+
+    See Also
+    --------
+    numpy.sum : Sum of elements.
+    numpy.mean, numpy.median, :func:`numpy.std`
+
+    Notes
+    -----
+    Some notes, with an equation:
+
+    .. math:: y = \\sum_i x_i
+
+    References
+    ----------
+    .. [1] Someone, "Something", 2001.
+
+    Examples
+    --------
+    >>> synthetic([1, 2, 3])
+    6
+    '''
+
+
+def example_docstrings():
+    """Docstrings of the functions and classes in doc/example.py"""
+    with io.open(os.path.join(ROOT, 'doc', 'example.py'),
+                 encoding='utf-8') as f:
+        tree = ast.parse(f.read())
+    docs = []
+    for node in ast.walk(tree):
+        if isinstance(node, (ast.FunctionDef, ast.ClassDef)):
+            doc = ast.get_docstring(node)
+            if doc:
+                docs.append(doc)
+    return docs
+
+
+def docstrings():
+    """All benchmark docstrings"""
+    return example_docstrings() + [textwrap.dedent(SYNTHETIC)]
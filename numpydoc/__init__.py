@@ -2,4 +2,9 @@ from __future__ import division, absolute_import, print_function
 
 __version__ = '0.8.0.dev0'
 
-from .numpydoc import setup
+
+def setup(app, *args, **kwargs):
+    # Sphinx is only imported when the extension is loaded, so that the
+    # docstring parsers and renderers can be used without it
+    from .numpydoc import setup
+    return setup(app, *args, **kwargs)
@@ -0,0 +1,175 @@
+"""Collect docstring problems and report them in batches.
+
+Emitting every problem through :func:`warnings.warn` as soon as it is found
+is slow for large builds and loses information, since the warnings machinery
+deduplicates messages.  A :class:`DiagnosticsCollector` instead records each
+problem together with the location of the offending object, and emits the
+whole lot at once, either through a Sphinx-style ``warn`` callable or as JSON.
+
+"""
+from __future__ import division, absolute_import, print_function
+
+import collections
+import inspect
+import json
+import linecache
+import re
+import sys
+
+
+Diagnostic = collections.namedtuple('Diagnostic',
+                                    ['obj', 'file', 'line', 'code', 'message'])
+
+
+# module name -> source file name, or None if it could not be determined
+_module_files = {}
+
+
+def _module_source_file(modname):
+    try:
+        return _module_files[modname]
+    except KeyError:
+        pass
+    module = sys.modules.get(modname)
+    if module is None:
+        return None  # not imported yet, which may change
+    try:
+        filename = inspect.getsourcefile(module)
+    except TypeError:
+        filename = None
+    _module_files[modname] = filename
+    return filename
+
+
+def clear_cache():
+    """Forget the source files of modules, which may have moved since"""
+    _module_files.clear()
+
+
+def _object_line(obj, filename):
+    func = getattr(obj, '__func__', obj)
+    func = getattr(func, 'fget', func)  # properties
+    code = getattr(func, '__code__', None)
+    if code is not None:
+        return code.co_firstlineno
+    name = getattr(obj, '__name__', None)
+    if inspect.isclass(obj) and name and filename:
+        # ``inspect.findsource`` re-reads and re-scans the file each time;
+        # the lines cached by linecache are enough for a best-effort guess.
+        class_re = re.compile(r'\s*class\s+%s\b' % re.escape(name))
+        for i, line in enumerate(linecache.getlines(filename)):
+            if class_re.match(line):
+                return i + 1
+    return None
+
+
+def source_location(obj):
+    """Find where ``obj`` is defined.
+
+    Source file lookups are cached per module, so this is cheap to call
+    for every problem found.
+
+    Parameters
+    ----------
+    obj : object
+        Documented object.
+
+    Returns
+    -------
+    filename : str or None
+    line : int or None
+        One-based line number of the definition, if it could be determined.
+    """
+    modname = getattr(obj, '__module__', None)
+    if inspect.ismodule(obj):
+        modname = obj.__name__
+    if not modname:
+        return None, None
+    filename = _module_source_file(modname)
+    if filename is None or inspect.ismodule(obj):
+        return filename, None
+    return filename, _object_line(obj, filename)
+
+
+def _object_name(obj):
+    if obj is None:
+        return None
+    modname = getattr(obj, '__module__', None)
+    name = getattr(obj, '__qualname__', getattr(obj, '__name__', None))
+    if name is None:
+        return repr(obj)
+    if modname and not inspect.ismodule(obj):
+        return '%s.%s' % (modname, name)
+    return name
+
+
+class DiagnosticsCollector(object):
+    """Accumulate docstring diagnostics for batched reporting.
+
+    Entries only hold names and locations, never the documented objects
+    themselves, so a collector can be pickled along with the Sphinx
+    environment.
+
+    """
+    def __init__(self):
+        self._entries = []
+
+    def add(self, obj, code, message, location=None):
+        """Record a problem with the docstring of ``obj``.
+
+        Parameters
+        ----------
+        obj : object or None
+            The documented object, if known.
+        code : str
+            Short machine-readable identifier such as ``'unknown-section'``.
+        message : str
+            Human-readable description of the problem.
+        location : tuple, optional
+            ``source_location(obj)``, if already known.
+        """
+        filename, line = location or source_location(obj)
+        self._entries.append(Diagnostic(_object_name(obj), filename, line,
+                                        code, message))
+
+    def extend(self, other):
+        self._entries.extend(other)
+
+    def clear(self):
+        del self._entries[:]
+
+    def __iter__(self):
+        return iter(self._entries)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def by_code(self):
+        """Group the recorded diagnostics by their code"""
+        groups = collections.OrderedDict()
+        for entry in self._entries:
+            groups.setdefault(entry.code, []).append(entry)
+        return groups
+
+    def to_json(self, **kwargs):
+        return json.dumps([entry._asdict() for entry in self._entries],
+                          **kwargs)
+
+    def emit(self, warn):
+        """Report all recorded diagnostics, grouped by code.
+
+        Parameters
+        ----------
+        warn : callable
+            Called as ``warn(message, location)`` once per diagnostic,
+            where location is ``'file:line'``, ``'file'`` or None.
+        """
+        for code, entries in self.by_code().items():
+            for entry in entries:
+                location = entry.file
+                if location and entry.line:
+                    location = '%s:%d' % (location, entry.line)
+                message = '[numpydoc.%s] %s' % (code, entry.message)
+                if entry.obj:
+                    message += ' (in %s)' % entry.obj
+                warn(message, location)
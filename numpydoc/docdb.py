@@ -0,0 +1,267 @@
+"""Memory-mapped database of parsed and rendered docstrings.
+
+A package is parsed once with :func:`build_database`, which writes all
+parsed sections (in the :mod:`numpydoc.serialize` encoding) and rendered
+reStructuredText to a single file.  :class:`DocDatabase` then looks up any
+``module.Class.method`` by binary search over a sorted index in the
+memory-mapped file, without importing the documented package, and only
+decodes the entries that are asked for.
+
+The file layout, with all integers little-endian, is::
+
+    header    magic b'NPDB', version (1 byte), 3 padding bytes,
+              entry count (uint32), index offset (uint64)
+    data      names, encoded sections and rendered text, back to back
+    index     one record per entry, sorted by name: name offset (uint64),
+              name length (uint32), sections offset (uint64), sections
+              length (uint32), rendered offset (uint64), rendered length
+              (uint32)
+
+Building and querying from the command line::
+
+    python -m numpydoc.docdb build mypackage mypackage.npdb
+    python -m numpydoc.docdb show mypackage.npdb mypackage.func --rendered
+
+``build`` lists modules that cannot be imported and docstrings that cannot
+be parsed on standard error, and then exits with status 1.
+
+"""
+from __future__ import division, absolute_import, print_function
+
+import argparse
+import importlib
+import mmap
+import struct
+import sys
+
+from .docscrape import NumpyDocString
+from . import serialize
+
+MAGIC = b'NPDB'
+VERSION = 1
+
+_header = struct.Struct('<4sB3xIQ')
+_record = struct.Struct('<QIQIQI')
+
+
+def _error(e):
+    return '%s: %s' % (type(e).__name__, e)
+
+
+def _iter_entries(package, config, errors):
+    """Parse and render all public objects of ``package``"""
+    from .docscrape_sphinx import get_doc_object
+    from .validate import iter_modules, iter_public_objects
+
+    for modname, filename in iter_modules(package):
+        try:
+            module = importlib.import_module(modname)
+        except Exception as e:
+            errors.append((modname, _error(e)))
+            continue
+        objects = [(modname, module)] + list(iter_public_objects(module))
+        for name, obj in objects:
+            try:
+                doc = get_doc_object(obj, config=dict(config))
+                rendered = str(doc)
+            except Exception as e:
+                # one broken object should not abort the whole build
+                errors.append((name, _error(e)))
+                continue
+            yield name, serialize.encode(doc), rendered.encode('utf-8')
+
+
+def build_database(package, path, config={}, errors=None):
+    """Parse a whole package and write its docstring database.
+
+    Parameters
+    ----------
+    package : str
+        Importable name of a package or module.
+    path : str
+        Where the database is written.
+    config : dict
+        Options for `~numpydoc.docscrape_sphinx.get_doc_object`, such as
+        ``show_class_members``.
+    errors : list, optional
+        Where a ``(name, message)`` pair is appended for each module that
+        cannot be imported and each object whose docstring cannot be
+        parsed.  These are left out of the database.
+
+    Returns
+    -------
+    count : int
+        Number of objects in the database.
+    """
+    if errors is None:
+        errors = []
+    records = []
+    with open(path, 'wb') as f:
+        f.write(_header.pack(MAGIC, VERSION, 0, 0))
+        offset = _header.size
+        for name, sections, rendered in _iter_entries(package, config,
+                                                       errors):
+            name = name.encode('utf-8')
+            record = [name]
+            for data in (name, sections, rendered):
+                f.write(data)
+                record += [offset, len(data)]
+                offset += len(data)
+            records.append(record)
+
+        records.sort()
+        for record in records:
+            f.write(_record.pack(*record[1:]))
+        f.seek(0)
+        f.write(_header.pack(MAGIC, VERSION, len(records), offset))
+    return len(records)
+
+
+class DocDatabase(object):
+    """Read-only access to a database written by `build_database`.
+
+    Nothing is decoded when the database is opened; each lookup is a binary
+    search over the memory-mapped index.
+
+    Parameters
+    ----------
+    path : str
+
+    Examples
+    --------
+    >>> with DocDatabase('mypackage.npdb') as db:  # doctest: +SKIP
+    ...     params = db.sections('mypackage.func').get('Parameters', [])
+
+    """
+    def __init__(self, path):
+        with open(path, 'rb') as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, self._count, self._index = \
+            _header.unpack_from(self._mmap, 0)
+        if magic != MAGIC:
+            self.close()
+            raise ValueError("%s is not a numpydoc database" % path)
+        if version != VERSION:
+            self.close()
+            raise ValueError("Unsupported numpydoc database version %d"
+                             % version)
+
+    def close(self):
+        self._mmap.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __len__(self):
+        return self._count
+
+    def _record(self, i):
+        return _record.unpack_from(self._mmap, self._index + i * _record.size)
+
+    def _name(self, record):
+        return self._mmap[record[0]:record[0] + record[1]]
+
+    def _find(self, name):
+        key = name.encode('utf-8')
+        lo, hi = 0, self._count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            record = self._record(mid)
+            mid_key = self._name(record)
+            if mid_key < key:
+                lo = mid + 1
+            elif mid_key > key:
+                hi = mid
+            else:
+                return record
+        raise KeyError(name)
+
+    def __contains__(self, name):
+        try:
+            self._find(name)
+        except KeyError:
+            return False
+        return True
+
+    def names(self):
+        """Iterate over all names, in sorted order"""
+        for i in range(self._count):
+            yield self._name(self._record(i)).decode('utf-8')
+
+    def raw_sections(self, name):
+        """The encoded sections of ``name``, as a view into the file.
+
+        Nothing is copied; the view must be released before the database
+        is closed.
+        """
+        record = self._find(name)
+        return memoryview(self._mmap)[record[2]:record[2] + record[3]]
+
+    def sections(self, name):
+        """The parsed sections of ``name``, as a dict.
+
+        Empty sections are left out.
+        """
+        view = self.raw_sections(name)
+        try:
+            return serialize.decode(view)
+        finally:
+            if hasattr(view, 'release'):
+                view.release()
+
+    def parsed(self, name, cls=NumpyDocString, config={}):
+        """The parsed docstring of ``name``, as an instance of ``cls``"""
+        return cls.from_dict(self.sections(name), config=config)
+
+    def rendered(self, name):
+        """The reStructuredText rendered by numpydoc for ``name``"""
+        record = self._find(name)
+        return self._mmap[record[4]:record[4] + record[5]].decode('utf-8')
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Build or query a numpydoc docstring database.")
+    subparsers = parser.add_subparsers(dest='command')
+    build = subparsers.add_parser('build', help="parse a package")
+    build.add_argument('package')
+    build.add_argument('path')
+    show = subparsers.add_parser('show', help="print one entry")
+    show.add_argument('path')
+    show.add_argument('name')
+    show.add_argument('--rendered', action='store_true',
+                      help="print the rendered reStructuredText instead "
+                           "of the parsed docstring")
+    args = parser.parse_args(argv)
+
+    if args.command == 'build':
+        errors = []
+        count = build_database(args.package, args.path, errors=errors)
+        for name, message in errors:
+            print('%s: %s' % (name, message), file=sys.stderr)
+        print('%d entries written to %s' % (count, args.path))
+        if errors:
+            print('%d modules or objects left out' % len(errors),
+                  file=sys.stderr)
+            return 1
+    elif args.command == 'show':
+        with DocDatabase(args.path) as db:
+            try:
+                if args.rendered:
+                    print(db.rendered(args.name))
+                else:
+                    print(db.parsed(args.name))
+            except KeyError:
+                print('%s not found in %s' % (args.name, args.path))
+                return 1
+    else:
+        parser.print_usage()
+        return 2
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -11,6 +11,9 @@ from warnings import warn
 import collections
 import copy
 import sys
+import weakref
+
+from .diagnostics import source_location
 
 
 class Reader(object):
@@ -47,24 +50,22 @@ class Reader(object):
             return ''
 
     def seek_next_non_empty_line(self):
-        for l in self[self._l:]:
-            if l.strip():
-                break
-            else:
-                self._l += 1
+        while not self.eof() and not self._str[self._l].strip():
+            self._l += 1
 
     def eof(self):
         return self._l >= len(self._str)
 
     def read_to_condition(self, condition_func):
+        # indexing rather than iterating over self[start:], which would copy
+        # the rest of the docstring on each call
         start = self._l
-        for line in self[start:]:
-            if condition_func(line):
-                return self[start:self._l]
+        lines = self._str
+        while not self.eof():
+            if condition_func(lines[self._l]):
+                return lines[start:self._l]
             self._l += 1
-            if self.eof():
-                return self[start:self._l+1]
-        return []
+        return lines[start:self._l]
 
     def read_to_next_empty_line(self):
         self.seek_next_non_empty_line()
@@ -128,6 +129,7 @@ class NumpyDocString(collections.Mapping):
         orig_docstring = docstring
         docstring = textwrap.dedent(docstring).split('\n')
 
+        self._diagnostics = config.get('diagnostics')
         self._doc = Reader(docstring)
         self._parsed_data = copy.deepcopy(self.sections)
 
@@ -142,13 +144,54 @@ class NumpyDocString(collections.Mapping):
 
     def __setitem__(self, key, val):
         if key not in self._parsed_data:
-            self._error_location("Unknown section %s" % key, error=False)
+            self._error_location("Unknown section %s" % key, error=False,
+                                 code='unknown-section')
         else:
             self._parsed_data[key] = val
 
     def __iter__(self):
         return iter(self._parsed_data)
 
+    _param_sections = ('Parameters', 'Returns', 'Yields', 'Raises', 'Warns',
+                       'Other Parameters', 'Attributes', 'Methods')
+
+    def to_dict(self):
+        """Convert the parsed sections to plain, JSON-compatible data.
+
+        Returns
+        -------
+        data : dict
+            Maps section names to strings, lists and dicts only; the tuples
+            of parameter lists and See Also entries become lists.
+        """
+        return dict((key, _to_plain(self[key])) for key in self)
+
+    @classmethod
+    def from_dict(cls, data, config={}):
+        """Recreate a parsed docstring from the output of `to_dict`.
+
+        No parsing takes place.  The new instance is created as
+        ``cls('', config=config)``, so this works for any subclass that can
+        be created from a docstring alone, such as `SphinxDocString`.
+
+        Parameters
+        ----------
+        data : dict
+            Section names mapped to their content, as from `to_dict`.
+        config : dict
+            Passed on to the constructor.
+        """
+        doc = cls('', config=config)
+        for key, value in data.items():
+            if key in cls._param_sections:
+                value = [(name, type_, list(desc))
+                         for name, type_, desc in value]
+            elif key == 'See Also':
+                value = [(name, list(desc), role)
+                         for name, desc, role in value]
+            doc[key] = value
+        return doc
+
     def __len__(self):
         return len(self._parsed_data)
 
@@ -297,6 +340,8 @@ class NumpyDocString(collections.Mapping):
                 out[line[1]] = strip_each_in(line[2].split(','))
         return out
 
+    _signature_rgx = re.compile(r'^([\w., ]+=)?\s*[\w\.]+\(.*\)$')
+
     def _parse_summary(self):
         """Grab signature (if given) and summary"""
         if self._is_at_section():
@@ -306,7 +351,7 @@ class NumpyDocString(collections.Mapping):
         while True:
             summary = self._doc.read_to_next_empty_line()
             summary_str = " ".join([s.strip() for s in summary]).strip()
-            if re.compile('^([\w., ]+=)?\s*[\w\.]+\(.*\)$').match(summary_str):
+            if self._signature_rgx.match(summary_str):
                 self['Signature'] = summary_str
                 if not self._is_at_section():
                     continue
@@ -323,46 +368,66 @@ class NumpyDocString(collections.Mapping):
         self._parse_summary()
 
         sections = list(self._read_sections())
-        section_names = set([section for section, content in sections])
+        section_names = set([section_name(section)
+                             for section, content in sections])
 
         has_returns = 'Returns' in section_names
         has_yields = 'Yields' in section_names
         # We could do more tests, but we are not. Arbitrarily.
         if has_returns and has_yields:
             msg = 'Docstring contains both a Returns and Yields section.'
-            raise ValueError(msg)
+            self._error_location(msg, code='returns-and-yields')
 
+        parsers = self._section_parsers
         for (section, content) in sections:
-            if not section.startswith('..'):
-                section = (s.capitalize() for s in section.split(' '))
-                section = ' '.join(section)
-                if self.get(section):
-                    self._error_location("The section %s appears twice"
-                                         % section)
-
-            if section in ('Parameters', 'Returns', 'Yields', 'Raises',
-                           'Warns', 'Other Parameters', 'Attributes',
-                           'Methods'):
-                self[section] = self._parse_param_list(content)
-            elif section.startswith('.. index::'):
-                self['index'] = self._parse_index(section, content)
-            elif section == 'See Also':
-                self['See Also'] = self._parse_see_also(content)
-            else:
+            if section.startswith('..'):
+                if section.startswith('.. index::'):
+                    self['index'] = self._parse_index(section, content)
+                else:
+                    self[section] = content
+                continue
+
+            section = section_name(section)
+            if self.get(section):
+                self._error_location("The section %s appears twice"
+                                     % section, code='duplicate-section')
+            parser = parsers.get(section)
+            if parser is None:
+                # text sections, or an unknown section, reported on setting
                 self[section] = content
+            else:
+                self[section] = parser(self, content)
+
+    # section name -> parser called as parser(doc, lines), or None to keep
+    # the lines as they are; see register_section
+    _section_parsers = {
+        'Parameters': lambda doc, content: doc._parse_param_list(content),
+        'Returns': lambda doc, content: doc._parse_param_list(content),
+        'Yields': lambda doc, content: doc._parse_param_list(content),
+        'Raises': lambda doc, content: doc._parse_param_list(content),
+        'Warns': lambda doc, content: doc._parse_param_list(content),
+        'Other Parameters':
+        lambda doc, content: doc._parse_param_list(content),
+        'Attributes': lambda doc, content: doc._parse_param_list(content),
+        'Methods': lambda doc, content: doc._parse_param_list(content),
+        'See Also': lambda doc, content: doc._parse_see_also(content),
+    }
 
-    def _error_location(self, msg, error=True):
+    def _error_location(self, msg, error=True, code='error'):
+        obj = getattr(self, '_obj', None)
+        location = source_location(obj)
+        if self._diagnostics is not None:
+            self._diagnostics.add(obj, code, msg, location=location)
         if hasattr(self, '_obj'):
             # we know where the docs came from:
-            try:
-                filename = inspect.getsourcefile(self._obj)
-            except TypeError:
-                filename = None
+            filename, line = location
+            if line is not None:
+                filename = '%s:%d' % (filename, line)
             msg = msg + (" in the docstring of %s in %s."
                          % (self._obj, filename))
         if error:
             raise ValueError(msg)
-        else:
+        elif self._diagnostics is None:
             warn(msg)
 
     # string conversion routines
@@ -463,11 +528,199 @@ class NumpyDocString(collections.Mapping):
         out += self._str_see_also(func_role)
         for s in ('Notes', 'References', 'Examples'):
             out += self._str_section(s)
+        out += self._str_custom_sections()
         for param_list in ('Attributes', 'Methods'):
             out += self._str_param_list(param_list)
         out += self._str_index()
         return '\n'.join(out)
 
+    def _str_custom_section(self, name):
+        if not self[name]:
+            return []
+        renderer = CUSTOM_SECTIONS[name]
+        if renderer is None:
+            return self._str_section(name)
+        return renderer(self, name)
+
+    def _str_custom_sections(self):
+        out = []
+        for name in CUSTOM_SECTIONS:
+            out += self._str_custom_section(name)
+        return out
+
+
+# Spellings of section titles taken for another section, after
+# capitalization
+SECTION_ALIASES = {
+    'Parameter': 'Parameters',
+    'Params': 'Parameters',
+    'Return': 'Returns',
+    'Yield': 'Yields',
+    'Raise': 'Raises',
+    'Warn': 'Warns',
+    'Other Parameter': 'Other Parameters',
+    'Attribute': 'Attributes',
+    'Method': 'Methods',
+    'See': 'See Also',
+    'Note': 'Notes',
+    'Warning': 'Warnings',
+    'Reference': 'References',
+    'Example': 'Examples',
+}
+
+# Sections added by register_section: name -> renderer or None
+CUSTOM_SECTIONS = collections.OrderedDict()
+
+# section title as written -> section name, see section_name
+_section_names = {}
+_max_section_names = 10000
+
+
+def section_name(title):
+    """Section name for a title: each word capitalized, aliases resolved"""
+    try:
+        return _section_names[title]
+    except KeyError:
+        pass
+    name = ' '.join(s.capitalize() for s in title.split(' '))
+    name = SECTION_ALIASES.get(name, name)
+    if len(_section_names) < _max_section_names:
+        _section_names[title] = name
+    return name
+
+
+def register_section(name, parser=None, renderer=None, default=None,
+                     aliases=()):
+    """Make `NumpyDocString` parse and render a custom section.
+
+    Parameters
+    ----------
+    name : str
+        Title of the section with each word capitalized, such as
+        ``'Complexity'`` or ``'Backend Notes'``.
+    parser : callable, optional
+        Called as ``parser(doc, lines)`` with the docstring being parsed and
+        the lines of the section, without its header.  Returns the content
+        of the section, ``doc[name]``.  By default, the lines are kept.
+    renderer : callable, optional
+        Called as ``renderer(doc, name)`` when the section is not empty,
+        returns the lines of reStructuredText shown for it after the
+        Examples section.  By default, the lines of the section are shown
+        under a heading.
+    default : optional
+        Content of the section when a docstring does not have it, ``[]``
+        by default.  Copied for each docstring.
+    aliases : iterable of str
+        Other capitalized titles of the section.
+    """
+    if name in NumpyDocString.sections and name not in CUSTOM_SECTIONS:
+        raise ValueError("%s is a standard section" % name)
+    NumpyDocString.sections[name] = [] if default is None else default
+    if parser is None:
+        NumpyDocString._section_parsers.pop(name, None)
+    else:
+        NumpyDocString._section_parsers[name] = parser
+    CUSTOM_SECTIONS[name] = renderer
+    for alias in aliases:
+        SECTION_ALIASES[alias] = name
+    _section_names.clear()
+
+
+class _SectionExtractor(NumpyDocString):
+    """Parser reading sections up to the last wanted one, see
+    `extract_sections`"""
+
+    _summary_sections = frozenset(['Signature', 'Summary',
+                                   'Extended Summary'])
+
+    def __init__(self, docstring, sections, config={}):
+        wanted = set(name if name in NumpyDocString.sections
+                     else section_name(name) for name in sections)
+        for name in wanted:
+            if name not in NumpyDocString.sections:
+                raise ValueError("Unknown section %s" % name)
+        # only the defaults of wanted sections are copied
+        self.sections = dict((name, NumpyDocString.sections[name])
+                             for name in wanted)
+        NumpyDocString.__init__(self, docstring, config=config)
+
+    def __setitem__(self, key, val):
+        # other sections are not wanted, rather than unknown
+        if key in self._parsed_data:
+            self._parsed_data[key] = val
+
+    def _parse(self):
+        self._doc.reset()
+        pending = set(self._parsed_data)
+        if pending & self._summary_sections:
+            self._parse_summary()
+            pending -= self._summary_sections
+            if not pending:
+                return
+        else:
+            while not self._is_at_section() and not self._doc.eof():
+                self._doc.read_to_next_empty_line()
+
+        parsers = self._section_parsers
+        # the sections are read one at a time, up to the last one wanted
+        for section, content in self._read_sections():
+            if section.startswith('..'):
+                if section.startswith('.. index::') and 'index' in pending:
+                    self['index'] = self._parse_index(section, content)
+                    pending.discard('index')
+            else:
+                section = section_name(section)
+                if section in pending:
+                    pending.discard(section)
+                    parser = parsers.get(section)
+                    if parser is None:
+                        self[section] = content
+                    else:
+                        self[section] = parser(self, content)
+            if not pending:
+                break
+
+
+def extract_sections(docstring, sections, config={}):
+    """Parse only some sections of a docstring.
+
+    Reading stops as soon as all wanted sections are found, and the other
+    sections are neither parsed nor checked.  Use this rather than
+    `NumpyDocString` when only, say, the Parameters or the Examples of many
+    docstrings are needed.
+
+    Parameters
+    ----------
+    docstring : str
+    sections : iterable of str
+        Names of the wanted sections, as keys of `NumpyDocString`
+        (``'Summary'``, ``'Parameters'``, ``'index'``, ...).  Aliases are
+        accepted.
+    config : dict
+        As for `NumpyDocString`.
+
+    Returns
+    -------
+    data : dict
+        The parsed content of each wanted section, as `NumpyDocString` would
+        give it, or its default if the docstring has no such section.
+
+    Raises
+    ------
+    ValueError
+        If a wanted section is unknown, or a wanted section cannot be
+        parsed.
+    """
+    return dict(_SectionExtractor(docstring, sections, config=config))
+
+
+def _to_plain(value):
+    if isinstance(value, dict):
+        return dict((k, _to_plain(v)) for k, v in value.items())
+    elif isinstance(value, (list, tuple, MemberDoc)):
+        return [_to_plain(v) for v in value]
+    return value
+
 
 def indent(str, indent=4):
     indent_str = ' '*indent
@@ -486,33 +739,65 @@ def header(text, style='-'):
     return text + '\n' + style*len(text) + '\n'
 
 
+# function object -> {key: inferred signature}, where the key is the class of
+# the doc for callables without a name, as its name stands in for theirs
+_signatures = weakref.WeakKeyDictionary()
+
+
 class FunctionDoc(NumpyDocString):
     def __init__(self, func, role='func', doc=None, config={}):
         self._f = func
         self._role = role  # e.g. "func" or "meth"
+        self._infer_signature = False
 
         if doc is None:
             if func is None:
                 raise ValueError("No function or docstring given")
             doc = inspect.getdoc(func) or ''
-        NumpyDocString.__init__(self, doc)
+        NumpyDocString.__init__(self, doc, config=config)
 
-        if not self['Signature'] and func is not None:
-            func, func_name = self.get_func()
+        # Introspection is slow for some callables, and its result is not
+        # shown by all renderers, so it is deferred to the first lookup.
+        self._infer_signature = (not self._parsed_data['Signature'] and
+                                 func is not None)
+
+    def __getitem__(self, key):
+        if key == 'Signature' and self._infer_signature:
+            self._parsed_data['Signature'] = self._signature()
+            self._infer_signature = False
+        return self._parsed_data[key]
+
+    def __setitem__(self, key, val):
+        if key == 'Signature':
+            self._infer_signature = False
+        NumpyDocString.__setitem__(self, key, val)
+
+    def _signature(self):
+        """Signature of the function, cached per function object"""
+        key = None if hasattr(self._f, '__name__') else self.__class__
+        try:
+            return _signatures[self._f][key]
+        except (KeyError, TypeError):
+            pass
+        func, func_name = self.get_func()
+        try:
             try:
-                try:
-                    signature = str(inspect.signature(func))
-                except (AttributeError, ValueError):
-                    # try to read signature, backward compat for older Python
-                    if sys.version_info[0] >= 3:
-                        argspec = inspect.getfullargspec(func)
-                    else:
-                        argspec = inspect.getargspec(func)
-                    signature = inspect.formatargspec(*argspec)
-                signature = '%s%s' % (func_name, signature.replace('*', '\*'))
-            except TypeError:
-                signature = '%s()' % func_name
-            self['Signature'] = signature
+                signature = str(inspect.signature(func))
+            except (AttributeError, ValueError):
+                # try to read signature, backward compat for older Python
+                if sys.version_info[0] >= 3:
+                    argspec = inspect.getfullargspec(func)
+                else:
+                    argspec = inspect.getargspec(func)
+                signature = inspect.formatargspec(*argspec)
+            signature = '%s%s' % (func_name, signature.replace('*', '\*'))
+        except TypeError:
+            signature = '%s()' % func_name
+        try:
+            _signatures.setdefault(self._f, {})[key] = signature
+        except TypeError:
+            pass  # cannot be weakly referenced, e.g. builtins
+        return signature
 
     def get_func(self):
         func_name = getattr(self._f, '__name__', self.__class__.__name__)
@@ -541,6 +826,60 @@ class FunctionDoc(NumpyDocString):
         return out
 
 
+class MemberDoc(collections.Sequence):
+    """Docstring lines of a class member, read when first accessed.
+
+    Renderers mostly only need the names of class members, so the
+    descriptions `ClassDoc` lists under Methods and Attributes are not
+    looked up until they are used.  This behaves like a list of lines.
+
+    Parameters
+    ----------
+    member : object
+        The member whose docstring is read with `pydoc.getdoc`.
+    """
+    __slots__ = ('_member', '_lines')
+
+    def __init__(self, member):
+        self._member = member
+        self._lines = None
+
+    @property
+    def lines(self):
+        if self._lines is None:
+            doc = pydoc.getdoc(self._member)
+            self._lines = doc.splitlines() if doc else []
+            self._member = None
+        return self._lines
+
+    def __getitem__(self, index):
+        return self.lines[index]
+
+    def __len__(self):
+        return len(self.lines)
+
+    def __iter__(self):
+        return iter(self.lines)
+
+    def __eq__(self, other):
+        if isinstance(other, collections.Sequence):
+            return self.lines == list(other)
+        return NotImplemented
+
+    def __ne__(self, other):
+        result = self.__eq__(other)
+        return result if result is NotImplemented else not result
+
+    __hash__ = None
+
+    def __repr__(self):
+        return repr(self.lines)
+
+    def __reduce__(self):
+        # members such as properties cannot always be pickled
+        return (list, (self.lines,))
+
+
 class ClassDoc(NumpyDocString):
 
     extra_public_methods = ['__call__']
@@ -563,25 +902,19 @@ class ClassDoc(NumpyDocString):
                 raise ValueError("No class or documentation string given")
             doc = pydoc.getdoc(cls)
 
-        NumpyDocString.__init__(self, doc)
+        NumpyDocString.__init__(self, doc, config=config)
 
         if config.get('show_class_members', True):
-            def splitlines_x(s):
-                if not s:
-                    return []
-                else:
-                    return s.splitlines()
-
             for field, items in [('Methods', self.methods),
                                  ('Attributes', self.properties)]:
                 if not self[field]:
                     doc_list = []
                     for name in sorted(items):
                         try:
-                            doc_item = pydoc.getdoc(getattr(self._cls, name))
-                            doc_list.append((name, '', splitlines_x(doc_item)))
+                            member = getattr(self._cls, name)
                         except AttributeError:
-                            pass  # method doesn't exist
+                            continue  # method doesn't exist
+                        doc_list.append((name, '', MemberDoc(member)))
                     self[field] = doc_list
 
     @property
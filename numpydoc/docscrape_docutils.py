@@ -0,0 +1,290 @@
+"""Render parsed docstrings as docutils nodes.
+
+`~numpydoc.docscrape_sphinx.SphinxDocString` renders a parsed docstring back
+to reStructuredText, which docutils then parses again.  The classes here
+build the same node tree directly from the parsed sections.  Free-form text
+(summaries, parameter descriptions, Notes, Examples, ...) is only handed to
+the reStructuredText parser when it contains markup; plain paragraphs and
+doctest blocks are turned into nodes as they are.  Sections that are mostly
+markup anyway, such as See Also, References and the class member listings,
+are rendered with `SphinxDocString` and parsed.
+
+Within a directive, pass its ``state`` to `DocutilsDocString.to_nodes` so
+that markup is parsed with the roles and directives of the running Sphinx
+build.  The docstring template is not used by this backend.
+
+"""
+from __future__ import division, absolute_import, print_function
+
+import collections
+import inspect
+import pydoc
+import re
+import textwrap
+
+from docutils import nodes
+from docutils.parsers.rst import Parser
+from docutils.statemachine import StringList
+from docutils.utils import new_document
+
+from .docscrape_sphinx import (SphinxDocString, SphinxFunctionDoc,
+                               SphinxClassDoc, SphinxObjDoc, load_template)
+
+try:
+    from docutils.frontend import get_default_settings
+except ImportError:  # docutils < 0.19
+    from docutils.frontend import OptionParser
+
+    def get_default_settings(*components):
+        return OptionParser(components=components).get_default_values()
+
+
+# Anything that may make docutils produce more than a plain paragraph:
+# inline markup, roles, references, substitutions, URLs, explicit markup,
+# literal blocks, lists, indented blocks and section underlines.
+_markup_re = re.compile(r"""
+      [`*|\\]
+    | \w_(?:\W|$) | \]_
+    | :[\w.+-]+:
+    | \.\. | ::
+    | :// | @
+    | ^\s*(?:[-+*]|\d+[.)]|\(\d+\)|\#\.|[a-zA-Z][.)]|[ivxIVX]+[.)])(?:\s|$)
+    | ^\s
+    | ^\s*([=\-~^"'#+:.<>_])\1+\s*$
+    | ^\s*[:>+]
+    """, re.M | re.X | re.U)
+
+_settings = None
+
+# text of the comments separating chunks parsed together
+_chunk_end = 'numpydoc-chunk-end'
+
+
+def has_markup(text):
+    """Whether docutils may parse ``text`` into anything but paragraphs"""
+    return _markup_re.search(text) is not None
+
+
+def _default_settings():
+    global _settings
+    if _settings is None:
+        _settings = get_default_settings(Parser)
+    return _settings
+
+
+def parse_rst(lines, state=None, settings=None):
+    """Parse reStructuredText lines into a list of nodes.
+
+    Parameters
+    ----------
+    lines : list of str
+    state : docutils.parsers.rst.states.RSTState, optional
+        State of a running parser, e.g. ``self.state`` of a directive.
+        Without it, a new document is parsed with plain docutils.
+    settings : optional
+        Docutils settings for the new document, when ``state`` is None.
+    """
+    if state is not None:
+        node = nodes.Element()
+        node.document = state.document
+        state.nested_parse(StringList(lines), 0, node)
+        return node.children
+    document = new_document('<numpydoc>', settings or _default_settings())
+    Parser().parse('\n'.join(lines), document)
+    return document.children
+
+
+class DocutilsDocString(SphinxDocString):
+    """A parsed docstring that renders to docutils nodes.
+
+    ``str()`` still gives the reStructuredText of `SphinxDocString`.
+    """
+
+    def to_nodes(self, state=None, func_role="obj", settings=None):
+        """Build the node tree numpydoc's reStructuredText would parse to.
+
+        Parameters
+        ----------
+        state : docutils.parsers.rst.states.RSTState, optional
+            Parser state used for sections containing markup, see
+            `parse_rst`.
+        func_role : str
+            Role used for See Also entries.
+        settings : optional
+            Docutils settings used without ``state``.
+
+        Returns
+        -------
+        nodes : list of docutils.nodes.Node
+        """
+        self._chunks = []
+        try:
+            out = []
+            out += self._rst(self._str_index())
+            out += self._body(self['Summary'])
+            out += self._body(self['Extended Summary'])
+            fields = []
+            fields += self._field_param_list('Parameters')
+            fields += self._field_returns('Returns')
+            fields += self._field_returns('Yields')
+            fields += self._field_param_list('Other Parameters')
+            fields += self._field_param_list('Raises')
+            fields += self._field_param_list('Warns')
+            if fields:
+                out.append(nodes.field_list('', *fields))
+            if self['Warnings']:
+                out.append(nodes.warning('', *self._body(self['Warnings'])))
+            out += self._rst(self._str_see_also(func_role))
+            out += self._section('Notes')
+            out += self._rst(self._str_references())
+            if (self.use_plots and
+                    'import matplotlib' in '\n'.join(self['Examples'])):
+                out += self._rst(self._str_examples())
+            else:
+                out += self._section('Examples')
+            out += self._rst(self._str_custom_sections())
+            out += self._rst(self._str_param_list('Attributes',
+                                                  fake_autosummary=True))
+            out += self._rst(self._str_member_list('Methods'))
+            return self._fill_chunks(out, state, settings)
+        finally:
+            del self._chunks
+
+    def _rst(self, lines):
+        """Placeholder for the nodes of reStructuredText ``lines``.
+
+        Setting up the docutils parser costs more than parsing a typical
+        section, so all markup of a docstring is parsed at once, with
+        comments separating the chunks, by `_fill_chunks`.
+        """
+        if not lines:
+            return []
+        placeholder = nodes.Element()
+        self._chunks.append((placeholder, lines))
+        return [placeholder]
+
+    def _fill_chunks(self, out, state, settings):
+        if not self._chunks:
+            return out
+        root = nodes.Element('', *out)
+        lines = []
+        for placeholder, chunk in self._chunks:
+            lines += chunk + ['', '.. ' + _chunk_end, '']
+        parsed = iter(parse_rst(lines, state, settings))
+        for placeholder, chunk in self._chunks:
+            children = []
+            for node in parsed:
+                if (isinstance(node, nodes.comment) and
+                        node.astext() == _chunk_end):
+                    break
+                children.append(node)
+            placeholder.replace_self(children)
+        return root.children
+
+    def _body(self, lines):
+        """Nodes for free-form text, parsed only if it contains markup"""
+        text = textwrap.dedent('\n'.join(lines)).strip('\n')
+        if not text.strip():
+            return []
+        blocks = [[]]
+        for line in text.split('\n'):
+            line = line.rstrip()
+            if line:
+                blocks[-1].append(line)
+            elif blocks[-1]:
+                blocks.append([])
+        out = []
+        for block in blocks:
+            if not block:
+                continue
+            block_text = '\n'.join(block)
+            if block[0].startswith('>>>'):
+                out.append(nodes.doctest_block(block_text, block_text))
+            elif has_markup(block_text):
+                return self._rst(text.split('\n'))
+            else:
+                out.append(nodes.paragraph(block_text, block_text))
+        return out
+
+    def _section(self, name):
+        if not self[name]:
+            return []
+        return [nodes.rubric(name, name)] + self._body(self[name])
+
+    def _field(self, name, body):
+        return nodes.field('', nodes.field_name(name, name),
+                           nodes.field_body('', *body))
+
+    def _item(self, name, param_type, desc, strong=True):
+        """Paragraph naming one parameter, followed by its description"""
+        if has_markup(name) or has_markup(param_type):
+            if strong:
+                name = '**%s**' % name
+            line = '%s : %s' % (name, param_type) if param_type else name
+            out = self._rst([line])
+        else:
+            children = [nodes.strong(name, name) if strong
+                        else nodes.Text(name)]
+            if param_type:
+                children.append(nodes.Text(' : %s' % param_type))
+            out = [nodes.paragraph('', '', *children)]
+        body = self._body(desc)
+        if body:
+            out.append(nodes.block_quote('', *body))
+        return out
+
+    def _field_param_list(self, name):
+        if not self[name]:
+            return []
+        body = []
+        for param, param_type, desc in self[name]:
+            body += self._item(param.strip(), param_type, desc)
+        return [self._field(name, body)]
+
+    def _field_returns(self, name):
+        if not self[name]:
+            return []
+        body = []
+        for param, param_type, desc in self[name]:
+            body += self._item(param.strip(), param_type, desc,
+                               strong=bool(param_type))
+        return [self._field(name, body)]
+
+
+class DocutilsFunctionDoc(DocutilsDocString, SphinxFunctionDoc):
+    pass
+
+
+class DocutilsClassDoc(DocutilsDocString, SphinxClassDoc):
+    pass
+
+
+class DocutilsObjDoc(DocutilsDocString, SphinxObjDoc):
+    pass
+
+
+def get_doc_object(obj, what=None, doc=None, config={}):
+    """Like `numpydoc.docscrape_sphinx.get_doc_object`, for this backend"""
+    if what is None:
+        if inspect.isclass(obj):
+            what = 'class'
+        elif inspect.ismodule(obj):
+            what = 'module'
+        elif isinstance(obj, collections.Callable):
+            what = 'function'
+        else:
+            what = 'object'
+
+    config = dict(config)
+    if config.get('template') is None:
+        config['template'] = load_template()
+
+    if what == 'class':
+        return DocutilsClassDoc(obj, func_doc=DocutilsFunctionDoc, doc=doc,
+                                config=config)
+    elif what in ('function', 'method'):
+        return DocutilsFunctionDoc(obj, doc=doc, config=config)
+    else:
+        if doc is None:
+            doc = pydoc.getdoc(obj)
+        return DocutilsObjDoc(obj, doc, config=config)
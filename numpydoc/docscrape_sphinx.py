@@ -8,12 +8,12 @@ import pydoc
 import collections
 import os
 
-from jinja2 import FileSystemLoader
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader
 from jinja2.sandbox import SandboxedEnvironment
 import sphinx
 from sphinx.jinja2glue import BuiltinTemplateLoader
 
-from .docscrape import NumpyDocString, FunctionDoc, ClassDoc
+from .docscrape import NumpyDocString, FunctionDoc, ClassDoc, CUSTOM_SECTIONS
 
 if sys.version_info[0] >= 3:
     sixu = lambda s: s
@@ -21,6 +21,56 @@ else:
     sixu = lambda s: unicode(s, 'unicode_escape')
 
 
+_paragraph_break_re = re.compile(r'\n\s*\n')
+# XXX: Should this have DOTALL?
+#      It does not in autosummary
+_first_sentence_re = re.compile(r"^([A-Z].*?\.)(?:\s|$)")
+
+def get_summary(obj, memo=None):
+    """Autosummary-style summary of the docstring of ``obj``.
+
+    This is the first sentence of the first paragraph if it starts with a
+    capital letter, and the first line otherwise.  Only the first paragraph
+    is looked at.
+
+    Parameters
+    ----------
+    obj : object
+    memo : dict, optional
+        Summaries by object, so that members listed by many classes are
+        summarized once.  It should not outlive a build, as docstrings may
+        change between builds.
+
+    Returns
+    -------
+    summary : str or None
+        None if ``obj`` has no docstring.
+    """
+    if memo is None:
+        return _summarize(obj)
+    try:
+        return memo[obj]
+    except KeyError:
+        pass
+    except TypeError:  # unhashable
+        return _summarize(obj)
+    summary = memo[obj] = _summarize(obj)
+    return summary
+
+
+def _summarize(obj):
+    doc = pydoc.getdoc(obj).strip()
+    if not doc:
+        return None
+    m = _paragraph_break_re.search(doc)
+    if m is not None:
+        doc = doc[:m.start()]
+    m = _first_sentence_re.search(' '.join(doc.split()))
+    if m:
+        return m.group(1).strip()
+    return doc.partition('\n')[0]
+
+
 class SphinxDocString(NumpyDocString):
     def __init__(self, docstring, config={}):
         NumpyDocString.__init__(self, docstring, config=config)
@@ -31,10 +81,8 @@ class SphinxDocString(NumpyDocString):
         self.class_members_toctree = config.get('class_members_toctree', True)
         self.template = config.get('template', None)
         if self.template is None:
-            template_dirs = [os.path.join(os.path.dirname(__file__), 'templates')]
-            template_loader = FileSystemLoader(template_dirs)
-            template_env = SandboxedEnvironment(loader=template_loader)
-            self.template = template_env.get_template('numpydoc_docstring.rst')
+            self.template = load_template()
+        self.summaries = config.get('summaries')
 
     # string conversion routines
     def _str_header(self, name, symbol='`'):
@@ -122,14 +170,8 @@ class SphinxDocString(NumpyDocString):
         if autosum is None:
             return display_param, desc
 
-        param_obj = getattr(self._obj, param, None)
-        if not (callable(param_obj)
-                or isinstance(param_obj, property)
-                or inspect.isgetsetdescriptor(param_obj)):
-            param_obj = None
-        obj_doc = pydoc.getdoc(param_obj)
-
-        if not (param_obj and obj_doc):
+        summary = self._member_summary(param)
+        if summary is None:
             return display_param, desc
 
         prefix = getattr(self, '_name', '')
@@ -145,19 +187,8 @@ class SphinxDocString(NumpyDocString):
         display_param = ':obj:`%s <%s%s>`' % (param,
                                               link_prefix,
                                               param)
-        if obj_doc:
-            # Overwrite desc. Take summary logic of autosummary
-            desc = re.split('\n\s*\n', obj_doc.strip(), 1)[0]
-            # XXX: Should this have DOTALL?
-            #      It does not in autosummary
-            m = re.search(r"^([A-Z].*?\.)(?:\s|$)",
-                          ' '.join(desc.split()))
-            if m:
-                desc = m.group(1).strip()
-            else:
-                desc = desc.partition('\n')[0]
-            desc = desc.split('\n')
-        return display_param, desc
+        # Overwrite desc. Take summary logic of autosummary
+        return display_param, [summary]
 
     def _str_param_list(self, name, fake_autosummary=False):
         """Generate RST for a listing of parameters or similar
@@ -211,6 +242,32 @@ class SphinxDocString(NumpyDocString):
 
         return out
 
+    @classmethod
+    def depends_on_object(cls, text):
+        """Whether the output for the docstring ``text`` depends on the
+        documented object, besides the docstring itself.
+
+        Only the Attributes and Methods sections look up the members of
+        the object they list.
+        """
+        return 'Attributes' in text or 'Methods' in text
+
+    def _member_summary(self, name):
+        """Summary of the docstring of a member of the documented object
+
+        Returns
+        -------
+        summary : str or None
+            None if the member does not exist, cannot have a docstring of
+            its own, or has an empty docstring.
+        """
+        param_obj = getattr(self._obj, name, None)
+        if not (callable(param_obj)
+                or isinstance(param_obj, property)
+                or inspect.isgetsetdescriptor(param_obj)):
+            return None
+        return get_summary(param_obj, self.summaries)
+
     @property
     def _obj(self):
         if hasattr(self, '_cls'):
@@ -239,13 +296,7 @@ class SphinxDocString(NumpyDocString):
                 param = param.strip()
 
                 # Check if the referenced member can have a docstring or not
-                param_obj = getattr(self._obj, param, None)
-                if not (callable(param_obj)
-                        or isinstance(param_obj, property)
-                        or inspect.isgetsetdescriptor(param_obj)):
-                    param_obj = None
-
-                if param_obj and pydoc.getdoc(param_obj):
+                if self._member_summary(param) is not None:
                     # Referenced object has a docstring
                     autosum += ["   %s%s" % (prefix, param)]
                 else:
@@ -314,11 +365,12 @@ class SphinxDocString(NumpyDocString):
 
     def _str_references(self):
         out = []
-        if self['References']:
+        references = self['References']
+        if references:
             out += self._str_header('References')
-            if isinstance(self['References'], str):
-                self['References'] = [self['References']]
-            out.extend(self['References'])
+            if isinstance(references, str):
+                references = [references]
+            out.extend(references)
             out += ['']
             # Latex collects all references to a separate bibliography,
             # so we need to insert links to it
@@ -327,7 +379,7 @@ class SphinxDocString(NumpyDocString):
             else:
                 out += ['.. latexonly::', '']
             items = []
-            for line in self['References']:
+            for line in references:
                 m = re.match(r'.. \[([a-z0-9._-]+)\]', line, re.I)
                 if m:
                     items.append(m.group(1))
@@ -365,10 +417,16 @@ class SphinxDocString(NumpyDocString):
             'notes': self._str_section('Notes'),
             'references': self._str_references(),
             'examples': self._str_examples(),
+            'custom_sections': self._str_custom_sections(),
             'attributes': self._str_param_list('Attributes',
                                                fake_autosummary=True),
             'methods': self._str_member_list('Methods'),
         }
+        # each custom section is also available on its own, e.g. as
+        # {{backend_notes}}
+        for name in CUSTOM_SECTIONS:
+            key = name.lower().replace(' ', '_')
+            ns[key] = self._str_custom_section(name)
         ns = dict((k, '\n'.join(v)) for k, v in ns.items())
 
         rendered = self.template.render(**ns)
@@ -377,24 +435,72 @@ class SphinxDocString(NumpyDocString):
 
 class SphinxFunctionDoc(SphinxDocString, FunctionDoc):
     def __init__(self, obj, doc=None, config={}):
-        self.load_config(config)
         FunctionDoc.__init__(self, obj, doc=doc, config=config)
+        self.load_config(config)
 
 
 class SphinxClassDoc(SphinxDocString, ClassDoc):
     def __init__(self, obj, doc=None, func_doc=None, config={}):
-        self.load_config(config)
         ClassDoc.__init__(self, obj, doc=doc, func_doc=None, config=config)
+        self.load_config(config)
+
+    @classmethod
+    def depends_on_object(cls, text):
+        # the members of the class are listed, whatever the docstring
+        return True
 
 
 class SphinxObjDoc(SphinxDocString):
     def __init__(self, obj, doc=None, config={}):
         self._f = obj
-        self.load_config(config)
         SphinxDocString.__init__(self, doc, config=config)
 
 
-def get_doc_object(obj, what=None, doc=None, config={}, builder=None):
+def load_template(builder=None, cache_dir=None, trusted=False):
+    """Compile the docstring template.
+
+    Parameters
+    ----------
+    builder : sphinx.builders.Builder, optional
+        If given, templates in the project's ``templates_path`` override the
+        one shipped with numpydoc.
+    cache_dir : str, optional
+        Directory in which compiled templates are kept between processes
+        and builds, such as a subdirectory of the Sphinx doctree directory.
+    trusted : bool
+        Render with a plain `jinja2.Environment` rather than a sandboxed
+        one, which checks every attribute access and call of the template.
+        Only for templates of the project itself.
+
+    Returns
+    -------
+    template : jinja2.Template
+    """
+    template_dirs = [os.path.join(os.path.dirname(__file__), 'templates')]
+    if builder is not None:
+        template_loader = BuiltinTemplateLoader()
+        template_loader.init(builder, dirs=template_dirs)
+    else:
+        template_loader = FileSystemLoader(template_dirs)
+    bytecode_cache = None
+    if cache_dir is not None:
+        # code compiled for sandboxed environments differs
+        cache_dir = os.path.join(cache_dir,
+                                 'trusted' if trusted else 'sandboxed')
+        try:
+            os.makedirs(cache_dir)
+        except OSError:
+            if not os.path.isdir(cache_dir):
+                raise
+        bytecode_cache = FileSystemBytecodeCache(cache_dir)
+    env_class = Environment if trusted else SandboxedEnvironment
+    template_env = env_class(loader=template_loader,
+                             bytecode_cache=bytecode_cache)
+    return template_env.get_template('numpydoc_docstring.rst')
+
+
+def get_doc_class(obj, what=None):
+    """The class `get_doc_object` documents ``obj`` with"""
     if what is None:
         if inspect.isclass(obj):
             what = 'class'
@@ -405,19 +511,24 @@ def get_doc_object(obj, what=None, doc=None, config={}, builder=None):
         else:
             what = 'object'
 
-    template_dirs = [os.path.join(os.path.dirname(__file__), 'templates')]
-    if builder is not None:
-        template_loader = BuiltinTemplateLoader()
-        template_loader.init(builder, dirs=template_dirs)
-    else:
-        template_loader = FileSystemLoader(template_dirs)
-    template_env = SandboxedEnvironment(loader=template_loader)
-    config['template'] = template_env.get_template('numpydoc_docstring.rst')
-
     if what == 'class':
+        return SphinxClassDoc
+    elif what in ('function', 'method'):
+        return SphinxFunctionDoc
+    return SphinxObjDoc
+
+
+def get_doc_object(obj, what=None, doc=None, config={}, builder=None):
+    doc_class = get_doc_class(obj, what)
+
+    config = dict(config)
+    if config.get('template') is None:
+        config['template'] = load_template(builder)
+
+    if doc_class is SphinxClassDoc:
         return SphinxClassDoc(obj, func_doc=SphinxFunctionDoc, doc=doc,
                               config=config)
-    elif what in ('function', 'method'):
+    elif doc_class is SphinxFunctionDoc:
         return SphinxFunctionDoc(obj, doc=doc, config=config)
     else:
         if doc is None:
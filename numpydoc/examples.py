@@ -0,0 +1,303 @@
+"""Run the Examples sections of a whole package as doctests.
+
+This is a lighter alternative to building the documentation with
+``sphinx.ext.doctest``: the Examples section of every public object is
+pulled out of its parsed docstring, examples are grouped by module, and
+the groups are run in a pool of worker processes, each section with its
+own time limit::
+
+    python -m numpydoc.examples mypackage --jobs 4 --timeout 10 \\
+        --setup "import numpy as np" --cache .numpydoc-examples
+
+Examples run with the namespace of their module plus the ``--setup``
+code.  With ``--cache``, passing examples are remembered by a hash of
+their text, their object's name and the source of their module, and are
+skipped on later runs until one of these changes.
+
+"""
+from __future__ import division, absolute_import, print_function
+
+import argparse
+import collections
+import doctest
+import hashlib
+import importlib
+import inspect
+import io
+import json
+import signal
+import sys
+import threading
+
+from .docscrape import extract_sections, ParseError
+from .validate import iter_modules, iter_public_objects, _file_hash
+
+try:
+    from concurrent.futures import ProcessPoolExecutor
+except ImportError:  # Python 2 without the futures backport
+    ProcessPoolExecutor = None
+
+
+Example = collections.namedtuple('Example',
+                                 ['module', 'name', 'source', 'key'])
+
+Result = collections.namedtuple('Result',
+                                ['module', 'name', 'key', 'status', 'output'])
+
+DOCTEST_FLAGS = doctest.ELLIPSIS | doctest.NORMALIZE_WHITESPACE
+
+
+def _error(e):
+    return '%s: %s' % (type(e).__name__, e)
+
+
+def collect_examples(package, errors=None):
+    """Extract the Examples sections of all public objects of a package.
+
+    Parameters
+    ----------
+    package : str
+    errors : list, optional
+        Where a `Result` with status ``'error'`` is appended for each
+        module that cannot be imported and each docstring that cannot be
+        parsed.
+
+    Yields
+    ------
+    example : Example
+        Only sections containing ``>>>`` prompts are returned.
+    """
+    if errors is None:
+        errors = []
+    for modname, filename in iter_modules(package):
+        module_hash = _file_hash(filename)
+        try:
+            module = importlib.import_module(modname)
+        except Exception as e:
+            errors.append(Result(modname, modname, None, 'error', _error(e)))
+            continue
+        objects = [(modname, module)] + list(iter_public_objects(module))
+        for name, obj in objects:
+            try:
+                examples = extract_sections(inspect.getdoc(obj) or '',
+                                            ['Examples'])['Examples']
+            except (ValueError, ParseError) as e:
+                errors.append(Result(modname, name, None, 'error', _error(e)))
+                continue
+            source = '\n'.join(examples)
+            if '>>>' not in source:
+                continue
+            key = hashlib.sha1('\0'.join([module_hash, name, source])
+                               .encode('utf-8')).hexdigest()
+            yield Example(modname, name, source, key)
+
+
+class ExampleTimeout(Exception):
+    pass
+
+
+def _timeout_handler(fired):
+    # doctest reports exceptions raised by an example as a failure of that
+    # example, so whether the alarm went off is also recorded in ``fired``
+    def handler(signum, frame):
+        fired.append(True)
+        raise ExampleTimeout()
+    return handler
+
+
+class _TimedRunner(doctest.DocTestRunner):
+    """Stop running a section once its time limit went off.
+
+    doctest reports the `ExampleTimeout` as a failure of the example it
+    interrupted, or the example may catch it, and then goes on with the
+    next example.  As the timer does not go off again, the section is
+    stopped as soon as the outcome of the example is reported.
+    """
+
+    def __init__(self, fired, **kwargs):
+        doctest.DocTestRunner.__init__(self, **kwargs)
+        self.fired = fired
+
+    def _check(self):
+        if self.fired:
+            raise ExampleTimeout()
+
+    def report_success(self, *args):
+        self._check()
+        doctest.DocTestRunner.report_success(self, *args)
+
+    def report_failure(self, *args):
+        self._check()
+        doctest.DocTestRunner.report_failure(self, *args)
+
+    def report_unexpected_exception(self, *args):
+        self._check()
+        doctest.DocTestRunner.report_unexpected_exception(self, *args)
+
+
+def _in_main_thread():
+    # signal handlers can only be installed in the main thread
+    if hasattr(threading, 'main_thread'):
+        return threading.current_thread() is threading.main_thread()
+    return isinstance(threading.current_thread(), threading._MainThread)
+
+
+def _can_time_out():
+    return hasattr(signal, 'setitimer') and _in_main_thread()
+
+
+def run_module_examples(modname, examples, setup='', timeout=None):
+    """Run examples of one module, in the namespace of that module.
+
+    Parameters
+    ----------
+    modname : str
+    examples : list of Example
+    setup : str
+        Code run in the namespace of each example before it.
+    timeout : float, optional
+        Time limit for the whole Examples section of each object, in
+        seconds.  Only enforced on platforms with `signal.setitimer`, in
+        the main thread.
+
+    Returns
+    -------
+    results : list of Result
+    """
+    try:
+        module = importlib.import_module(modname)
+    except Exception as e:
+        return [Result(ex.module, ex.name, ex.key, 'error', _error(e))
+                for ex in examples]
+
+    parser = doctest.DocTestParser()
+    use_timer = timeout and _can_time_out()
+    results = []
+    for example in examples:
+        globs = dict(vars(module))
+        output = []
+        fired = []
+        runner = _TimedRunner(fired, optionflags=DOCTEST_FLAGS)
+        if use_timer:
+            previous = signal.signal(signal.SIGALRM, _timeout_handler(fired))
+            signal.setitimer(signal.ITIMER_REAL, timeout)
+        try:
+            try:
+                exec(setup, globs)
+                test = parser.get_doctest(example.source, globs,
+                                          example.name, module.__file__, 0)
+                runner.run(test, out=output.append, clear_globs=True)
+                status = 'failed' if runner.failures else 'passed'
+            finally:
+                if use_timer:
+                    # the timer may still go off until it is cleared, which
+                    # is then caught below
+                    signal.setitimer(signal.ITIMER_REAL, 0)
+        except ExampleTimeout:
+            pass
+        except Exception as e:
+            status = 'error'
+            output.append(_error(e) + '\n')
+        finally:
+            if use_timer:
+                signal.signal(signal.SIGALRM, previous)
+        if fired:
+            status = 'timeout'
+            output = ['Timed out after %s seconds\n' % timeout]
+        results.append(Result(example.module, example.name, example.key,
+                              status, ''.join(output)))
+    return results
+
+
+def _run_task(args):
+    return [result._asdict() for result in run_module_examples(*args)]
+
+
+def _load_cache(path):
+    try:
+        with io.open(path, encoding='utf-8') as f:
+            return set(json.load(f))
+    except (IOError, OSError, ValueError):
+        return set()
+
+
+def run_examples(package, jobs=1, timeout=None, setup='', cache=None):
+    """Run all Examples sections of a package.
+
+    Parameters
+    ----------
+    package : str
+        Importable name of a package or module.
+    jobs : int
+        Number of worker processes, each running the examples of one module
+        at a time.  With 1, examples are run in this process.
+    timeout : float, optional
+        Time limit for the Examples section of each object, in seconds.
+    setup : str
+        Code run before each example, e.g. ``'import numpy as np'``.
+    cache : str, optional
+        Path to a JSON file listing the keys of passing examples, which are
+        skipped.
+
+    Returns
+    -------
+    results : list of Result
+        One per example run, then one with status ``'error'`` per module
+        that cannot be imported or docstring that cannot be parsed.
+        Skipped examples are left out.
+    """
+    passed = _load_cache(cache) if cache else set()
+    errors = []
+    by_module = collections.OrderedDict()
+    for example in collect_examples(package, errors):
+        if example.key not in passed:
+            by_module.setdefault(example.module, []).append(example)
+
+    tasks = [(modname, examples, setup, timeout)
+             for modname, examples in by_module.items()]
+    if jobs > 1 and len(tasks) > 1 and ProcessPoolExecutor is not None:
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            outputs = list(executor.map(_run_task, tasks))
+    else:
+        outputs = [_run_task(task) for task in tasks]
+    results = [Result(**result) for output in outputs for result in output]
+    results += errors
+
+    if cache:
+        passed.update(r.key for r in results if r.status == 'passed')
+        with io.open(cache, 'w', encoding='utf-8') as f:
+            f.write(json.dumps(sorted(passed), ensure_ascii=False))
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Run the Examples sections of a package as doctests.")
+    parser.add_argument('package', help="importable package or module name")
+    parser.add_argument('-j', '--jobs', type=int, default=1,
+                        help="number of worker processes")
+    parser.add_argument('--timeout', type=float,
+                        help="time limit per Examples section, in seconds")
+    parser.add_argument('--setup', default='',
+                        help="code run before each example")
+    parser.add_argument('--cache',
+                        help="JSON file remembering passing examples")
+    parser.add_argument('--format', choices=['text', 'json'], default='text')
+    args = parser.parse_args(argv)
+
+    results = run_examples(args.package, jobs=args.jobs,
+                           timeout=args.timeout, setup=args.setup,
+                           cache=args.cache)
+    failed = [r for r in results if r.status != 'passed']
+    if args.format == 'json':
+        print(json.dumps([r._asdict() for r in results], indent=1))
+    else:
+        for result in failed:
+            print('%s: %s' % (result.name, result.status))
+            print(result.output)
+        print('%d examples run, %d failed' % (len(results), len(failed)))
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,102 @@
+"""Index of documented names, for resolving See Also entries in bulk.
+
+Looking up See Also targets one by one through Sphinx's resolver only
+reports broken ones as unresolved references late in the build.  A
+:class:`NameIndex` holds every documented full name together with all of its
+dotted suffixes (``numpy.linalg.norm`` is also found as ``linalg.norm`` and
+``norm``), so that all targets can be checked at once after reading, with
+suggestions for misses.
+
+"""
+from __future__ import division, absolute_import, print_function
+
+import difflib
+
+
+class NameIndex(object):
+    """Set of full names, searchable by name, context and suffix.
+
+    Parameters
+    ----------
+    names : iterable of str, optional
+    """
+    def __init__(self, names=()):
+        self._names = set()
+        # dotted suffix -> full names ending with it
+        self._suffixes = {}
+        self._suffix_list = None
+        self.update(names)
+
+    def add(self, name):
+        if name in self._names:
+            return
+        self._names.add(name)
+        parts = name.split('.')
+        for i in range(len(parts)):
+            self._suffixes.setdefault('.'.join(parts[i:]), []).append(name)
+        self._suffix_list = None
+
+    def update(self, names):
+        for name in names:
+            self.add(name)
+
+    def __contains__(self, name):
+        return name in self._names
+
+    def __len__(self):
+        return len(self._names)
+
+    def find(self, target, contexts=()):
+        """Look ``target`` up as Sphinx does.
+
+        Parameters
+        ----------
+        target : str
+            Name as written in the docstring.  A leading ``~`` or ``.`` is
+            ignored.
+        contexts : sequence of str
+            Full names ``target`` is first looked up relative to, such as
+            the current class and module, innermost first.
+
+        Returns
+        -------
+        name : str or None
+        """
+        target = target.lstrip('~.')
+        for context in contexts:
+            full = '%s.%s' % (context, target)
+            if full in self._names:
+                return full
+        if target in self._names:
+            return target
+        return None
+
+    def matches(self, target):
+        """All full names ending with ``target``, sorted"""
+        return sorted(self._suffixes.get(target.lstrip('~.'), ()))
+
+    def resolve(self, target, contexts=()):
+        """The full name ``target`` refers to.
+
+        This is the result of `find`, or otherwise the only name ending with
+        ``target``; None if there is no such name or more than one.
+        """
+        name = self.find(target, contexts)
+        if name is None:
+            matches = self.matches(target)
+            if len(matches) == 1:
+                name = matches[0]
+        return name
+
+    def suggest(self, target, n=3):
+        """Documented names close to ``target``, for error messages"""
+        if self._suffix_list is None:
+            self._suffix_list = list(self._suffixes)
+        matches = difflib.get_close_matches(target.lstrip('~.'),
+                                            self._suffix_list, n=n)
+        out = []
+        for match in matches:
+            for name in sorted(self._suffixes[match]):
+                if name not in out:
+                    out.append(name)
+        return out[:n]
@@ -20,6 +20,13 @@ from __future__ import division, absolute_import, print_function
 
 import sys
 import re
+import io
+import os
+import hashlib
+import threading
+import signal
+import contextlib
+import time
 import pydoc
 import sphinx
 import inspect
@@ -28,7 +35,23 @@ import collections
 if sphinx.__version__ < '1.0.1':
     raise RuntimeError("Sphinx 1.0.1 or newer is required")
 
-from .docscrape_sphinx import get_doc_object, SphinxDocString
+from docutils import nodes
+from sphinx import addnodes
+from sphinx.util.docstrings import prepare_docstring
+
+from .docscrape import NumpyDocString
+from .docscrape_sphinx import (get_doc_object, get_doc_class, load_template,
+                               SphinxDocString)
+from .diagnostics import (DiagnosticsCollector, Diagnostic, source_location,
+                          clear_cache)
+from .nameindex import NameIndex
+from .prefetch import Prefetcher, PrefetchStore
+
+try:
+    from sphinx.util import logging
+    logger = logging.getLogger(__name__)
+except ImportError:  # Sphinx < 1.6
+    logger = None
 
 if sys.version_info[0] >= 3:
     sixu = lambda s: s
@@ -36,57 +59,462 @@ else:
     sixu = lambda s: unicode(s, 'unicode_escape')
 
 
-def rename_references(app, what, name, obj, options, lines,
-                      reference_offset=[0]):
-    # replace reference numbers so that there are no duplicates
+class NumpydocConfig(object):
+    """Frozen snapshot of the ``numpydoc_*`` settings of a build.
+
+    The settings are resolved once per build, along with everything derived
+    from them: compiled regular expressions, the docstring template and the
+    options passed on to `get_doc_object`, which include the memo of member
+    summaries of the build.
+
+    Snapshots compare and hash by their settings only, so the hash can be
+    used as part of cache keys.
+
+    Parameters
+    ----------
+    template : jinja2.Template, optional
+        Compiled docstring template.
+    **settings
+        Values for all of `fields`.
+    """
+    fields = ('use_plots', 'show_class_members',
+              'show_inherited_class_members', 'class_members_toctree',
+              'edit_link', 'citation_re', 'max_lines', 'time_limit')
+
+    title_pattern = '^\\s*[#*=]{4,}\\n[a-z0-9 -]+\\n[#*=]{4,}\\s*'
+
+    def __init__(self, template=None, **settings):
+        values = tuple(settings[name] for name in self.fields)
+        set_ = super(NumpydocConfig, self).__setattr__
+        set_('_values', values)
+        for name, value in zip(self.fields, values):
+            set_(name, value)
+        set_('template', template)
+        set_('title_re', re.compile(sixu(self.title_pattern), re.I | re.S))
+        set_('reference_re', re.compile(sixu('^.. \\[(%s)\\]')
+                                        % self.citation_re, re.I))
+        set_('doc_config',
+             {'use_plots': self.use_plots,
+              'show_class_members': self.show_class_members,
+              'show_inherited_class_members':
+              self.show_inherited_class_members,
+              'class_members_toctree': self.class_members_toctree,
+              'template': template,
+              'summaries': {}})
+
+    @classmethod
+    def from_app(cls, app):
+        settings = dict((name, getattr(app.config, 'numpydoc_' + name))
+                        for name in cls.fields)
+        cache_dir = getattr(app, 'doctreedir', None)
+        if cache_dir is not None:
+            cache_dir = os.path.join(cache_dir, 'numpydoc-templates')
+        template = load_template(
+            app.builder, cache_dir=cache_dir,
+            trusted=app.config.numpydoc_trusted_templates)
+        return cls(template=template, **settings)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("NumpydocConfig is immutable")
+
+    def __delattr__(self, name):
+        raise AttributeError("NumpydocConfig is immutable")
+
+    def __eq__(self, other):
+        return (isinstance(other, NumpydocConfig) and
+                self._values == other._values)
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __hash__(self):
+        return hash(self._values)
+
+    def __repr__(self):
+        return 'NumpydocConfig(%s)' % ', '.join(
+            '%s=%r' % item for item in zip(self.fields, self._values))
+
+
+def get_config(app):
+    """The numpydoc settings snapshot of the current build"""
+    config = getattr(app, 'numpydoc_config', None)
+    if config is None:
+        # builder-inited has not been emitted, e.g. when called directly
+        with _update_config_lock:
+            if getattr(app, 'numpydoc_config', None) is None:
+                update_config(app)
+        config = app.numpydoc_config
+    return config
+
+
+_update_config_lock = threading.Lock()
+
+
+# Names of the per-document dicts numpydoc keeps in the Sphinx environment
+_doc_state_attrs = ('numpydoc_diagnostics', 'numpydoc_names',
+                    'numpydoc_see_also', 'numpydoc_stats')
+
+
+def _doc_state(app, attr):
+    """Per-document numpydoc data of the current build.
+
+    The data is kept in the Sphinx environment, so that it is pickled with
+    it, purged when documents change, and merged back from the processes of
+    a parallel build.  Outside of a build it is kept on ``app``.
+    """
+    holder = getattr(app, 'env', None) or app
+    return holder.__dict__.setdefault(attr, {})
+
+
+def _current_docname(app):
+    env = getattr(app, 'env', None)
+    if env is None:
+        return None
+    return env.temp_data.get('docname')
+
+
+def purge_doc_state(app, env, docname):
+    for attr in _doc_state_attrs:
+        getattr(env, attr, {}).pop(docname, None)
+
+
+def merge_doc_state(app, env, docnames, other):
+    for attr in _doc_state_attrs:
+        state = env.__dict__.setdefault(attr, {})
+        other_state = getattr(other, attr, {})
+        for docname in docnames:
+            if docname in other_state:
+                state[docname] = other_state[docname]
+
+
+class ReferenceCounter(object):
+    """Hand out citation prefixes unique within a process"""
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._offset = 0
+
+    def reserve(self, n):
+        """Reserve ``n`` numbers and return the first one"""
+        with self._lock:
+            offset = self._offset
+            self._offset += n
+        return offset
+
+
+def _reference_prefix(app):
+    """A prefix making citation labels unique across the build.
+
+    Within a Sphinx build, this is derived from the name of the document
+    being read and the number of docstrings with citations seen in it so
+    far, so labels do not depend on the order in which documents are read,
+    or on which process reads them.
+    """
+    docname = _current_docname(app)
+    if docname is None:
+        return sixu('R%x-') % app.numpydoc_references.reserve(1)
+    temp_data = app.env.temp_data
+    count = temp_data.get('numpydoc_references', 0)
+    temp_data['numpydoc_references'] = count + 1
+    # citations are global to the build, so the hash must not collide
+    # between documents even in large projects
+    digest = hashlib.sha1(docname.encode('utf-8')).hexdigest()[:16]
+    return sixu('R%s%x-') % (digest, count)
+
+
+# Labels made by _reference_prefix within a build
+_reference_label_re = re.compile(sixu('^R[0-9a-f]{17,}-(.+)$'))
+
+
+# Citations and citation targets: '[label]_' or '.. [label]'
+_citation_re = re.compile(sixu(r'(\.\. )?\[([^\[\]]+)\](_?)'))
+
+
+def rename_references(app, what, name, obj, options, lines):
+    # prefix citation labels so that there are no duplicates; the original
+    # labels are shown again in the output by relabel_references
+    reference_re = get_config(app).reference_re
     references = set()
     for line in lines:
         line = line.strip()
-        m = re.match(sixu('^.. \\[(%s)\\]') % app.config.numpydoc_citation_re,
-                     line, re.I)
+        m = reference_re.match(line)
         if m:
             references.add(m.group(1))
 
     if references:
-        for r in references:
-            if r.isdigit():
-                new_r = sixu("R%d") % (reference_offset[0] + int(r))
-            else:
-                new_r = sixu("%s%d") % (r, reference_offset[0])
+        prefix = _reference_prefix(app)
+
+        # one pass over the lines for all references
+        def rename(m):
+            if m.group(2) in references and (m.group(1) or m.group(3)):
+                return sixu('%s[%s%s]%s') % (m.group(1) or '', prefix,
+                                              m.group(2), m.group(3))
+            return m.group(0)
+
+        for i, line in enumerate(lines):
+            if '[' in line:
+                lines[i] = _citation_re.sub(rename, line)
+
+
+def _is_citation_xref(node):
+    """Whether ``node`` is a reference Sphinx made from a citation reference"""
+    return (isinstance(node, addnodes.pending_xref) and
+            (node.get('refdomain') == 'citation' or
+             node.get('reftype') == 'citation'))
+
+
+def relabel_references(app, doctree):
+    """Show the original labels of citations renamed by numpydoc"""
+    for node in doctree.traverse(nodes.Text):
+        parent = node.parent
+        if isinstance(parent, nodes.inline):
+            # the text of citation references once resolved by Sphinx
+            if not _is_citation_xref(parent.parent):
+                continue
+        elif not (isinstance(parent, (nodes.label, nodes.citation_reference))
+                  or _is_citation_xref(parent)):
+            continue
+        text = node.astext()
+        bracketed = text.startswith('[') and text.endswith(']')
+        m = _reference_label_re.match(text[1:-1] if bracketed else text)
+        if m is None:
+            continue
+        label = m.group(1)
+        if bracketed:
+            label = '[%s]' % label
+        parent.replace(node, nodes.Text(label))
+
+
+def needs_processing(config, what, lines):
+    """Whether numpydoc would change a docstring, other than by edit links.
+
+    This is a single scan for what numpydoc acts on: section underlines,
+    ``.. index::`` markers, citations and a leading signature.  Classes
+    get member listings if ``show_class_members`` is on.
+    """
+    if what == 'class' and config.doc_config['show_class_members']:
+        return True
+    first = []
+    in_first = True
+    previous = ''
+    for line in lines:
+        line = line.strip()
+        if in_first:
+            if line:
+                first.append(line)
+            elif first:
+                in_first = False
+        if line and previous and line[0] in '-=':
+            if line.startswith(line[0] * len(previous)):
+                return True
+        if line.startswith('..') and (line.startswith('.. index::') or
+                                      config.reference_re.match(line)):
+            return True
+        previous = line
+    return NumpyDocString._signature_rgx.match(' '.join(first)) is not None
+
+
+def _render_key(config, what, text, obj):
+    """Key of the memo of rendered docstrings, see `render_docstring`.
+
+    Apart from the settings, the docstring and the kind of object, the
+    output only depends on the object itself where the class documenting it
+    says so, see `SphinxDocString.depends_on_object`.  Name dependent parts,
+    citation labels and edit links, are added afterwards.
+    """
+    if get_doc_class(obj, what).depends_on_object(text):
+        return (config, what, text, obj)
+    return (config, what, text)
 
-            for i, line in enumerate(lines):
-                lines[i] = lines[i].replace(sixu('[%s]_') % r,
-                                            sixu('[%s]_') % new_r)
-                lines[i] = lines[i].replace(sixu('.. [%s]') % r,
-                                            sixu('.. [%s]') % new_r)
 
-        reference_offset[0] += len(references)
+class BudgetExceeded(BaseException):
+    # not an Exception, so that it is not caught on its way out of the
+    # code that was interrupted
+    pass
 
 
-def mangle_docstrings(app, what, name, obj, options, lines):
+def _budget_handler(signum, frame):
+    raise BudgetExceeded()
 
-    cfg = {'use_plots': app.config.numpydoc_use_plots,
-           'show_class_members': app.config.numpydoc_show_class_members,
-           'show_inherited_class_members':
-           app.config.numpydoc_show_inherited_class_members,
-           'class_members_toctree': app.config.numpydoc_class_members_toctree}
+
+def _in_main_thread():
+    # signal handlers can only be installed in the main thread
+    if hasattr(threading, 'main_thread'):
+        return threading.current_thread() is threading.main_thread()
+    return isinstance(threading.current_thread(), threading._MainThread)
+
+
+@contextlib.contextmanager
+def time_limit(seconds):
+    """Raise `BudgetExceeded` in the block once ``seconds`` have passed.
+
+    Only enforced on platforms with `signal.setitimer`, in the main thread,
+    and unless a timer set by the caller expires first.  Such a timer is
+    restored afterwards, minus the time spent in the block.
+    """
+    if (not seconds or not hasattr(signal, 'setitimer') or
+            not _in_main_thread()):
+        yield
+        return
+    outer = signal.getitimer(signal.ITIMER_REAL)
+    if outer[0] and outer[0] <= seconds:
+        yield
+        return
+    previous = signal.signal(signal.SIGALRM, _budget_handler)
+    start = time.time()
+    signal.setitimer(signal.ITIMER_REAL, seconds)
+    try:
+        yield
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous)
+        if outer[0]:
+            # an expired timer still fires, as soon as possible
+            remaining = max(outer[0] - (time.time() - start), 1e-6)
+            signal.setitimer(signal.ITIMER_REAL, remaining, outer[1])
+
+
+def literal_docstring(lines):
+    """The docstring ``lines`` as a literal block"""
+    return ([sixu('::'), sixu('')] +
+            [sixu('    ') + line if line.strip() else sixu('')
+             for line in lines] + [sixu('')])
+
+
+def _render(config, app, what, obj, text, diagnostics):
+    """Render one docstring within the budget of the settings"""
+    lines = text.split(sixu('\n'))
+    if config.max_lines and len(lines) > config.max_lines:
+        problem = ('docstring has %d lines, more than numpydoc_max_lines'
+                   % len(lines))
+    else:
+        doc_config = dict(config.doc_config, diagnostics=diagnostics)
+        try:
+            with time_limit(config.time_limit):
+                doc = get_doc_object(obj, what, text, config=doc_config,
+                                     builder=app.builder)
+                see_also = doc['See Also']
+                if sys.version_info[0] >= 3:
+                    doc = str(doc)
+                else:
+                    doc = unicode(doc)
+            return doc.split(sixu('\n')), see_also
+        except BudgetExceeded:
+            diagnostics.clear()
+            problem = ('processing took longer than numpydoc_time_limit '
+                       '(%g s)' % config.time_limit)
+    diagnostics.add(obj, 'over-budget',
+                    problem + ', shown as a literal block instead')
+    return literal_docstring(lines), []
+
+
+def render_docstring(app, what, obj, text, diagnostics, prefetch=False):
+    """Parse and render a docstring, reusing output for duplicates.
+
+    Aliases, re-exports and inherited members often share docstrings, so
+    output is memoized for the duration of the build.  With ``prefetch``,
+    the output is only rendered ahead of autodoc, see `numpydoc.prefetch`,
+    and kept aside until it is first used.
+
+    Returns
+    -------
+    lines : list of str
+    see_also : list
+        The See Also entries of the docstring.
+    reused : bool
+        Whether the output was used before.
+    """
+    config = get_config(app)
+    memo = app.__dict__.setdefault('numpydoc_rendered', {})
+    prefetched = getattr(app, 'numpydoc_prefetched', None)
+    if prefetch and prefetched is None:  # prefetching was stopped
+        return None
+    key = _render_key(config, what, text, obj)
+    try:
+        rendered, see_also, problems = memo[key]
+    except KeyError:
+        if prefetch:
+            if key in prefetched:
+                return None
+        elif prefetched is not None:
+            entry = prefetched.pop(key)
+            if entry is not None:
+                # first use of the output, not counted as a duplicate
+                memo[key] = entry
+                rendered, see_also, problems = entry
+                for code, message in problems:
+                    diagnostics.add(obj, code, message)
+                return list(rendered), see_also, False
+    except TypeError:  # unhashable object
+        if prefetch:
+            return None
+        key = None
+    else:
+        if prefetch:
+            return None
+        for code, message in problems:
+            diagnostics.add(obj, code, message)
+        return list(rendered), see_also, True
+
+    collector = DiagnosticsCollector()
+    rendered, see_also = _render(config, app, what, obj, text, collector)
+    diagnostics.extend(collector)
+    if key is not None:
+        entry = (tuple(rendered), see_also,
+                 [(entry.code, entry.message) for entry in collector])
+        if prefetch:
+            prefetched.put(key, entry)
+        else:
+            memo[key] = entry
+    return rendered, see_also, False
+
+
+def prefetch_docstring(app, what, obj):
+    """Render the docstring of ``obj`` as autodoc will pass it"""
+    if what == 'class' and app.config.autoclass_content != 'class':
+        return
+    doc = inspect.getdoc(obj)
+    if not doc:
+        return
+    lines = prepare_docstring(doc)
+    if needs_processing(get_config(app), what, lines):
+        render_docstring(app, what, obj, sixu('\n').join(lines),
+                         DiagnosticsCollector(), prefetch=True)
+
+
+def mangle_docstrings(app, what, name, obj, options, lines):
+    config = get_config(app)
+    prefetcher = getattr(app, 'numpydoc_prefetcher', None)
+    if prefetcher is not None:
+        if what != 'module':
+            obj_module = getattr(obj, '__module__', None)
+            module = sys.modules.get(obj_module) if obj_module else None
+        else:
+            module = obj
+        prefetcher.submit_module(module)
+    diagnostics = DiagnosticsCollector()
+    docname = _current_docname(app)
+    # docstrings of objects other than modules, and how many of these were
+    # [passed through, rendered before]
+    stats = _doc_state(app, 'numpydoc_stats').setdefault(docname, [0, 0, 0])
 
     u_NL = sixu('\n')
     if what == 'module':
         # Strip top title
-        pattern = '^\\s*[#*=]{4,}\\n[a-z0-9 -]+\\n[#*=]{4,}\\s*'
-        title_re = re.compile(sixu(pattern), re.I | re.S)
-        lines[:] = title_re.sub(sixu(''), u_NL.join(lines)).split(u_NL)
+        lines[:] = config.title_re.sub(sixu(''),
+                                       u_NL.join(lines)).split(u_NL)
+    elif needs_processing(config, what, lines):
+        stats[0] += 1
+        lines[:], see_also, reused = render_docstring(
+            app, what, obj, u_NL.join(lines), diagnostics)
+        record_names(app, what, name, obj, see_also)
+        stats[2] += reused
     else:
-        doc = get_doc_object(obj, what, u_NL.join(lines), config=cfg,
-                             builder=app.builder)
-        if sys.version_info[0] >= 3:
-            doc = str(doc)
-        else:
-            doc = unicode(doc)
-        lines[:] = doc.split(u_NL)
+        # nothing for numpydoc to do, leave the docstring as it is
+        record_names(app, what, name, obj)
+        stats[0] += 1
+        stats[1] += 1
 
-    if (app.config.numpydoc_edit_link and hasattr(obj, '__name__') and
+    if (config.edit_link and hasattr(obj, '__name__') and
             obj.__name__):
         if hasattr(obj, '__module__'):
             v = dict(full_name=sixu("%s.%s") % (obj.__module__, obj.__name__))
@@ -94,12 +522,142 @@ def mangle_docstrings(app, what, name, obj, options, lines):
             v = dict(full_name=obj.__name__)
         lines += [sixu(''), sixu('.. htmlonly::'), sixu('')]
         lines += [sixu('    %s') % x for x in
-                  (app.config.numpydoc_edit_link % v).split("\n")]
+                  (config.edit_link % v).split("\n")]
 
     # call function to replace reference numbers so that there are no
     # duplicates
     rename_references(app, what, name, obj, options, lines)
 
+    if len(diagnostics):
+        state = _doc_state(app, 'numpydoc_diagnostics')
+        state.setdefault(docname, []).extend(diagnostics)
+
+
+# Roles of See Also entries that are checked against the name index
+_py_roles = frozenset(['obj', 'func', 'function', 'class', 'meth', 'method',
+                       'attr', 'attribute', 'mod', 'module', 'data', 'exc',
+                       'exception', 'const'])
+
+
+def _lookup_contexts(what, name):
+    """Class and module names are looked up relative to, as Sphinx does"""
+    parent = name.rpartition('.')[0]
+    if what == 'class':
+        contexts = [name, parent]
+    elif what in ('method', 'attribute', 'property'):
+        contexts = [parent, parent.rpartition('.')[0]]
+    else:
+        contexts = [parent]
+    return tuple(context for context in contexts if context)
+
+
+def record_names(app, what, name, obj, see_also=()):
+    """Remember a documented name and the See Also targets of its docstring.
+
+    They are kept per document, and checked in bulk by `check_see_also`
+    once all documents are read.
+    """
+    docname = _current_docname(app)
+    if not name:
+        return
+    _doc_state(app, 'numpydoc_names').setdefault(docname, []).append(name)
+    entries = []
+    for target, desc, role in see_also:
+        if role and role.split(':')[-1] not in _py_roles:
+            continue
+        entries.append(target)
+    if entries:
+        filename, line = source_location(obj)
+        state = _doc_state(app, 'numpydoc_see_also')
+        state.setdefault(docname, []).append(
+            (name, _lookup_contexts(what, name), filename, line, entries))
+
+
+def build_name_index(app, env):
+    """Index numpydoc's documented names and those known to Sphinx"""
+    index = NameIndex()
+    for names in _doc_state(app, 'numpydoc_names').values():
+        index.update(names)
+    domaindata = getattr(env, 'domaindata', {}).get('py', {})
+    for key in ('objects', 'modules'):
+        index.update(domaindata.get(key, ()))
+    inventory = getattr(env, 'intersphinx_inventory', {})
+    for objtype, objects in inventory.items():
+        if objtype.startswith('py:'):
+            index.update(objects)
+    return index
+
+
+def check_see_also(app, env):
+    """Resolve all See Also targets against the name index.
+
+    Targets that cannot be resolved are reported along with the other
+    numpydoc diagnostics, with suggestions.  Targets that only match a
+    documented name by suffix are reported too, unless
+    ``numpydoc_resolve_see_also`` is set, in which case `resolve_see_also`
+    links them.
+    """
+    index = build_name_index(app, env)
+    resolve_by_suffix = app.config.numpydoc_resolve_see_also
+    diagnostics = []
+    targets = set()
+    state = _doc_state(app, 'numpydoc_see_also')
+    for docname in sorted(state, key=lambda d: d or ''):
+        for name, contexts, filename, line, entries in state[docname]:
+            for target in entries:
+                targets.add(target)
+                if index.find(target, contexts) is not None:
+                    continue
+                message = _see_also_problem(index, target, resolve_by_suffix)
+                if message:
+                    diagnostics.append(Diagnostic(name, filename, line,
+                                                  'see-also', message))
+    app.numpydoc_name_index = index
+    app.numpydoc_see_also_targets = targets
+    app.numpydoc_see_also_diagnostics = diagnostics
+    return []
+
+
+def _see_also_problem(index, target, resolve_by_suffix):
+    matches = index.matches(target)
+    if len(matches) == 1:
+        if resolve_by_suffix:
+            return None
+        return ("See Also target %r is not found relative to the "
+                "documented object; use %r" % (target, matches[0]))
+    elif matches:
+        return ("See Also target %r is ambiguous, it may be any of %s"
+                % (target, ', '.join(matches)))
+    suggestions = index.suggest(target)
+    if suggestions:
+        return ("See Also target %r not found; did you mean %s?"
+                % (target, ' or '.join(suggestions)))
+    return "See Also target %r not found" % target
+
+
+def resolve_see_also(app, env, node, contnode):
+    """Link See Also targets only found in the name index by suffix"""
+    if not app.config.numpydoc_resolve_see_also:
+        return None
+    if node.get('refdomain') != 'py':
+        return None
+    index = getattr(app, 'numpydoc_name_index', None)
+    target = node.get('reftarget')
+    if index is None or target not in app.numpydoc_see_also_targets:
+        return None
+    module, cls = node.get('py:module'), node.get('py:class')
+    contexts = [context for context in
+                ('%s.%s' % (module, cls) if module and cls else cls, module)
+                if context]
+    if index.find(target, contexts) is not None:
+        return None  # Sphinx resolves it, or it is external
+    full = index.resolve(target)
+    if full is None:
+        return None
+    return env.get_domain('py').resolve_xref(
+        env, node['refdoc'], app.builder, node['reftype'], full, node,
+        contnode)
+
 
 def mangle_signature(app, what, name, obj, options, sig, retann):
     # Do not try to inspect classes that don't define `__init__`
@@ -114,13 +672,75 @@ def mangle_signature(app, what, name, obj, options, sig, retann):
 
     if not hasattr(obj, '__doc__'):
         return
-    doc = SphinxDocString(pydoc.getdoc(obj))
+    doc = SphinxDocString(pydoc.getdoc(obj),
+                          config={'template': get_config(app).template})
     sig = doc['Signature'] or getattr(obj, '__text_signature__', None)
     if sig:
         sig = re.sub(sixu("^[^(]*"), sixu(""), sig)
         return sig, sixu('')
 
 
+def update_config(app):
+    """Resolve the numpydoc settings once, when the build starts"""
+    app.numpydoc_references = ReferenceCounter()
+    app.numpydoc_config = NumpydocConfig.from_app(app)
+    app.numpydoc_rendered = {}
+    clear_cache()
+    stop_prefetch(app)
+    workers = getattr(app.config, 'numpydoc_prefetch_workers', 0)
+    if workers:
+        app.numpydoc_prefetched = PrefetchStore()
+        app.numpydoc_prefetcher = Prefetcher(
+            lambda what, obj: prefetch_docstring(app, what, obj), workers,
+            max_pending=app.numpydoc_prefetched.size)
+
+
+def stop_prefetch(app, exception=None):
+    prefetcher = getattr(app, 'numpydoc_prefetcher', None)
+    if prefetcher is not None:
+        prefetcher.cancel()
+        app.numpydoc_prefetcher = None
+        app.numpydoc_prefetched = None
+
+
+def report_diagnostics(app, exception):
+    """Report the problems of all documents in the environment, once each"""
+    entries = collections.OrderedDict()
+    state = _doc_state(app, 'numpydoc_diagnostics')
+    for docname in sorted(state, key=lambda d: d or ''):
+        entries.update((entry, None) for entry in state[docname])
+    for entry in getattr(app, 'numpydoc_see_also_diagnostics', []):
+        entries[entry] = None
+    diagnostics = DiagnosticsCollector()
+    diagnostics.extend(entries)
+
+    def warn(message, location):
+        if logger is not None:
+            logger.warning(message, location=location)
+        else:
+            app.warn(message, location)
+
+    diagnostics.emit(warn)
+    if app.config.numpydoc_diagnostics_json:
+        with io.open(app.config.numpydoc_diagnostics_json, 'w',
+                     encoding='utf-8') as f:
+            f.write(sixu(diagnostics.to_json(indent=1)))
+
+
+def report_stats(app, exception):
+    """Log how many docstrings were passed through or rendered once"""
+    total = passed = reused = 0
+    for stats in _doc_state(app, 'numpydoc_stats').values():
+        total += stats[0]
+        passed += stats[1]
+        reused += stats[2]
+    if total and logger is not None:
+        logger.info('numpydoc: %d docstrings, %d (%.0f%%) passed through '
+                    'unchanged, %d (%.0f%%) reused from identical docstrings'
+                    % (total, passed, 100. * passed / total,
+                       reused, 100. * reused / total))
+
+
 def setup(app, get_doc_object_=get_doc_object):
     if not hasattr(app, 'add_config_value'):
         return  # probably called by nose, better bail out
@@ -130,18 +750,34 @@ def setup(app, get_doc_object_=get_doc_object):
 
     app.connect('autodoc-process-docstring', mangle_docstrings)
     app.connect('autodoc-process-signature', mangle_signature)
+    app.connect('builder-inited', update_config)
+    app.connect('build-finished', report_diagnostics)
+    app.connect('build-finished', report_stats)
+    app.connect('build-finished', stop_prefetch)
+    app.connect('doctree-read', relabel_references)
+    app.connect('env-purge-doc', purge_doc_state)
+    app.connect('env-merge-info', merge_doc_state)
+    app.connect('env-updated', check_see_also)
+    app.connect('missing-reference', resolve_see_also)
     app.add_config_value('numpydoc_edit_link', None, False)
     app.add_config_value('numpydoc_use_plots', None, False)
     app.add_config_value('numpydoc_show_class_members', True, True)
     app.add_config_value('numpydoc_show_inherited_class_members', True, True)
     app.add_config_value('numpydoc_class_members_toctree', True, True)
     app.add_config_value('numpydoc_citation_re', '[a-z0-9_.-]+', True)
+    app.add_config_value('numpydoc_diagnostics_json', None, False)
+    app.add_config_value('numpydoc_resolve_see_also', False, True)
+    app.add_config_value('numpydoc_prefetch_workers', 0, False)
+    app.add_config_value('numpydoc_max_lines', 0, True)
+    app.add_config_value('numpydoc_time_limit', 0, True)
+    app.add_config_value('numpydoc_trusted_templates', False, False)
 
     # Extra mangling domains
     app.add_domain(NumpyPythonDomain)
     app.add_domain(NumpyCDomain)
 
-    metadata = {'parallel_read_safe': True}
+    metadata = {'parallel_read_safe': True,
+                'parallel_write_safe': True}
     return metadata
 
 # ------------------------------------------------------------------------------
@@ -0,0 +1,191 @@
+"""Render docstrings of a module in the background, ahead of autodoc.
+
+autodoc emits ``autodoc-process-docstring`` for one object at a time, so
+numpydoc parses and renders every docstring on the critical path of the
+build.  A :class:`Prefetcher` is handed each module as soon as autodoc first
+touches it, and queues its public functions, classes and methods to a small
+pool of worker threads.  The workers render into the memo that
+`numpydoc.numpydoc.render_docstring` looks up, so that the later calls from
+autodoc find their output ready.
+
+Memory use is bounded: members beyond ``max_pending`` queued objects, or
+of modules beyond the first ``max_modules``, are simply rendered on demand,
+and prefetched output is kept in a `PrefetchStore` of limited size until
+autodoc first asks for it.  `Prefetcher.cancel` drops all queued work and
+stops the workers.
+
+The workers share the GIL with the rest of the build, so rendering itself
+does not run in parallel; the gain comes from overlapping it with the I/O
+and import time of the main thread.
+
+"""
+from __future__ import division, absolute_import, print_function
+
+import collections
+import inspect
+import os
+import threading
+
+try:
+    import queue
+except ImportError:  # Python 2
+    import Queue as queue
+
+
+def iter_members(module):
+    """Public functions, classes and methods defined in ``module``.
+
+    Yields
+    ------
+    what : str
+        ``'function'``, ``'class'`` or ``'method'``, as passed by autodoc.
+    obj : object
+    """
+    names = getattr(module, '__all__', None)
+    if names is None:
+        names = [name for name in sorted(vars(module))
+                 if not name.startswith('_')]
+    for name in names:
+        obj = getattr(module, name, None)
+        if getattr(obj, '__module__', None) != module.__name__:
+            continue
+        if inspect.isclass(obj):
+            yield 'class', obj
+            for member_name, member in sorted(vars(obj).items()):
+                if (not member_name.startswith('_') and
+                        inspect.isfunction(member)):
+                    yield 'method', member
+        elif inspect.isfunction(obj) or inspect.isbuiltin(obj):
+            yield 'function', obj
+
+
+class PrefetchStore(object):
+    """Output rendered ahead of use, evicted once it is used.
+
+    Parameters
+    ----------
+    size : int
+        Maximum number of entries kept; the oldest are dropped first.
+    """
+
+    def __init__(self, size=1000):
+        self.size = size
+        self._entries = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def __len__(self):
+        return len(self._entries)
+
+    def put(self, key, value):
+        with self._lock:
+            self._entries[key] = value
+            while len(self._entries) > self.size:
+                self._entries.popitem(last=False)
+
+    def pop(self, key):
+        """Remove and return the entry for ``key``, or None"""
+        with self._lock:
+            return self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+class Prefetcher(object):
+    """Pool of threads calling ``task(what, obj)`` for the members of modules.
+
+    Parameters
+    ----------
+    task : callable
+        Called with the arguments yielded by `iter_members`.  Exceptions
+        are ignored, the object is then processed on demand.
+    workers : int
+        Number of threads, started on the first `submit_module`.
+    max_pending : int
+        Maximum number of objects queued at a time.
+    max_modules : int
+        Maximum number of modules submitted; later ones are ignored.
+    """
+
+    def __init__(self, task, workers=2, max_pending=1000, max_modules=1000):
+        self.task = task
+        self.workers = workers
+        self.max_pending = max_pending
+        self.max_modules = max_modules
+        self._seen = set()
+        self._lock = threading.Lock()
+        self._pid = None
+        self._start()
+
+    def _start(self):
+        self._queue = queue.Queue(self.max_pending)
+        self._cancelled = threading.Event()
+        self._threads = []
+
+    def _ensure_workers(self):
+        if self._pid == os.getpid():
+            return
+        # first use, or threads did not survive the fork of a parallel build
+        self._pid = os.getpid()
+        self._start()
+        for i in range(self.workers):
+            thread = threading.Thread(target=self._work,
+                                      name='numpydoc-prefetch-%d' % i)
+            thread.daemon = True
+            thread.start()
+            self._threads.append(thread)
+
+    def _work(self):
+        jobs, cancelled = self._queue, self._cancelled
+        while not cancelled.is_set():
+            job = jobs.get()
+            if job is None or cancelled.is_set():
+                break
+            try:
+                self.task(*job)
+            except Exception:
+                pass
+
+    def submit_module(self, module):
+        """Queue the members of ``module``, unless it was seen before.
+
+        Returns
+        -------
+        n : int
+            Number of objects queued.
+        """
+        name = getattr(module, '__name__', None)
+        with self._lock:
+            if (name is None or name in self._seen or
+                    len(self._seen) >= self.max_modules or
+                    self._cancelled.is_set()):
+                return 0
+            self._seen.add(name)
+            self._ensure_workers()
+        n = 0
+        for job in iter_members(module):
+            try:
+                self._queue.put_nowait(job)
+            except queue.Full:
+                break
+            n += 1
+        return n
+
+    def cancel(self):
+        """Drop queued objects and stop the workers"""
+        self._cancelled.set()
+        try:
+            while True:
+                self._queue.get_nowait()
+        except queue.Empty:
+            pass
+        for thread in self._threads:
+            try:
+                self._queue.put_nowait(None)
+            except queue.Full:
+                break
+        self._threads = []
@@ -0,0 +1,531 @@
+"""Render parsed docstrings as Markdown, HTML or terminal text.
+
+These renderers work on the sections of a `~numpydoc.docscrape.NumpyDocString`
+and import neither Sphinx nor docutils, for interactive uses such as help
+panes, API browsers and command line help, where going through Sphinx is too
+slow.  Only the common reStructuredText constructs found in docstrings are
+translated: inline literals, roles, emphasis, paragraphs, bullet lists,
+literal and doctest blocks, and a few directives.
+
+Renderers stream their output::
+
+    for chunk in iter_render(doc, 'html'):
+        write(chunk)
+
+while :func:`render` returns a string, and caches the output for docstrings
+given as text, per format.  Further formats can be added with
+:func:`register_renderer`.
+
+"""
+from __future__ import division, absolute_import, print_function
+
+import argparse
+import collections
+import inspect
+import pydoc
+import re
+import sys
+import textwrap
+import threading
+from xml.sax.saxutils import escape as _xml_escape
+
+from .docscrape import (NumpyDocString, FunctionDoc, ClassDoc,
+                        CUSTOM_SECTIONS)
+
+RENDERERS = collections.OrderedDict()
+
+
+def register_renderer(name):
+    """Class decorator adding a `Renderer` subclass under a format name.
+
+    Parameters
+    ----------
+    name : str
+        Format name, as passed to `render` and `iter_render`.
+    """
+    def decorator(cls):
+        RENDERERS[name] = cls
+        return cls
+    return decorator
+
+
+# ``literal``, :role:`target`, `default role`, [citation]_, **strong**,
+# *emphasis*
+_inline_re = re.compile(r"""
+      ``(?P<literal>.+?)``
+    | \[(?P<citation>[\w.-]+)\]_
+    | (?::(?P<role>[\w:.+-]+):)?`(?P<target>[^`]+)`_{0,2}
+    | \*\*(?P<strong>[^*]+)\*\*
+    | \*(?P<emphasis>[^*\s][^*]*)\*
+    """, re.X)
+_titled_target_re = re.compile(r'^(.*?)\s*<[^<>]+>$')
+_directive_re = re.compile(r'^\.\.\s+(?:([\w:-]+)::\s*(.*)|'
+                           r'\[([^\]]+)\]\s*(.*))')
+_bullet_re = re.compile(r'^([-*+]|\d+[.)]|#\.)\s+')
+_code_directives = ('math', 'code', 'code-block', 'sourcecode', 'plot',
+                    'literalinclude')
+
+
+def _target_text(target):
+    m = _titled_target_re.match(target)
+    if m and m.group(1):
+        return m.group(1)
+    if target.startswith('~'):
+        return target[1:].rsplit('.', 1)[-1]
+    return target.lstrip('!')
+
+
+def _indented_block(lines, i):
+    """Read the blank or indented lines from ``i``, return them dedented"""
+    block = []
+    while i < len(lines) and (not lines[i].strip() or lines[i][:1].isspace()):
+        block.append(lines[i])
+        i += 1
+    while block and not block[-1].strip():
+        block.pop()
+    return textwrap.dedent('\n'.join(block)).split('\n') if block else [], i
+
+
+def iter_blocks(lines):
+    """Split free-form docstring text into blocks.
+
+    Yields
+    ------
+    kind : {'paragraph', 'code', 'doctest', 'list'}
+    content : list
+        Lines of the block.  For lists, a list of lines per item.
+    """
+    lines = textwrap.dedent('\n'.join(lines)).split('\n')
+    i = 0
+    while i < len(lines):
+        line = lines[i]
+        if not line.strip():
+            i += 1
+        elif line[:1].isspace():
+            block, i = _indented_block(lines, i)
+            yield 'code', block
+        elif line.startswith('>>>'):
+            block = []
+            while i < len(lines) and lines[i].strip():
+                block.append(lines[i])
+                i += 1
+            yield 'doctest', block
+        elif line.startswith('..'):
+            m = _directive_re.match(line)
+            body, i = _indented_block(lines, i + 1)
+            if m is None:
+                continue  # comment
+            name, arg, label, text = m.groups()
+            if label is not None:
+                yield 'paragraph', ['[%s] %s' % (label, text)] + body
+            elif name in _code_directives:
+                yield 'code', ([arg] if arg else []) + body
+            elif name in ('only', 'index', 'autosummary', 'toctree'):
+                continue
+            else:
+                title = name.split(':')[-1].capitalize()
+                yield 'paragraph', ['%s: %s' % (title, arg) if arg
+                                    else '%s:' % title] + body
+        elif _bullet_re.match(line):
+            items = []
+            while i < len(lines):
+                m = _bullet_re.match(lines[i])
+                if m:
+                    items.append([lines[i][m.end():]])
+                    i += 1
+                elif lines[i][:1].isspace() or (
+                        not lines[i].strip() and i + 1 < len(lines) and
+                        (lines[i + 1][:1].isspace() or
+                         _bullet_re.match(lines[i + 1]))):
+                    if lines[i].strip():
+                        items[-1].append(lines[i].strip())
+                    i += 1
+                else:
+                    break
+            yield 'list', items
+        else:
+            block = []
+            while (i < len(lines) and lines[i].strip() and
+                   not lines[i].startswith('>>>')):
+                block.append(lines[i].strip())
+                i += 1
+            if block[-1].endswith('::'):
+                block[-1] = block[-1][:-1]
+                if block[-1].endswith(' :') or block[-1] == ':':
+                    block[-1] = block[-1][:-2].rstrip()
+            yield 'paragraph', block
+
+
+class Renderer(object):
+    """Render a parsed docstring, one chunk of text at a time.
+
+    Subclasses define how text is escaped and marked up; the section
+    layout is shared.
+
+    Parameters
+    ----------
+    doc : NumpyDocString
+    """
+    param_sections = ('Parameters', 'Returns', 'Yields', 'Other Parameters',
+                      'Raises', 'Warns')
+
+    def __init__(self, doc):
+        self.doc = doc
+
+    def __iter__(self):
+        doc = self.doc
+        if doc['Signature']:
+            # FunctionDoc escapes stars for reStructuredText
+            yield self.code_block([doc['Signature'].replace('\\*', '*')])
+        for chunk in self.blocks(doc['Summary'] + [''] +
+                                 doc['Extended Summary']):
+            yield chunk
+        for name in self.param_sections:
+            for chunk in self.param_list(name, doc[name]):
+                yield chunk
+        for chunk in self.text_section('Warnings'):
+            yield chunk
+        for chunk in self.see_also(doc['See Also']):
+            yield chunk
+        for name in ('Notes', 'References', 'Examples'):
+            for chunk in self.text_section(name):
+                yield chunk
+        for name in CUSTOM_SECTIONS:
+            # the content of sections with their own parser may not be text
+            if name not in NumpyDocString._section_parsers:
+                for chunk in self.text_section(name):
+                    yield chunk
+        for name in ('Attributes', 'Methods'):
+            # only the first paragraph of member descriptions
+            items = [(member, type_, self._first_paragraph(desc))
+                     for member, type_, desc in doc[name]]
+            for chunk in self.param_list(name, items):
+                yield chunk
+
+    def render(self):
+        return ''.join(self)
+
+    def _first_paragraph(self, lines):
+        out = []
+        for line in lines:
+            if not line.strip():
+                break
+            out.append(line)
+        return out
+
+    def text_section(self, name):
+        if self.doc[name]:
+            yield self.heading(name)
+            for chunk in self.blocks(self.doc[name]):
+                yield chunk
+
+    def blocks(self, lines):
+        for kind, content in iter_blocks(lines):
+            if kind == 'paragraph':
+                yield self.paragraph(self.inline(' '.join(content)))
+            elif kind == 'list':
+                yield self.bullet_list([self.inline(' '.join(item))
+                                        for item in content])
+            else:
+                yield self.code_block(content,
+                                      'python' if kind == 'doctest' else '')
+
+    def inline(self, text):
+        """Translate inline reStructuredText markup of ``text``"""
+        out = []
+        pos = 0
+        for m in _inline_re.finditer(text):
+            out.append(self.escape(text[pos:m.start()]))
+            if m.group('literal') is not None:
+                out.append(self.literal(m.group('literal')))
+            elif m.group('citation') is not None:
+                out.append(self.escape('[%s]' % m.group('citation')))
+            elif m.group('target') is not None:
+                out.append(self.literal(_target_text(m.group('target'))))
+            elif m.group('strong') is not None:
+                out.append(self.strong(self.escape(m.group('strong'))))
+            else:
+                out.append(self.emphasis(self.escape(m.group('emphasis'))))
+            pos = m.end()
+        out.append(self.escape(text[pos:]))
+        return ''.join(out)
+
+    def param_list(self, name, items):
+        if items:
+            yield self.heading(name)
+            yield self.list_start(name)
+            for param, type_, desc in items:
+                yield self.param(self.strong(self.escape(param.strip())),
+                                 self.inline(type_),
+                                 ''.join(self.blocks(desc)))
+            yield self.list_end(name)
+
+    def see_also(self, items):
+        if items:
+            yield self.heading('See Also')
+            yield self.list_start('See Also')
+            for func, desc, role in items:
+                yield self.param(self.literal(func), '',
+                                 ''.join(self.blocks(desc)))
+            yield self.list_end('See Also')
+
+    # markup, defined by subclasses
+
+    def escape(self, text):
+        return text
+
+    def literal(self, text):
+        return text
+
+    def strong(self, text):
+        return text
+
+    def emphasis(self, text):
+        return text
+
+    def heading(self, name):
+        raise NotImplementedError
+
+    def paragraph(self, text):
+        raise NotImplementedError
+
+    def bullet_list(self, items):
+        raise NotImplementedError
+
+    def code_block(self, lines, language=''):
+        raise NotImplementedError
+
+    def list_start(self, name):
+        return ''
+
+    def list_end(self, name):
+        return ''
+
+    def param(self, name, type_, desc):
+        """One item of a parameter list, from marked up parts"""
+        raise NotImplementedError
+
+
+def _indent(text, indent):
+    return ''.join(indent + line if line.strip() else line
+                   for line in text.splitlines(True))
+
+
+@register_renderer('markdown')
+class MarkdownRenderer(Renderer):
+    _escape_re = re.compile(r'([\\`*_\[\]<>|])')
+
+    def escape(self, text):
+        return self._escape_re.sub(r'\\\1', text)
+
+    def literal(self, text):
+        fence = '``' if '`' in text else '`'
+        return '%s%s%s' % (fence, text, fence)
+
+    def strong(self, text):
+        return '**%s**' % text
+
+    def emphasis(self, text):
+        return '*%s*' % text
+
+    def heading(self, name):
+        return '#### %s\n\n' % name
+
+    def paragraph(self, text):
+        return text + '\n\n'
+
+    def bullet_list(self, items):
+        return ''.join('- %s\n' % item for item in items) + '\n'
+
+    def code_block(self, lines, language=''):
+        return '```%s\n%s\n```\n\n' % (language, '\n'.join(lines))
+
+    def param(self, name, type_, desc):
+        head = '- %s' % name
+        if type_:
+            head += ' : %s' % self.emphasis(type_)
+        if desc:
+            return '%s\n\n%s' % (head, _indent(desc, '    '))
+        return head + '\n\n'
+
+
+@register_renderer('html')
+class HTMLRenderer(Renderer):
+    """HTML fragment, with a ``numpydoc-`` class on each section list"""
+
+    def escape(self, text):
+        return _xml_escape(text, {'"': '&quot;'})
+
+    def literal(self, text):
+        return '<code>%s</code>' % self.escape(text)
+
+    def strong(self, text):
+        return '<strong>%s</strong>' % text
+
+    def emphasis(self, text):
+        return '<em>%s</em>' % text
+
+    def heading(self, name):
+        return '<h4>%s</h4>\n' % self.escape(name)
+
+    def paragraph(self, text):
+        return '<p>%s</p>\n' % text
+
+    def bullet_list(self, items):
+        return '<ul>\n%s</ul>\n' % ''.join('<li>%s</li>\n' % item
+                                           for item in items)
+
+    def code_block(self, lines, language=''):
+        cls = ' class="language-%s"' % language if language else ''
+        return '<pre><code%s>%s</code></pre>\n' % (
+            cls, self.escape('\n'.join(lines)))
+
+    def list_start(self, name):
+        return '<dl class="numpydoc-%s">\n' % name.lower().replace(' ', '-')
+
+    def list_end(self, name):
+        return '</dl>\n'
+
+    def param(self, name, type_, desc):
+        out = '<dt>%s' % name
+        if type_:
+            out += ' : <span class="numpydoc-type">%s</span>' % type_
+        out += '</dt>\n'
+        if desc:
+            out += '<dd>%s</dd>\n' % desc
+        return out
+
+
+@register_renderer('text')
+class TextRenderer(Renderer):
+    """Plain text for terminals, indented like numpydoc docstrings"""
+    bold = underline = italic = cyan = reset = ''
+
+    def literal(self, text):
+        return self.cyan + text + self.reset
+
+    def strong(self, text):
+        return self.bold + text + self.reset
+
+    def emphasis(self, text):
+        return self.italic + text + self.reset
+
+    def heading(self, name):
+        return '%s%s%s\n%s\n' % (self.bold, name, self.reset,
+                                 '-' * len(name))
+
+    def paragraph(self, text):
+        return text + '\n\n'
+
+    def bullet_list(self, items):
+        return ''.join('* %s\n' % item for item in items) + '\n'
+
+    def code_block(self, lines, language=''):
+        return _indent('\n'.join(lines) + '\n', '    ') + '\n'
+
+    def param(self, name, type_, desc):
+        out = name
+        if type_:
+            out += ' : ' + type_
+        out += '\n'
+        if desc:
+            out += _indent(desc.rstrip('\n') + '\n', '    ')
+        return out + '\n'
+
+
+@register_renderer('ansi')
+class ANSIRenderer(TextRenderer):
+    """`TextRenderer` with ANSI escape sequences for terminal styles"""
+    bold = '\x1b[1m'
+    italic = '\x1b[3m'
+    cyan = '\x1b[36m'
+    reset = '\x1b[0m'
+
+
+_caches = {}
+_cache_lock = threading.Lock()
+cache_size = 1024
+
+
+def iter_render(doc, format='markdown'):
+    """Render a docstring chunk by chunk, without caching.
+
+    Parameters
+    ----------
+    doc : str or NumpyDocString
+    format : str
+        A name in `RENDERERS`: ``'markdown'``, ``'html'``, ``'text'``,
+        ``'ansi'`` or a registered format.
+
+    Yields
+    ------
+    chunk : str
+    """
+    if not isinstance(doc, NumpyDocString):
+        doc = NumpyDocString(doc)
+    return iter(RENDERERS[format](doc))
+
+
+def render(doc, format='markdown'):
+    """Render a docstring to a string.
+
+    Docstrings given as text are cached by format, up to `cache_size`
+    docstrings per format, least recently used first out.
+
+    Parameters
+    ----------
+    doc : str or NumpyDocString
+    format : str
+        See `iter_render`.
+
+    Returns
+    -------
+    text : str
+    """
+    if isinstance(doc, NumpyDocString):
+        return RENDERERS[format](doc).render()
+
+    with _cache_lock:
+        cache = _caches.setdefault(format, collections.OrderedDict())
+        try:
+            text = cache.pop(doc)
+        except KeyError:
+            text = None
+        else:
+            cache[doc] = text
+    if text is None:
+        text = RENDERERS[format](NumpyDocString(doc)).render()
+        with _cache_lock:
+            cache[doc] = text
+            while len(cache) > cache_size:
+                cache.popitem(last=False)
+    return text
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Print the docstring of a Python object, rendered.")
+    parser.add_argument('object', help="importable name, e.g. numpy.sum")
+    parser.add_argument('--format', choices=list(RENDERERS), default=None,
+                        help="output format; ansi on terminals, text "
+                             "otherwise")
+    args = parser.parse_args(argv)
+
+    obj = pydoc.locate(args.object)
+    if obj is None:
+        print('%s not found' % args.object, file=sys.stderr)
+        return 1
+    if inspect.isclass(obj):
+        doc = ClassDoc(obj)
+    elif callable(obj):
+        doc = FunctionDoc(obj)
+    else:
+        doc = NumpyDocString(pydoc.getdoc(obj))
+    fmt = args.format or ('ansi' if sys.stdout.isatty() else 'text')
+    for chunk in iter_render(doc, fmt):
+        sys.stdout.write(chunk)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,263 @@
+"""Compact binary encoding of parsed docstrings.
+
+Parsing a docstring is much slower than reading back its parsed sections,
+so caches and worker pools can store or send :func:`dumps` output instead of
+re-parsing the docstring text, or pickling the whole
+:class:`~numpydoc.docscrape.NumpyDocString` along with its reader state.
+
+The format is::
+
+    magic     b'NPDS'
+    version   1 byte
+    strings   varint count, varint byte length of the blob, the length of
+              each string in characters as varints, then the UTF-8 blob
+              of all strings concatenated
+    value     tagged value, see below
+
+All strings are interned in the string table and referenced by index, so
+repeated type names, roles and blank lines are stored only once.  Values
+are a tag byte followed by:
+
+- ``None``: nothing
+- ``str``: varint string index
+- list of ``str``: varint length, then the string indices
+- ``list``/``tuple``/``dict``: varint length, then the items (for dicts,
+  alternating keys and values)
+
+Lengths and indices are unsigned LEB128 varints.  Only non-empty sections
+are stored.
+
+"""
+from __future__ import division, absolute_import, print_function
+
+import sys
+
+from .docscrape import NumpyDocString
+
+MAGIC = b'NPDS'
+VERSION = 1
+
+_NONE, _STR, _STRLIST, _LIST, _TUPLE, _DICT = range(6)
+
+if sys.version_info[0] >= 3:
+    text_type = str
+else:
+    text_type = unicode
+
+
+class DecodeError(ValueError):
+    pass
+
+
+def _write_varint(out, n):
+    while n >= 0x80:
+        out.append((n & 0x7f) | 0x80)
+        n >>= 7
+    out.append(n)
+
+
+class _Encoder(object):
+    def __init__(self):
+        self.strings = []
+        self.index = {}
+        self.body = bytearray()
+
+    def intern(self, s):
+        try:
+            return self.index[s]
+        except KeyError:
+            i = self.index[s] = len(self.strings)
+            self.strings.append(s)
+            return i
+
+    def value(self, v):
+        body = self.body
+        if v is None:
+            body.append(_NONE)
+        elif isinstance(v, (str, text_type)):
+            body.append(_STR)
+            _write_varint(body, self.intern(v))
+        elif isinstance(v, dict):
+            body.append(_DICT)
+            _write_varint(body, len(v))
+            for key in sorted(v):
+                self.value(key)
+                self.value(v[key])
+        elif (not isinstance(v, tuple) and
+              all(isinstance(item, (str, text_type)) for item in v)):
+            # lines of text, by far the most common kind of value
+            body.append(_STRLIST)
+            v = list(v)
+            _write_varint(body, len(v))
+            for item in v:
+                _write_varint(body, self.intern(item))
+        else:
+            body.append(_TUPLE if isinstance(v, tuple) else _LIST)
+            v = list(v)
+            _write_varint(body, len(v))
+            for item in v:
+                self.value(item)
+
+    def getvalue(self):
+        out = bytearray(MAGIC)
+        out.append(VERSION)
+        blob = u''.join(self.strings).encode('utf-8')
+        _write_varint(out, len(self.strings))
+        _write_varint(out, len(blob))
+        for s in self.strings:
+            _write_varint(out, len(s))
+        out += blob
+        out += self.body
+        return bytes(out)
+
+
+class _Decoder(object):
+    def __init__(self, data):
+        if sys.version_info[0] < 3:
+            data = bytearray(data)
+        self.data = memoryview(data)
+        self.size = len(self.data)
+        self.pos = 0
+
+    def truncated(self, pos):
+        return DecodeError("Truncated data at offset %d" % pos)
+
+    def byte(self):
+        pos = self.pos
+        if pos >= self.size:
+            raise self.truncated(pos)
+        self.pos = pos + 1
+        return self.data[pos]
+
+    def varint(self):
+        # inlined reads, as this is the innermost loop of decoding
+        data, pos, size = self.data, self.pos, self.size
+        if pos >= size:
+            raise self.truncated(pos)
+        b = data[pos]
+        pos += 1
+        if b < 0x80:
+            self.pos = pos
+            return b
+        result = b & 0x7f
+        shift = 7
+        while True:
+            if pos >= size:
+                raise self.truncated(pos)
+            b = data[pos]
+            pos += 1
+            result |= (b & 0x7f) << shift
+            if b < 0x80:
+                self.pos = pos
+                return result
+            shift += 7
+
+    def string(self):
+        pos = self.pos
+        try:
+            return self.strings[self.varint()]
+        except IndexError:
+            raise DecodeError("Invalid string reference at offset %d" % pos)
+
+    def header(self):
+        if bytes(self.data[:4]) != MAGIC:
+            raise DecodeError("Not a serialized docstring")
+        self.pos = 4
+        version = self.byte()
+        if version != VERSION:
+            raise DecodeError("Unsupported serialization version %d"
+                              % version)
+        count = self.varint()
+        size = self.varint()
+        lengths = [self.varint() for i in range(count)]
+        if self.pos + size > self.size:
+            raise self.truncated(self.size)
+        try:
+            blob = bytes(self.data[self.pos:self.pos + size]).decode('utf-8')
+        except UnicodeDecodeError as e:
+            raise DecodeError("Invalid string data: %s" % e)
+        self.pos += size
+        strings = []
+        start = 0
+        for n in lengths:
+            strings.append(blob[start:start + n])
+            start += n
+        self.strings = strings
+
+    def value(self):
+        tag = self.byte()
+        if tag == _STR:
+            return self.string()
+        elif tag == _NONE:
+            return None
+        n = self.varint()
+        if tag == _STRLIST:
+            string = self.string
+            return [string() for i in range(n)]
+        elif tag == _LIST:
+            return [self.value() for i in range(n)]
+        elif tag == _TUPLE:
+            return tuple([self.value() for i in range(n)])
+        elif tag == _DICT:
+            out = {}
+            for i in range(n):
+                key = self.value()
+                out[key] = self.value()
+            return out
+        raise DecodeError("Invalid tag %d at offset %d" % (tag, self.pos - 1))
+
+
+def encode(data):
+    """Encode a mapping of parsed sections.
+
+    Parameters
+    ----------
+    data : mapping
+        Section names to section content, such as a `NumpyDocString`.
+
+    Returns
+    -------
+    encoded : bytes
+    """
+    encoder = _Encoder()
+    encoder.value(dict((key, value) for key, value in data.items() if value))
+    return encoder.getvalue()
+
+
+def decode(data):
+    """Decode the output of `encode` back into a dict of sections.
+
+    Parameters
+    ----------
+    data : bytes-like
+        Any object supporting the buffer protocol, for instance a slice of
+        a memory-mapped file.
+
+    Returns
+    -------
+    sections : dict
+        Only the sections that were not empty when encoded.
+    """
+    decoder = _Decoder(data)
+    decoder.header()
+    return decoder.value()
+
+
+def dumps(doc):
+    """Serialize a parsed docstring to bytes"""
+    return encode(doc)
+
+
+def loads(data, cls=NumpyDocString, config={}):
+    """Recreate a parsed docstring from `dumps` output without parsing.
+
+    Parameters
+    ----------
+    data : bytes-like
+    cls : type
+        `NumpyDocString` or a subclass that can be created from a docstring
+        alone, such as `SphinxDocString`.
+    config : dict
+        Passed on to the constructor of ``cls``.
+    """
+    return cls.from_dict(decode(data), config=config)
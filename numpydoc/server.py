@@ -0,0 +1,352 @@
+"""Resident numpydoc render server.
+
+Starting a fresh Python process for each preview means importing Sphinx and
+Jinja, compiling the docstring template and importing the documented modules
+every time.  The server pays these costs once, and keeps the compiled
+template, the documented objects and recent results in memory::
+
+    python -m numpydoc.server --socket /tmp/numpydoc.sock
+
+Clients connect to the Unix socket and send one JSON request per line; each
+gets a JSON response line.  A request names an operation and either a
+docstring or the importable name of an object::
+
+    {"id": 1, "op": "render", "docstring": "Summary.\\n\\nParameters\\n..."}
+    {"id": 2, "op": "parse", "object": "numpy.linalg.norm"}
+    {"id": 3, "op": "validate", "object": "mypackage.func"}
+
+``parse`` returns `NumpyDocString.to_dict` output, ``render`` the
+reStructuredText numpydoc gives Sphinx and ``validate`` a list of
+`numpydoc.validate` diagnostics.  An optional ``config`` object overrides
+options such as ``show_class_members``.  Responses are
+``{"id": ..., "result": ...}`` or ``{"id": ..., "error": "message"}``.
+
+Objects are imported again, and their results recomputed, once the source
+file of their module changes, so that previews follow edits.
+
+Connections are served by an :mod:`asyncio` event loop, so any number of
+clients can stay connected, and requests are processed in a thread pool,
+so that a slow request does not hold up the others.  Each connection gets
+its responses in the order of its requests.  :func:`request` is a minimal
+blocking client.
+
+"""
+from __future__ import division, absolute_import, print_function
+
+import argparse
+import collections
+import importlib
+import json
+import os
+import socket
+import stat
+import sys
+import threading
+
+from .docscrape_sphinx import get_doc_object, load_template
+from . import validate
+
+try:
+    import asyncio
+except ImportError:  # Python 2
+    asyncio = None
+
+try:
+    from importlib import reload
+except ImportError:  # Python 2
+    pass
+
+
+DEFAULT_CONFIG = {'use_plots': False,
+                  'show_class_members': True,
+                  'show_inherited_class_members': True,
+                  'class_members_toctree': True}
+
+
+def _module_stamp(module):
+    """Modification time of the source of ``module``, if any"""
+    filename = getattr(module, '__file__', None)
+    if filename is None:
+        return None
+    if filename.endswith(('.pyc', '.pyo')):
+        filename = filename[:-1]
+    try:
+        return os.stat(filename).st_mtime
+    except OSError:
+        return None
+
+
+class RenderService(object):
+    """Handle requests, keeping template, object and result caches warm.
+
+    This is independent of the transport, and can be used in-process, from
+    several threads.
+
+    Parameters
+    ----------
+    config : dict, optional
+        Defaults for the options of `get_doc_object`.
+    cache_size : int
+        Maximum number of results, and of imported objects, kept.  The
+        least recently used are dropped first.
+    """
+    def __init__(self, config=None, cache_size=1024):
+        self.config = dict(DEFAULT_CONFIG)
+        self.config.update(config or {})
+        self.template = load_template()
+        self.cache_size = cache_size
+        self._lock = threading.Lock()
+        self._objects = collections.OrderedDict()
+        self._results = collections.OrderedDict()
+
+    def _cache_get(self, cache, key):
+        # raises KeyError, and marks the entry as recently used
+        with self._lock:
+            value = cache.pop(key)
+            cache[key] = value
+            return value
+
+    def _cache_set(self, cache, key, value):
+        with self._lock:
+            cache.pop(key, None)
+            cache[key] = value
+            while len(cache) > self.cache_size:
+                cache.popitem(last=False)
+
+    def _lookup(self, name):
+        """The object with the given dotted name and the stamp of its module.
+
+        Objects are imported again when the source of their module has
+        changed since they were last imported.
+        """
+        try:
+            obj, module, stamp = self._cache_get(self._objects, name)
+        except KeyError:
+            module = None
+        else:
+            if _module_stamp(module) == stamp:
+                return obj, stamp
+            module = reload(module)
+        parts = name.split('.')
+        for i in range(len(parts), 0, -1):
+            modname = '.'.join(parts[:i])
+            if module is not None and module.__name__ != modname:
+                continue
+            try:
+                obj = module or importlib.import_module(modname)
+            except ImportError:
+                continue
+            module = obj
+            for attr in parts[i:]:
+                obj = getattr(obj, attr)
+            break
+        else:
+            raise ImportError("Cannot import %s" % name)
+        stamp = _module_stamp(module)
+        self._cache_set(self._objects, name, (obj, module, stamp))
+        return obj, stamp
+
+    def resolve(self, name):
+        """Import the object with the given dotted name"""
+        return self._lookup(name)[0]
+
+    def _doc_object(self, docstring, name, config):
+        obj = self.resolve(name) if name else None
+        config = dict(config, template=self.template)
+        if obj is None:
+            return get_doc_object(None, what='object', doc=docstring,
+                                  config=config)
+        return get_doc_object(obj, doc=docstring, config=config)
+
+    def op_parse(self, docstring, name, config):
+        return self._doc_object(docstring, name, config).to_dict()
+
+    def op_render(self, docstring, name, config):
+        return str(self._doc_object(docstring, name, config))
+
+    def op_validate(self, docstring, name, config):
+        obj = self.resolve(name) if name else None
+        return [entry._asdict() for entry in
+                validate.validate_object(obj, doc=docstring)]
+
+    def handle(self, request):
+        """Process one request.
+
+        Parameters
+        ----------
+        request : dict
+            Decoded request, see the module docstring.
+
+        Returns
+        -------
+        response : dict
+        """
+        response = {'id': request.get('id')}
+        try:
+            op = getattr(self, 'op_%s' % request['op'], None)
+            if op is None:
+                raise ValueError("Unknown operation %r" % request['op'])
+            docstring = request.get('docstring')
+            name = request.get('object')
+            if docstring is None and name is None:
+                raise ValueError("Either a docstring or an object is needed")
+            config = dict(self.config)
+            config.update(request.get('config') or {})
+
+            # results for objects are recomputed when their source changes
+            stamp = self._lookup(name)[1] if name else None
+            key = (request['op'], docstring, name, stamp,
+                   json.dumps(config, sort_keys=True))
+            try:
+                result = self._cache_get(self._results, key)
+            except KeyError:
+                result = op(docstring, name, config)
+                self._cache_set(self._results, key, result)
+            response['result'] = result
+        except Exception as e:
+            # including errors raised while importing the object
+            response['error'] = '%s: %s' % (type(e).__name__, e)
+        return response
+
+    def handle_line(self, line):
+        """Process one JSON-encoded request line into a response line"""
+        try:
+            request = json.loads(line.decode('utf-8'))
+            if not isinstance(request, dict):
+                raise ValueError("Requests must be JSON objects")
+        except ValueError as e:
+            response = {'id': None, 'error': 'Invalid request: %s' % e}
+        else:
+            response = self.handle(request)
+        return json.dumps(response).encode('utf-8') + b'\n'
+
+
+if asyncio is not None:
+    class _Protocol(asyncio.Protocol):
+        def __init__(self, service, loop):
+            self.service = service
+            self.loop = loop
+            self.buffer = b''
+            self.pending = collections.deque()
+
+        def connection_made(self, transport):
+            self.transport = transport
+
+        def data_received(self, data):
+            self.buffer += data
+            while b'\n' in self.buffer:
+                line, self.buffer = self.buffer.split(b'\n', 1)
+                if line.strip():
+                    future = self.loop.run_in_executor(
+                        None, self.service.handle_line, line)
+                    future.add_done_callback(self._flush)
+                    self.pending.append(future)
+
+        def _flush(self, future=None):
+            # responses are written in the order of the requests
+            while self.pending and self.pending[0].done():
+                response = self.pending.popleft().result()
+                if not self.transport.is_closing():
+                    self.transport.write(response)
+
+
+def start_server(path, service=None, loop=None):
+    """Start serving on a Unix socket in an asyncio event loop.
+
+    Parameters
+    ----------
+    path : str
+        Path of the socket.  A stale socket file is replaced.
+    service : RenderService, optional
+    loop : asyncio event loop, optional
+        Defaults to the current event loop.
+
+    Returns
+    -------
+    server : asyncio.AbstractServer
+        Close it to stop serving.
+
+    Raises
+    ------
+    ValueError
+        If ``path`` exists and is not a socket.
+    """
+    if asyncio is None:
+        raise RuntimeError("The numpydoc server requires Python 3")
+    if service is None:
+        service = RenderService()
+    if loop is None:
+        loop = asyncio.get_event_loop()
+    if os.path.exists(path):
+        if not stat.S_ISSOCK(os.stat(path).st_mode):
+            raise ValueError("%s exists and is not a socket" % path)
+        os.unlink(path)
+    coro = loop.create_unix_server(lambda: _Protocol(service, loop), path)
+    return loop.run_until_complete(coro)
+
+
+def request(path, op, docstring=None, object=None, config=None, timeout=30):
+    """Send a single request to a running server and wait for the result.
+
+    Raises
+    ------
+    RuntimeError
+        If the server reports an error.
+    """
+    message = {'id': 0, 'op': op}
+    for key, value in (('docstring', docstring), ('object', object),
+                       ('config', config)):
+        if value is not None:
+            message[key] = value
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.settimeout(timeout)
+        sock.connect(path)
+        sock.sendall(json.dumps(message).encode('utf-8') + b'\n')
+        data = b''
+        while not data.endswith(b'\n'):
+            chunk = sock.recv(65536)
+            if not chunk:
+                break
+            data += chunk
+    finally:
+        sock.close()
+    response = json.loads(data.decode('utf-8'))
+    if 'error' in response:
+        raise RuntimeError(response['error'])
+    return response['result']
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Serve numpydoc parse/render/validate requests on a "
+                    "Unix socket.")
+    parser.add_argument('--socket', default='numpydoc.sock',
+                        help="path of the Unix socket")
+    parser.add_argument('--cache-size', type=int, default=1024,
+                        help="number of results and objects kept in memory")
+    args = parser.parse_args(argv)
+
+    if asyncio is None:
+        parser.error("the numpydoc server requires Python 3")
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    try:
+        server = start_server(args.socket,
+                              RenderService(cache_size=args.cache_size), loop)
+    except ValueError as e:
+        parser.error(str(e))
+    print('numpydoc server listening on %s' % args.socket)
+    try:
+        loop.run_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.close()
+        loop.run_until_complete(server.wait_closed())
+        os.unlink(args.socket)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
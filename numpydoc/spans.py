@@ -0,0 +1,267 @@
+"""Parse a docstring into spans of the original text.
+
+`~numpydoc.docscrape.NumpyDocString` stores copies of the docstring lines,
+dedented and split up, which cannot be traced back to where they came from.
+:class:`SpanDocString` parses the same structure, but every section title,
+section body, parameter name, type and description is a :class:`Span`, a
+pair of offsets into the original string.  Text is only copied out when it
+is asked for, and spans give exact positions for editors and diagnostics::
+
+    >>> doc = SpanDocString('''Summary.
+    ...
+    ... Parameters
+    ... ----------
+    ... x : int
+    ...     The x.
+    ... ''')
+    >>> name, type_, desc = doc['Parameters'].params[0]
+    >>> name.text, type_.text, desc.lines()
+    ('x', 'int', ['The x.'])
+    >>> type_.start, type_.end, type_.position()
+    (36, 39, (4, 4))
+
+Sections and parameters are found by the same rules as in
+`~numpydoc.docscrape.NumpyDocString`.
+
+"""
+from __future__ import division, absolute_import, print_function
+
+import collections
+import os
+import re
+import textwrap
+
+from .docscrape import NumpyDocString, section_name
+
+
+class Span(object):
+    """The text of ``source`` from offset ``start`` to ``end``.
+
+    Parameters
+    ----------
+    source : str
+    start, end : int
+    """
+    __slots__ = ('source', 'start', 'end')
+
+    def __init__(self, source, start, end):
+        self.source = source
+        self.start = start
+        self.end = end
+
+    @property
+    def text(self):
+        return self.source[self.start:self.end]
+
+    def lines(self):
+        """The lines of the text, dedented as numpydoc stores them"""
+        return textwrap.dedent(self.text).split('\n')
+
+    def position(self):
+        """Zero-based line and column of the start of the span"""
+        line = self.source.count('\n', 0, self.start)
+        return line, self.start - (self.source.rfind('\n', 0, self.start) + 1)
+
+    def __len__(self):
+        return self.end - self.start
+
+    def __str__(self):
+        return self.text
+
+    def __eq__(self, other):
+        return (isinstance(other, Span) and self.source is other.source and
+                self.start == other.start and self.end == other.end)
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __hash__(self):
+        return hash((self.start, self.end))
+
+    def __repr__(self):
+        return 'Span(%d, %d)' % (self.start, self.end)
+
+
+Param = collections.namedtuple('Param', ['name', 'type', 'desc'])
+
+
+class Section(collections.namedtuple('Section',
+                                     ['name', 'title', 'body', 'params'])):
+    """One section of a `SpanDocString`.
+
+    Attributes
+    ----------
+    name : str
+        Section name, capitalized and with aliases resolved.
+    title : Span
+        The title line, or the ``.. index::`` line.
+    body : Span
+        The content below the header, without surrounding blank lines.
+    params : list of Param or None
+        For parameter-like sections, the spans of each entry.  The type of
+        entries without one is an empty span.
+    """
+    __slots__ = ()
+
+
+_indent_re = re.compile(r'^([ \t]*)(?=[^ \t\n])', re.M)
+
+
+class SpanDocString(object):
+    """A docstring parsed into spans of its text.
+
+    Parameters
+    ----------
+    docstring : str
+
+    Attributes
+    ----------
+    signature, summary, extended_summary : Span or None
+    sections : list of Section
+        In order of appearance, including unknown and repeated sections.
+    """
+
+    def __init__(self, docstring):
+        self.source = docstring
+        self.signature = None
+        self.summary = None
+        self.extended_summary = None
+        self.sections = []
+        self._by_name = {}
+
+        lines = docstring.split('\n')
+        starts = []
+        offset = 0
+        for line in lines:
+            starts.append(offset)
+            offset += len(line) + 1
+        self._lines = lines
+        self._starts = starts
+        # indentation of the docstring, removed by NumpyDocString
+        self._margin = len(os.path.commonprefix(
+            _indent_re.findall(docstring)))
+        self._parse()
+
+    def __getitem__(self, name):
+        """The first section called ``name``"""
+        return self._by_name[name]
+
+    def __contains__(self, name):
+        return name in self._by_name
+
+    def _span(self, first, last):
+        """Span of lines ``first`` to ``last`` included, or an empty span"""
+        start = self._starts[first] if first < len(self._lines) else len(
+            self.source)
+        if last < first:
+            return Span(self.source, start, start)
+        return Span(self.source, start,
+                    self._starts[last] + len(self._lines[last]))
+
+    def _is_header(self, i):
+        lines = self._lines
+        l1 = lines[i].strip()
+        if l1.startswith('.. index::'):
+            return True
+        l2 = lines[i + 1].strip() if i + 1 < len(lines) else ''
+        return l2.startswith('-' * len(l1)) or l2.startswith('=' * len(l1))
+
+    def _paragraphs(self):
+        """(first, last) line of each paragraph"""
+        lines = self._lines
+        n = len(lines)
+        i = 0
+        while i < n:
+            if not lines[i].strip():
+                i += 1
+                continue
+            j = i
+            while j + 1 < n and lines[j + 1].strip():
+                j += 1
+            yield i, j
+            i = j + 1
+
+    def _strip(self, first, last):
+        lines = self._lines
+        while first <= last and not lines[first].strip():
+            first += 1
+        while last >= first and not lines[last].strip():
+            last -= 1
+        return first, last
+
+    def _parse(self):
+        lines = self._lines
+        # group the paragraphs into the summary and the sections
+        summary = []
+        headers = []  # (header line, last line of the section)
+        for first, last in self._paragraphs():
+            if self._is_header(first):
+                headers.append([first, last])
+            elif headers:
+                headers[-1][1] = last
+            else:
+                summary.append((first, last))
+
+        # as NumpyDocString._parse_summary: leading paragraphs that look
+        # like signatures are signatures, the last one may also be the
+        # summary if a section follows
+        signature_rgx = NumpyDocString._signature_rgx
+        k = 0
+        while k < len(summary):
+            first, last = summary[k]
+            k += 1
+            text = ' '.join(l.strip() for l in lines[first:last + 1])
+            if signature_rgx.match(text.strip()):
+                self.signature = self._span(first, last)
+                if k < len(summary) or not headers:
+                    continue
+            self.summary = self._span(first, last)
+            break
+        if k < len(summary):
+            self.extended_summary = self._span(summary[k][0],
+                                               summary[-1][1])
+
+        for first, last in headers:
+            title = lines[first].strip()
+            if title.startswith('..'):
+                name = 'index' if title.startswith('.. index::') else title
+                body = self._span(*self._strip(first + 1, last))
+            else:
+                name = section_name(title)
+                body = self._span(*self._strip(first + 2, last))
+            start = (self._starts[first] + len(lines[first]) -
+                     len(lines[first].lstrip()))
+            title_span = Span(self.source, start, start + len(title))
+            params = None
+            if name in NumpyDocString._param_sections:
+                params = self._parse_params(*self._strip(first + 2, last))
+            section = Section(name, title_span, body, params)
+            self.sections.append(section)
+            self._by_name.setdefault(name, section)
+
+    def _parse_params(self, first, last):
+        lines = self._lines
+        margin = self._margin
+        params = []
+        i = first
+        while i <= last:
+            line = lines[i]
+            header = line.strip()
+            start = self._starts[i] + len(line) - len(line.lstrip())
+            parts = header.split(' : ')
+            name = Span(self.source, start, start + len(parts[0]))
+            if len(parts) > 1:
+                type_start = name.end + 3
+                type_ = Span(self.source, type_start,
+                             type_start + len(parts[1]))
+            else:
+                type_ = Span(self.source, name.end, name.end)
+            # the description runs up to the next line that is not indented
+            j = i + 1
+            while j <= last and not (
+                    lines[j].strip() and
+                    len(lines[j]) - len(lines[j].lstrip()) <= margin):
+                j += 1
+            params.append(Param(name, type_, self._span(i + 1, j - 1)))
+            i = j
+        return params
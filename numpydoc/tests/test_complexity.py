@@ -0,0 +1,200 @@
+# -*- encoding:utf-8 -*-
+"""Guard against super-linear parsing and rendering.
+
+Each test measures one code path on adversarial docstrings of increasing
+size and fits the exponent of the growth curve, ``cost ~ size ** exponent``,
+on a log-log scale.  Linear code fits an exponent close to 1, quadratic code
+one close to 2.
+
+Where the cost can be counted, as the lines `Reader` looks at, the tests are
+exact.  The others time the code, which is unreliable on a busy machine, so
+they only run with the ``NUMPYDOC_TIMING_TESTS`` environment variable set.
+"""
+from __future__ import division, absolute_import, print_function
+
+import math
+import os
+import timeit
+
+from nose.tools import assert_true
+from nose import SkipTest
+
+from numpydoc.docscrape import NumpyDocString, Reader
+from numpydoc.numpydoc import rename_references
+
+# Exponent above which a code path is reported as super-linear.  Timings of
+# small inputs include some constant overhead, which lowers the exponent,
+# while noise on a busy machine can raise it, hence the margin.
+MAX_EXPONENT = 1.35
+
+SIZES = (500, 1000, 2000, 4000)
+
+
+def fit_exponent(sizes, costs):
+    """Slope of the least-squares line through (log size, log cost)"""
+    xs = [math.log(size) for size in sizes]
+    ys = [math.log(max(cost, 1e-9)) for cost in costs]
+    mean_x = sum(xs) / len(xs)
+    mean_y = sum(ys) / len(ys)
+    cov = sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys))
+    var = sum((x - mean_x) ** 2 for x in xs)
+    return cov / var
+
+
+def growth_exponent(func, make_input, sizes=SIZES, repeat=3):
+    """Fit the exponent of the running time of ``func`` against size.
+
+    Parameters
+    ----------
+    func : callable
+        Called with the output of ``make_input(size)``, which is not timed.
+    make_input : callable
+    sizes : sequence of int
+    repeat : int
+        The fastest of ``repeat`` runs is used for each size.
+
+    Returns
+    -------
+    exponent : float
+        Slope of the least-squares line through (log size, log time).
+    """
+    if not os.environ.get('NUMPYDOC_TIMING_TESTS'):
+        raise SkipTest('set NUMPYDOC_TIMING_TESTS to run timing tests')
+    times = []
+    for size in sizes:
+        data = make_input(size)
+        best = None
+        for i in range(repeat):
+            start = timeit.default_timer()
+            func(data)
+            elapsed = timeit.default_timer() - start
+            if best is None or elapsed < best:
+                best = elapsed
+        times.append(best)
+    return fit_exponent(sizes, times)
+
+
+def assert_near_linear(func, make_input, **kwargs):
+    exponent = growth_exponent(func, make_input, **kwargs)
+    assert_true(exponent < MAX_EXPONENT,
+                '%s grows as size ** %.2f on %s' % (func.__name__, exponent,
+                                                    make_input.__name__))
+
+
+# Adversarial docstrings
+
+def blank_lines(n):
+    """Paragraphs separated by runs of blank lines"""
+    return '\n'.join(['Summary.'] + ['', '', '', 'Paragraph.'] * n)
+
+
+def see_also_names(n):
+    """A See Also section listing many comma-separated names"""
+    names = ', '.join('func%d' % i for i in range(n))
+    return 'Summary.\n\nSee Also\n--------\n' + names
+
+
+def see_also_entries(n):
+    """A See Also section of described names"""
+    lines = ['Summary.', '', 'See Also', '--------']
+    for i in range(n):
+        lines += ['func%d : Description' % i, '    continued.']
+    return '\n'.join(lines)
+
+
+def indented_parameters(n):
+    """Parameters with deeply indented descriptions"""
+    lines = ['Summary.', '', 'Parameters', '----------']
+    for i in range(n // 10):
+        lines.append('x%d : int' % i)
+        lines += ['    ' * (1 + j % 8) + 'Description.' for j in range(10)]
+    return '\n'.join(lines)
+
+
+class CountingLines(list):
+    """Lines counting how many of them are looked at, for `Reader`"""
+
+    looked_at = 0
+
+    def __getitem__(self, index):
+        items = list.__getitem__(self, index)
+        self.looked_at += len(items) if isinstance(index, slice) else 1
+        return items
+
+
+def reader_lines(n):
+    """Short paragraphs, for `Reader`"""
+    return CountingLines(['', 'text'] * n)
+
+
+def citations(n):
+    """Lines citing many references, for `rename_references`"""
+    lines = ['Summary %s.' % ' '.join('[%d]_' % i for i in range(10))]
+    lines += ['Text [%d]_.' % (i % 10) for i in range(n)]
+    lines += ['', 'References', '----------']
+    lines += ['.. [%d] Reference %d.' % (i, i) for i in range(n // 10)]
+    return lines
+
+
+# Code paths
+
+def parse(text):
+    NumpyDocString(text)
+
+
+def read_all(lines):
+    reader = Reader(lines)
+    while not reader.eof():
+        reader.read_to_next_empty_line()
+        reader.read_to_next_unindented_line()
+
+
+class MockApp(object):
+    class config(object):
+        numpydoc_citation_re = '[a-z0-9_.-]+'
+        numpydoc_use_plots = False
+        numpydoc_show_class_members = True
+        numpydoc_show_inherited_class_members = True
+        numpydoc_class_members_toctree = True
+        numpydoc_edit_link = None
+        numpydoc_max_lines = 0
+        numpydoc_time_limit = 0
+        numpydoc_trusted_templates = False
+
+    builder = None
+
+
+_app = MockApp()
+
+
+def rename(lines):
+    rename_references(_app, 'function', 'f', None, None, list(lines))
+
+
+def test_parse_blank_lines():
+    assert_near_linear(parse, blank_lines)
+
+
+def test_parse_see_also():
+    assert_near_linear(parse, see_also_names)
+    assert_near_linear(parse, see_also_entries)
+
+
+def test_parse_indented_parameters():
+    assert_near_linear(parse, indented_parameters, sizes=(2000, 4000, 8000,
+                                                          16000))
+
+
+def test_reader():
+    counts = []
+    for size in SIZES:
+        lines = reader_lines(size)
+        read_all(lines)
+        counts.append(lines.looked_at)
+    exponent = fit_exponent(SIZES, counts)
+    assert_true(exponent < 1.05, 'Reader looks at size ** %.2f lines'
+                % exponent)
+
+
+def test_rename_references():
+    assert_near_linear(rename, citations)
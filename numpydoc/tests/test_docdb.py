@@ -0,0 +1,101 @@
+# -*- encoding:utf-8 -*-
+from __future__ import division, absolute_import, print_function
+
+import os
+import shutil
+import sys
+import tempfile
+
+from numpydoc.docdb import build_database, DocDatabase, main
+from numpydoc.docscrape import ClassDoc
+from numpydoc.docscrape_sphinx import SphinxDocString, get_doc_object
+from nose.tools import assert_equal, assert_raises, assert_true
+
+
+def test_build_and_read():
+    tmpdir = tempfile.mkdtemp()
+    try:
+        path = os.path.join(tmpdir, 'docscrape.npdb')
+        count = build_database('numpydoc.docscrape', path)
+        with DocDatabase(path) as db:
+            assert_equal(len(db), count)
+            names = list(db.names())
+            assert_equal(names, sorted(names))
+            assert_true('numpydoc.docscrape' in db)
+            assert_true('numpydoc.docscrape.dedent_lines' in db)
+            assert_true('numpydoc.docscrape.nonexistent' not in db)
+            assert_raises(KeyError, db.sections, 'nonexistent')
+
+            name = 'numpydoc.docscrape.ClassDoc'
+            assert_equal(db.sections(name)['Methods'],
+                         ClassDoc(ClassDoc)['Methods'])
+            assert_equal(db.rendered(name),
+                         str(get_doc_object(ClassDoc, config={})))
+
+            doc = db.parsed(name, cls=SphinxDocString)
+            assert_true(isinstance(doc, SphinxDocString))
+            assert_equal(doc['Methods'], ClassDoc(ClassDoc)['Methods'])
+
+            view = db.raw_sections(name)
+            assert_equal(bytes(view[:4]), b'NPDS')
+            view.release()
+    finally:
+        shutil.rmtree(tmpdir)
+
+
+def test_not_a_database():
+    tmpdir = tempfile.mkdtemp()
+    try:
+        path = os.path.join(tmpdir, 'bogus')
+        with open(path, 'wb') as f:
+            f.write(b'\0' * 64)
+        assert_raises(ValueError, DocDatabase, path)
+    finally:
+        shutil.rmtree(tmpdir)
+
+
+def test_build_errors():
+    tmpdir = tempfile.mkdtemp()
+    try:
+        pkgdir = os.path.join(tmpdir, 'npddbpkg')
+        os.mkdir(pkgdir)
+        with open(os.path.join(pkgdir, '__init__.py'), 'w') as f:
+            f.write('from ._impl import func, Undocumentable\n'
+                    '__all__ = ["func", "Undocumentable"]\n')
+        with open(os.path.join(pkgdir, '_impl.py'), 'w') as f:
+            f.write('def func():\n'
+                    '    """Re-exported."""\n\n\n'
+                    'class Meta(type):\n'
+                    '    @property\n'
+                    '    def __doc__(cls):\n'
+                    '        raise RuntimeError("no docstring")\n\n\n'
+                    'Undocumentable = Meta("Undocumentable", (object,), {})\n')
+        with open(os.path.join(pkgdir, 'broken.py'), 'w') as f:
+            f.write('raise RuntimeError("cannot import")\n')
+        with open(os.path.join(pkgdir, 'mod.py'), 'w') as f:
+            f.write('def bad():\n'
+                    '    """Summary.\n\n'
+                    '    Returns\n    -------\n    int\n\n'
+                    '    Yields\n    ------\n    int\n    """\n')
+        path = os.path.join(tmpdir, 'pkg.npdb')
+        sys.path.insert(0, tmpdir)
+        try:
+            errors = []
+            build_database('npddbpkg', path, errors=errors)
+            assert_equal(sorted(name for name, message in errors),
+                         ['npddbpkg.Undocumentable', 'npddbpkg.broken',
+                          'npddbpkg.mod.bad'])
+            with DocDatabase(path) as db:
+                assert_true('npddbpkg.mod' in db)
+                assert_true('npddbpkg.mod.bad' not in db)
+                # public API defined in private modules
+                assert_equal(db.sections('npddbpkg.func')['Summary'],
+                             ['Re-exported.'])
+            assert_equal(main(['build', 'npddbpkg', path]), 1)
+        finally:
+            sys.path.remove(tmpdir)
+    finally:
+        shutil.rmtree(tmpdir)
+        for name in ('npddbpkg', 'npddbpkg._impl', 'npddbpkg.broken',
+                     'npddbpkg.mod'):
+            sys.modules.pop(name, None)
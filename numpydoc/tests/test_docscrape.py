@@ -1,20 +1,35 @@
 # -*- encoding:utf-8 -*-
 from __future__ import division, absolute_import, print_function
 
+import os
 import sys
+import json
+import pickle
+import shutil
+import tempfile
 import textwrap
 import warnings
 
 import jinja2
+import jinja2.sandbox
 
+import numpydoc.docscrape
 from numpydoc.docscrape import (
     NumpyDocString,
     FunctionDoc,
     ClassDoc,
-    ParseError
+    MemberDoc,
+    ParseError,
+    _SectionExtractor,
+    register_section,
+    extract_sections,
+    CUSTOM_SECTIONS,
+    SECTION_ALIASES
 )
 from numpydoc.docscrape_sphinx import (SphinxDocString, SphinxClassDoc,
-                                       SphinxFunctionDoc)
+                                       SphinxFunctionDoc, get_summary,
+                                       load_template)
+from numpydoc.diagnostics import DiagnosticsCollector
 from nose.tools import (assert_equal, assert_raises, assert_list_equal,
                         assert_true)
 
@@ -210,6 +225,18 @@ def test_yields():
         assert desc[0].endswith(end)
 
 
+def test_to_dict_from_dict():
+    data = doc.to_dict()
+    assert_equal(data['Parameters'][1][:2], ['cov', '(N, N) ndarray'])
+    assert_equal(json.loads(json.dumps(data)), data)
+
+    for cls in (NumpyDocString, SphinxDocString):
+        restored = cls.from_dict(json.loads(json.dumps(data)))
+        assert_true(isinstance(restored, cls))
+        assert_equal(dict(restored), dict(doc))
+        assert_equal(str(restored), str(cls(doc_txt)))
+
+
 def test_returnyield():
     doc_text = """
 Test having returns and yields.
@@ -633,6 +660,42 @@ def test_escape_stars():
     assert_equal(fdoc['Signature'], 'my_func(a, b, \*\*kwargs)')
 
 
+def test_lazy_signature():
+    calls = []
+
+    class Callable(object):
+        """Summary."""
+        @property
+        def __signature__(self):
+            calls.append(True)
+            return None
+
+        def __call__(self, x, y=2):
+            pass
+
+    func = Callable()
+    func.__name__ = 'func'
+    for cls in (FunctionDoc, SphinxFunctionDoc):
+        doc = cls(func)
+        str(SphinxFunctionDoc(func))
+        assert_equal(calls, [])
+    assert_equal(doc['Signature'], 'func(x, y=2)')
+    assert_equal(len(calls), 1)
+    # cached per function
+    assert_equal(FunctionDoc(func)['Signature'], 'func(x, y=2)')
+    assert_equal(len(calls), 1)
+
+    doc = FunctionDoc(func)
+    doc['Signature'] = 'func(*args)'
+    assert_equal(doc['Signature'], 'func(*args)')
+
+    # nameless callables are named after the class of the doc
+    nameless = Callable()
+    assert_equal(FunctionDoc(nameless)['Signature'], 'FunctionDoc(x, y=2)')
+    assert_equal(SphinxFunctionDoc(nameless)['Signature'],
+                 'SphinxFunctionDoc(x, y=2)')
+
+
 doc4 = NumpyDocString(
     """a.conj()
 
@@ -782,6 +845,114 @@ This should be ignored and warned about
                     or 'test_docscrape.BadSection' in str(w[0].message))
 
 
+def test_unknown_section_diagnostics():
+    def bad_section():
+        """Function with bad section.
+
+        Nope
+        ----
+        This function has a nope section.
+        """
+
+    diagnostics = DiagnosticsCollector()
+    with warnings.catch_warnings(record=True) as w:
+        warnings.simplefilter('always')
+        SphinxFunctionDoc(bad_section, config={'diagnostics': diagnostics})
+        SphinxFunctionDoc(bad_section, config={'diagnostics': diagnostics})
+        assert_equal(len(w), 0)
+
+    assert_equal(len(diagnostics), 2)
+    entry = list(diagnostics)[0]
+    assert_equal(entry.code, 'unknown-section')
+    assert_equal(entry.message, 'Unknown section Nope')
+    assert_true(entry.obj.endswith('bad_section'))
+    assert_equal(entry.file.rstrip('co'), __file__.rstrip('co'))
+    assert_equal(entry.line, bad_section.__code__.co_firstlineno)
+
+    emitted = []
+    diagnostics.emit(lambda msg, location: emitted.append((msg, location)))
+    assert_equal(len(emitted), 2)
+    assert_true(emitted[0][0].startswith('[numpydoc.unknown-section]'))
+    assert_true(emitted[0][1].endswith(':%d' % entry.line))
+    assert_true('"code": "unknown-section"' in diagnostics.to_json())
+
+
+def test_section_aliases():
+    doc = NumpyDocString('''
+    Summary.
+
+    parameter
+    ---------
+    x : int
+
+    Return
+    ------
+    int
+
+    See also
+    --------
+    func
+    ''')
+    assert_equal(doc['Parameters'], [('x', 'int', [''])])
+    assert_equal(doc['Returns'], [('int', '', [''])])
+    assert_equal(doc['See Also'], [('func', [], None)])
+
+
+def test_custom_sections():
+    def parse_complexity(doc, lines):
+        return dict(line.split(': ') for line in lines)
+
+    def render_complexity(doc, name):
+        return ['.. rubric:: %s' % name, ''] + [
+            '- %s: :math:`%s`' % item for item in sorted(doc[name].items())]
+
+    register_section('Complexity', parse_complexity, render_complexity,
+                     default={})
+    register_section('Backend Notes', aliases=['Backend Note'])
+    try:
+        assert_raises(ValueError, register_section, 'Notes')
+        text = '''
+        Summary.
+
+        Complexity
+        ----------
+        time: O(n)
+        memory: O(1)
+
+        backend note
+        ------------
+        Only on CPUs.
+        '''
+        doc = NumpyDocString(text)
+        assert_equal(doc['Complexity'], {'time': 'O(n)', 'memory': 'O(1)'})
+        assert_equal(doc['Backend Notes'], ['Only on CPUs.'])
+        assert_equal(NumpyDocString('Summary.')['Complexity'], {})
+
+        non_blank_line_by_line_compare(str(SphinxDocString(text)), '''
+        Summary.
+
+        .. rubric:: Complexity
+
+        - memory: :math:`O(1)`
+        - time: :math:`O(n)`
+
+        .. rubric:: Backend Notes
+
+        Only on CPUs.
+        ''')
+        # custom sections can also be placed one by one in templates
+        template = jinja2.Template('{{backend_notes}}')
+        assert_equal(str(SphinxDocString(text, config={'template': template})),
+                     '.. rubric:: Backend Notes\n\n\nOnly on CPUs.\n')
+    finally:
+        for name in ('Complexity', 'Backend Notes'):
+            del CUSTOM_SECTIONS[name]
+            del NumpyDocString.sections[name]
+            NumpyDocString._section_parsers.pop(name, None)
+        del SECTION_ALIASES['Backend Note']
+        numpydoc.docscrape._section_names.clear()
+
+
 doc7 = NumpyDocString("""
 
         Doc starts on second line.
@@ -885,6 +1056,17 @@ def test_class_members():
         else:
             assert 'Spammity index' in str(doc), str(doc)
 
+    doc = ClassDoc(Dummy, config=dict(show_class_members=True))
+    name, _, desc = doc['Methods'][2]
+    assert_equal(name, 'spam')
+    assert_true(isinstance(desc, MemberDoc))
+    assert desc._lines is None  # not read yet
+    assert_equal(desc, ['Spam', '', 'Spam spam.'])
+    assert_equal(doc['Attributes'], [('spammity', '', ['Spammity index'])])
+    assert_equal(pickle.loads(pickle.dumps(desc)), ['Spam', '', 'Spam spam.'])
+    assert_equal(doc.to_dict()['Methods'][1],
+                 ['ham', '', ['Cheese', '', 'No cheese.']])
+
     class SubDummy(Dummy):
         """
         Subclass of Dummy class.
@@ -1125,6 +1307,35 @@ def test_class_members_doc_sphinx():
     """)
 
 
+def test_get_summary():
+    def first_sentence():
+        """First sentence. Second
+        sentence.
+
+        Next paragraph.
+        """
+
+    def first_line():
+        """lower case summary
+        continued.
+        """
+
+    def undocumented():
+        pass
+
+    memo = {}
+    assert_equal(get_summary(first_sentence, memo), 'First sentence.')
+    assert_equal(get_summary(first_line, memo), 'lower case summary')
+    assert_equal(get_summary(undocumented, memo), None)
+    assert_equal(len(memo), 3)
+
+    # docstrings are read again with another memo, as in a new build
+    first_sentence.__doc__ = "Changed."
+    assert_equal(get_summary(first_sentence, memo), 'First sentence.')
+    assert_equal(get_summary(first_sentence, {}), 'Changed.')
+    assert_equal(get_summary(first_sentence), 'Changed.')
+
+
 def test_templated_sections():
     doc = SphinxClassDoc(None, class_doc_txt,
                          config={'template': jinja2.Template('{{examples}}{{parameters}}')})
@@ -1148,6 +1359,71 @@ def test_templated_sections():
     """)
 
 
+def test_extract_sections():
+    for names in (['Parameters'], ['Examples', 'Summary'], ['index'],
+                  list(doc)):
+        sections = extract_sections(doc_txt, names)
+        assert_equal(sorted(sections), sorted(names))
+        for name in names:
+            assert_equal(sections[name], doc[name])
+    assert_equal(extract_sections(doc_txt, ['return'])['Returns'],
+                 doc['Returns'])
+    assert_equal(extract_sections('Summary.', ['Notes']), {'Notes': []})
+    assert_raises(ValueError, extract_sections, doc_txt, ['Nope'])
+
+    # reading stops after the wanted sections
+    text = '''
+    Summary.
+
+    Parameters
+    ----------
+    x : int
+
+    Returns
+    -------
+    int
+
+    Returns
+    -------
+    Twice.
+
+    See Also
+    --------
+    :bad role:`name`
+    '''
+    assert_raises(ValueError, NumpyDocString, text)
+    assert_equal(extract_sections(text, ['Parameters'])['Parameters'],
+                 [('x', 'int', [''])])
+    # nothing past the last wanted section is read
+    for names, next_lines in ((['Parameters'], ['Returns', '-------', 'int']),
+                              (['Summary'], ['Parameters', '----------'])):
+        reader = _SectionExtractor(text, names)._doc
+        assert_equal([reader.read() for line in next_lines], next_lines)
+
+
+def test_template_cache_and_trusted():
+    cache_dir = tempfile.mkdtemp()
+    try:
+        sandboxed = load_template(cache_dir=cache_dir)
+        assert_equal(len(os.listdir(os.path.join(cache_dir, 'sandboxed'))),
+                     1)
+        # compiled code is loaded from the cache on the next load
+        assert_equal(load_template(cache_dir=cache_dir).render(),
+                     sandboxed.render())
+
+        trusted = load_template(cache_dir=cache_dir, trusted=True)
+        assert_true(not isinstance(trusted.environment,
+                                   jinja2.sandbox.SandboxedEnvironment))
+        assert_true(isinstance(sandboxed.environment,
+                               jinja2.sandbox.SandboxedEnvironment))
+        assert_equal(str(SphinxClassDoc(None, class_doc_txt,
+                                        config={'template': trusted})),
+                     str(SphinxClassDoc(None, class_doc_txt,
+                                        config={'template': sandboxed})))
+    finally:
+        shutil.rmtree(cache_dir)
+
+
 if __name__ == "__main__":
     import nose
     nose.run()
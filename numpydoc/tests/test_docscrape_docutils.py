@@ -0,0 +1,81 @@
+# -*- encoding:utf-8 -*-
+from __future__ import division, absolute_import, print_function
+
+import textwrap
+
+from docutils import nodes
+from nose.tools import assert_equal, assert_true
+
+from numpydoc.docscrape_docutils import (DocutilsDocString, parse_rst,
+                                         has_markup)
+
+
+doc_txt = textwrap.dedent('''
+    Summary line.
+
+    Extended summary
+    over two lines.
+
+    Parameters
+    ----------
+    x : int
+        The x.
+
+        Second paragraph.
+    y
+        Has *emphasis* and ``code``.
+    *args : tuple
+        Positional arguments.
+
+    Returns
+    -------
+    out : float
+        Result.
+    int
+        Unnamed.
+
+    Raises
+    ------
+    ValueError
+        When wrong.
+
+    Warnings
+    --------
+    Careful.
+
+    Notes
+    -----
+    Plain notes.
+
+    - a list
+    - of items
+
+    Examples
+    --------
+    Some text.
+
+    >>> 1 + 1
+    2
+    ''')
+
+
+def _pformat(node_list):
+    return ''.join(node.pformat() for node in node_list)
+
+
+def test_to_nodes_matches_rst():
+    doc = DocutilsDocString(doc_txt)
+    native = doc.to_nodes()
+    assert_equal(_pformat(native), _pformat(parse_rst(str(doc).split('\n'))))
+    assert_true(isinstance(native[2], nodes.field_list))
+    assert_equal([type(node) for node in native[-3:]],
+                 [nodes.rubric, nodes.paragraph, nodes.doctest_block])
+
+
+def test_has_markup():
+    assert_true(not has_markup('Plain text, with commas: and colons.'))
+    assert_true(not has_markup('array_like or None'))
+    for text in ['`x`', ':func:`f`', 'a *b*', 'ref_ here', 'see [1]_',
+                 'http://example.com', '- item', '1. item', 'a\n  b',
+                 'Title\n-----', 'a::']:
+        assert_true(has_markup(text), text)
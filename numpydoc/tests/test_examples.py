@@ -0,0 +1,107 @@
+# -*- encoding:utf-8 -*-
+from __future__ import division, absolute_import, print_function
+
+import os
+import shutil
+import signal
+import sys
+import tempfile
+import textwrap
+
+from numpydoc.examples import run_examples
+from nose.tools import assert_equal, assert_true
+
+module_source = '''
+    """Module.
+
+    Examples
+    --------
+    >>> double(2)
+    4
+    """
+
+
+    def double(x):
+        """Double x.
+
+        Examples
+        --------
+        >>> double(3)
+        6
+        >>> np_like.answer
+        42
+        """
+        return 2 * x
+
+
+    def wrong():
+        """Examples
+        --------
+        >>> double(1)
+        3
+        """
+
+
+    def slow():
+        """Examples
+        --------
+        >>> while True: pass
+        >>> try:
+        ...     while True: pass
+        ... except Exception:
+        ...     pass
+        >>> while True: pass
+        """
+
+
+    def no_examples():
+        """Nothing to run."""
+    '''
+
+
+def test_run_examples():
+    tmpdir = tempfile.mkdtemp()
+    try:
+        pkgdir = os.path.join(tmpdir, 'npdexpkg')
+        os.mkdir(pkgdir)
+        with open(os.path.join(pkgdir, '__init__.py'), 'w') as f:
+            f.write('')
+        with open(os.path.join(pkgdir, 'mod.py'), 'w') as f:
+            f.write(textwrap.dedent(module_source))
+        with open(os.path.join(pkgdir, 'broken.py'), 'w') as f:
+            f.write('raise RuntimeError("cannot import")\n')
+        cache = os.path.join(tmpdir, 'cache.json')
+        setup = 'class np_like: answer = 42'
+        sys.path.insert(0, tmpdir)
+        alarm = getattr(signal, 'SIGALRM', None)
+        previous = alarm and signal.getsignal(alarm)
+        try:
+            results = run_examples('npdexpkg', timeout=0.5, setup=setup,
+                                   cache=cache)
+            if alarm:
+                # the handler of the caller is restored
+                assert_true(signal.getsignal(alarm) is previous)
+            status = dict((r.name, r.status) for r in results)
+            assert_equal(status, {'npdexpkg.mod': 'passed',
+                                  'npdexpkg.mod.double': 'passed',
+                                  'npdexpkg.mod.wrong': 'failed',
+                                  'npdexpkg.mod.slow': 'timeout',
+                                  'npdexpkg.broken': 'error'})
+            broken = [r for r in results if r.status == 'error'][0]
+            assert_equal(broken.output, 'RuntimeError: cannot import')
+            wrong = [r for r in results if r.status == 'failed'][0]
+            assert_true('Expected:\n    3\nGot:\n    2' in wrong.output)
+
+            # passing examples are skipped on the next run
+            results = run_examples('npdexpkg', timeout=0.5, setup=setup,
+                                   cache=cache)
+            assert_equal(sorted(r.name for r in results),
+                         ['npdexpkg.broken', 'npdexpkg.mod.slow',
+                          'npdexpkg.mod.wrong'])
+        finally:
+            sys.path.remove(tmpdir)
+    finally:
+        shutil.rmtree(tmpdir)
+        sys.modules.pop('npdexpkg', None)
+        sys.modules.pop('npdexpkg.mod', None)
+        sys.modules.pop('npdexpkg.broken', None)
@@ -0,0 +1,31 @@
+# -*- encoding:utf-8 -*-
+from __future__ import division, absolute_import, print_function
+
+from nose.tools import assert_equal, assert_true
+
+from numpydoc.nameindex import NameIndex
+
+
+def test_name_index():
+    index = NameIndex(['pkg', 'pkg.mod', 'pkg.mod.func', 'pkg.mod.Cls',
+                       'pkg.mod.Cls.meth', 'pkg.other.meth'])
+    assert_equal(len(index), 6)
+    assert_true('pkg.mod.func' in index)
+
+    # as Sphinx resolves names: full, or relative to the documented object
+    assert_equal(index.find('pkg.mod.func'), 'pkg.mod.func')
+    assert_equal(index.find('func', ['pkg.mod.Cls', 'pkg.mod']),
+                 'pkg.mod.func')
+    assert_equal(index.find('~Cls.meth', ['pkg.mod']), 'pkg.mod.Cls.meth')
+    assert_equal(index.find('other.meth', ['pkg.mod']), None)
+    assert_equal(index.find('func'), None)
+
+    assert_equal(index.matches('meth'), ['pkg.mod.Cls.meth',
+                                         'pkg.other.meth'])
+    assert_equal(index.resolve('func'), 'pkg.mod.func')
+    assert_equal(index.resolve('meth'), None)
+    assert_equal(index.resolve('meth', ['pkg.other']), 'pkg.other.meth')
+
+    assert_equal(index.suggest('fucn'), ['pkg.mod.func'])
+    assert_equal(index.suggest('Cls.meht'), ['pkg.mod.Cls.meth'])
+    assert_equal(index.suggest('zzz'), [])
@@ -0,0 +1,428 @@
+# -*- encoding:utf-8 -*-
+from __future__ import division, absolute_import, print_function
+
+import json
+import os
+import shutil
+import signal
+import tempfile
+import threading
+import time
+
+from docutils import nodes
+from sphinx import addnodes
+
+from numpydoc.numpydoc import (mangle_docstrings, NumpydocConfig, get_config,
+                               relabel_references, purge_doc_state,
+                               merge_doc_state, check_see_also,
+                               needs_processing, prefetch_docstring,
+                               time_limit, BudgetExceeded, update_config,
+                               report_diagnostics)
+from numpydoc import diagnostics as diagnostics_module
+from numpydoc.prefetch import PrefetchStore
+from nose.tools import assert_equal, assert_raises, assert_true
+from nose import SkipTest
+
+
+class MockConfig(object):
+    numpydoc_use_plots = False
+    numpydoc_show_class_members = True
+    numpydoc_show_inherited_class_members = True
+    numpydoc_class_members_toctree = True
+    numpydoc_edit_link = None
+    numpydoc_citation_re = '[a-z0-9_.-]+'
+    numpydoc_diagnostics_json = None
+    numpydoc_resolve_see_also = False
+    numpydoc_prefetch_workers = 0
+    numpydoc_max_lines = 0
+    numpydoc_time_limit = 0
+    numpydoc_trusted_templates = False
+    autoclass_content = 'class'
+
+
+class MockApp(object):
+    def __init__(self):
+        self.config = MockConfig()
+        self.builder = None
+
+
+def test_config_snapshot():
+    app = MockApp()
+    config = get_config(app)
+    assert_true(get_config(app) is config)
+    assert_true(config.template is not None)
+    assert_equal(config.doc_config['template'], config.template)
+    assert_raises(AttributeError, setattr, config, 'use_plots', True)
+
+    other = NumpydocConfig.from_app(MockApp())
+    assert_equal(config, other)
+    assert_equal(hash(config), hash(other))
+    # each build memoizes member summaries afresh
+    assert_true(config.doc_config['summaries'] is not
+                other.doc_config['summaries'])
+
+    app = MockApp()
+    app.config.numpydoc_use_plots = True
+    assert_true(NumpydocConfig.from_app(app) != config)
+
+
+def test_mangle_docstrings():
+    app = MockApp()
+    lines = ['A summary.', '', 'Parameters', '----------',
+             'x : int', '    An x [1]_.', '',
+             'References', '----------', '.. [1] Someone.']
+    mangle_docstrings(app, 'function', 'func', None, None, lines)
+    assert_true(':Parameters:' in lines)
+    assert_true('        An x [R0-1]_.' in lines)
+    assert_true('.. [R0-1] Someone.' in lines)
+
+    lines = ['=====', 'Title', '=====', '', 'Module summary.']
+    mangle_docstrings(app, 'module', 'mod', None, None, lines)
+    assert_equal(lines, ['Module summary.'])
+
+
+def test_pass_through():
+    config = get_config(MockApp())
+    plain = ['Summary.', '', 'Args:', '    x: An x.', '', '- a list',
+             '--', 'Text with a [1]_ reference.']
+    assert_true(not needs_processing(config, 'function', plain))
+    assert_true(not needs_processing(config, 'function', []))
+    for lines in (['Summary.', '', 'Notes', '-----', 'A note.'],
+                  ['Title', '====='],
+                  ['.. index:: foo'],
+                  ['Text [1]_.', '', '.. [1] A reference.'],
+                  ['func(a, b=1)', '', 'Summary.']):
+        assert_true(needs_processing(config, 'function', lines), lines)
+    assert_true(needs_processing(config, 'class', plain))
+
+    app = MockApp()
+    lines = list(plain)
+    mangle_docstrings(app, 'function', 'func', None, None, lines)
+    assert_equal(lines, plain)
+    mangle_docstrings(app, 'function', 'func', None, None,
+                      ['Summary.', '', 'Notes', '-----', 'A note.'])
+    assert_equal(app.numpydoc_stats, {None: [2, 1, 0]})
+
+
+def test_render_reuse():
+    def f(x):
+        pass
+
+    def g(x):
+        pass
+
+    lines = ['Summary [1]_.', '', 'Parameters', '----------', 'x : int',
+             '', 'Nope', '----', 'Unknown section.', '',
+             'References', '----------', '.. [1] Someone.']
+    app = MockApp()
+    app.env = MockEnv('doc')
+    out = []
+    for name, obj in (('f', f), ('g', g)):
+        out.append(list(lines))
+        mangle_docstrings(app, 'function', name, obj, None, out[-1])
+    assert_equal(app.env.numpydoc_stats, {'doc': [2, 0, 1]})
+    assert_equal(len(app.numpydoc_rendered), 1)
+    # name dependent parts are added to the reused output
+    assert_true(out[0] != out[1])
+    assert_equal(len(out[0]), len(out[1]))
+    assert_equal([d.obj.split('.')[-1]
+                  for d in app.env.numpydoc_diagnostics['doc']], ['f', 'g'])
+
+    # classes list their own members
+    mangle_docstrings(app, 'class', 'A', MockConfig, None, ['Summary.'])
+    mangle_docstrings(app, 'class', 'B', MockApp, None, ['Summary.'])
+    assert_equal(app.env.numpydoc_stats, {'doc': [4, 0, 1]})
+
+    # so do other objects, with a Methods section
+    class E1(Exception):
+        def run(self):
+            """Run."""
+
+    class E2(Exception):
+        run = None
+
+    lines = ['Summary.', '', 'Methods', '-------', 'run', '']
+    out = []
+    for name, obj in (('E1', E1), ('E2', E2)):
+        out.append(list(lines))
+        mangle_docstrings(app, 'exception', name, obj, None, out[-1])
+    assert_equal(app.env.numpydoc_stats, {'doc': [6, 0, 1]})
+    assert_true('.. autosummary::' in out[0])
+    assert_true('.. autosummary::' not in out[1])
+
+
+def test_budget():
+    lines = ['Summary.', '', 'Parameters', '----------', 'x : int', '']
+    expected = ['::', '', '    Summary.', '', '    Parameters',
+                '    ----------', '    x : int', '', '']
+
+    app = MockApp()
+    app.config.numpydoc_max_lines = 3
+    out = list(lines)
+    mangle_docstrings(app, 'function', 'f', None, None, out)
+    assert_equal(out, expected)
+    assert_equal([d.code for d in app.numpydoc_diagnostics[None]],
+                 ['over-budget'])
+
+    app = MockApp()
+    app.config.numpydoc_time_limit = 1e-6
+    out = list(lines)
+    mangle_docstrings(app, 'function', 'f', None, None, out)
+    assert_equal(out, expected)
+    assert_true('numpydoc_time_limit' in
+                app.numpydoc_diagnostics[None][0].message)
+
+
+def test_time_limit():
+    if not hasattr(signal, 'setitimer'):
+        raise SkipTest('no signal.setitimer')
+
+    def spin():
+        while True:
+            try:
+                time.sleep(0.01)
+            except Exception:
+                pass
+
+    # not caught by 'except Exception'
+    with assert_raises(BudgetExceeded):
+        with time_limit(0.05):
+            spin()
+
+    # not enforced in other threads, whatever their name
+    errors = []
+
+    def in_thread():
+        try:
+            with time_limit(0.01):
+                time.sleep(0.05)
+        except BaseException as e:
+            errors.append(e)
+    thread = threading.Thread(target=in_thread, name='MainThread')
+    thread.start()
+    thread.join()
+    assert_equal(errors, [])
+
+    # a timer set by the caller is restored, minus the elapsed time
+    previous = signal.signal(signal.SIGALRM, lambda signum, frame: None)
+    try:
+        signal.setitimer(signal.ITIMER_REAL, 100)
+        with time_limit(0.05):
+            time.sleep(0.01)
+        remaining = signal.getitimer(signal.ITIMER_REAL)[0]
+        assert_true(99 < remaining < 100, remaining)
+        # and not overridden if it expires first
+        signal.setitimer(signal.ITIMER_REAL, 0.05)
+        with time_limit(1):
+            time.sleep(0.1)
+        assert_equal(signal.getitimer(signal.ITIMER_REAL)[0], 0)
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous)
+
+
+def test_prefetch():
+    def f(x):
+        """Summary.
+
+        Parameters
+        ----------
+        x : int
+        """
+
+    app = MockApp()
+    app.env = MockEnv('doc')
+    app.numpydoc_prefetched = PrefetchStore(size=1)
+    prefetch_docstring(app, 'function', f)
+    # kept aside, not in the memo of the build
+    assert_equal(len(app.numpydoc_prefetched), 1)
+    assert_equal(len(app.__dict__.get('numpydoc_rendered', {})), 0)
+    lines = ['Summary.', '', 'Parameters', '----------', 'x : int', '']
+    mangle_docstrings(app, 'function', 'f', f, None, lines)
+    assert_true(':Parameters:' in '\n'.join(lines))
+    # output rendered ahead of autodoc is used, but not counted as reused
+    assert_equal(len(app.numpydoc_prefetched), 0)
+    assert_equal(len(app.numpydoc_rendered), 1)
+    assert_equal(app.env.numpydoc_stats, {'doc': [1, 0, 0]})
+    lines = ['Summary.', '', 'Parameters', '----------', 'x : int', '']
+    mangle_docstrings(app, 'function', 'g', f, None, lines)
+    assert_equal(app.env.numpydoc_stats, {'doc': [2, 0, 1]})
+
+
+class MockEnv(object):
+    def __init__(self, docname):
+        self.temp_data = {'docname': docname}
+
+
+def test_citations_and_state_in_env():
+    lines = ['A summary [1]_.', '', 'References', '----------',
+             '.. [1] Someone.', '', 'Nope', '----', 'Unknown section.']
+
+    # citation labels depend only on the document and the position in it
+    def mangle_in(docname):
+        app = MockApp()
+        app.env = MockEnv(docname)
+        out = []
+        for i in range(2):
+            out.append(list(lines))
+            mangle_docstrings(app, 'function', 'func', None, None, out[-1])
+        return app.env, [l for ls in out for l in ls if l.startswith('.. [')]
+
+    env_a, labels_a = mangle_in('a')
+    assert_equal(labels_a, mangle_in('a')[1])
+    env_b, labels_b = mangle_in('b')
+    assert_equal(len(set(labels_a + labels_b)), 4)
+    assert_true(all(l.endswith('-1] Someone.') for l in labels_a))
+
+    # problems are recorded per document, and merged between environments
+    assert_equal(list(env_a.numpydoc_diagnostics), ['a'])
+    assert_equal([d.code for d in env_a.numpydoc_diagnostics['a']],
+                 ['unknown-section'] * 2)
+    merge_doc_state(None, env_a, ['b'], env_b)
+    assert_equal(sorted(env_a.numpydoc_diagnostics), ['a', 'b'])
+    purge_doc_state(None, env_a, 'a')
+    assert_equal(list(env_a.numpydoc_diagnostics), ['b'])
+
+
+def test_report_diagnostics():
+    app = MockApp()
+    app.env = MockEnv('a')
+    lines = ['Summary.', '', 'Nope', '----', 'Unknown section.']
+    for docname in ('a', 'b'):
+        # the same object documented in two documents
+        app.env.temp_data['docname'] = docname
+        mangle_docstrings(app, 'function', 'f', test_report_diagnostics,
+                          None, list(lines))
+    tmpdir = tempfile.mkdtemp()
+    try:
+        app.config.numpydoc_diagnostics_json = os.path.join(tmpdir, 'd.json')
+        report_diagnostics(app, None)
+        with open(app.config.numpydoc_diagnostics_json) as f:
+            reported = json.load(f)
+    finally:
+        shutil.rmtree(tmpdir)
+    assert_equal([(d['obj'].split('.')[-1], d['code']) for d in reported],
+                 [('test_report_diagnostics', 'unknown-section')])
+
+    # source files are looked up afresh by each build
+    assert_true(diagnostics_module._module_files)
+    update_config(app)
+    assert_equal(diagnostics_module._module_files, {})
+
+
+def test_see_also_index():
+    app = MockApp()
+    app.env = MockEnv('a')
+    app.env.domaindata = {'py': {'objects': {'pkg.mod.Cls': None,
+                                             'pkg.mod.Cls.meth': None,
+                                             'pkg.other.meth': None},
+                                 'modules': {'pkg.mod': None}}}
+    lines = ['Summary.', '', 'See Also', '--------',
+             'Cls, meth, pkg.mod, :ref:`label`', 'func2 : Sibling.',
+             'other.meth', 'fucn']
+    mangle_docstrings(app, 'function', 'pkg.mod.func', None, None, lines)
+    app.env.temp_data['docname'] = 'b'
+    mangle_docstrings(app, 'function', 'pkg.mod.func2', None, None,
+                      ['Summary.'])
+
+    check_see_also(app, app.env)
+    assert_true('pkg.mod.func2' in app.numpydoc_name_index)
+    messages = [d.message for d in app.numpydoc_see_also_diagnostics]
+    assert_equal(messages, [
+        "See Also target 'meth' is ambiguous, it may be any of "
+        "pkg.mod.Cls.meth, pkg.other.meth",
+        "See Also target 'other.meth' is not found relative to the "
+        "documented object; use 'pkg.other.meth'",
+        "See Also target 'fucn' not found; did you mean pkg.mod.func or "
+        "pkg.mod.func2?"])
+    assert_equal(set(d.obj for d in app.numpydoc_see_also_diagnostics),
+                 set(['pkg.mod.func']))
+
+    app.config.numpydoc_resolve_see_also = True
+    check_see_also(app, app.env)
+    assert_equal(len(app.numpydoc_see_also_diagnostics), 2)
+
+
+def test_relabel_references():
+    label = 'R0a1b2c3d4e5f6a7b0-foo'
+    doctree = nodes.section()
+    citation = nodes.citation()
+    citation += nodes.label(label, label)
+    reference = nodes.citation_reference('[%s]' % label, '[%s]' % label)
+    xref = addnodes.pending_xref(label, refdomain='citation', reftype='ref')
+    xref += nodes.inline(label, '[%s]' % label)
+    other = nodes.paragraph('', '[%s]' % label)
+    other_inline = nodes.paragraph('', '')
+    other_inline += nodes.inline('', '[%s]' % label)
+    doctree += [citation, reference, xref, other, other_inline]
+    relabel_references(None, doctree)
+    assert_equal(citation[0].astext(), 'foo')
+    assert_equal(reference.astext(), '[foo]')
+    assert_equal(xref.astext(), '[foo]')
+    assert_equal(other.astext(), '[%s]' % label)
+    assert_equal(other_inline.astext(), '[%s]' % label)
+
+
+def _render_corpus():
+    """(what, obj) pairs and their docstrings covering all sections"""
+    from numpydoc import docscrape, docscrape_sphinx, validate
+    from numpydoc.tests import test_docscrape
+    corpus = []
+    for module in (docscrape, docscrape_sphinx, validate):
+        for name in sorted(vars(module)):
+            obj = getattr(module, name)
+            if (getattr(obj, '__module__', None) == module.__name__ and
+                    getattr(obj, '__doc__', None)):
+                what = 'class' if isinstance(obj, type) else 'function'
+                corpus.append((what, obj, None))
+    for name in ('doc_txt', 'doc_yields_txt', 'class_doc_txt'):
+        corpus.append(('object', None, getattr(test_docscrape, name)))
+    return corpus
+
+
+def test_concurrent_rendering():
+    import threading
+    import pydoc
+
+    app = MockApp()
+    corpus = _render_corpus()
+
+    def render(item):
+        what, obj, doc = item
+        if doc is None:
+            doc = pydoc.getdoc(obj)
+        lines = doc.split('\n')
+        mangle_docstrings(app, what, 'name', obj, None, lines)
+        return lines
+
+    expected = [render(item) for item in corpus]
+
+    n_threads = 8
+    results = [None] * n_threads
+    errors = []
+
+    def worker(i):
+        try:
+            results[i] = [render(item) for item in corpus * 3]
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=worker, args=(i,))
+               for i in range(n_threads)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert_equal(errors, [])
+    labels = []
+    for result in results:
+        assert_equal(len(result), 3 * len(expected))
+        for lines, expected_lines in zip(result, expected * 3):
+            # citation labels differ, and are unique across the build
+            labels.extend(l.strip() for l in lines
+                          if l.strip().startswith('.. [R'))
+            strip = lambda ls: [l for l in ls if '[R' not in l]
+            assert_equal(strip(lines), strip(expected_lines))
+    assert_true(labels)
+    assert_equal(len(labels), len(set(labels)))
@@ -0,0 +1,94 @@
+# -*- encoding:utf-8 -*-
+from __future__ import division, absolute_import, print_function
+
+import threading
+import types
+
+from nose.tools import assert_equal, assert_true
+
+from numpydoc.prefetch import Prefetcher, PrefetchStore, iter_members
+
+
+def _module():
+    module = types.ModuleType('prefetch_example')
+
+    def func():
+        pass
+
+    def _private():
+        pass
+
+    class Cls(object):
+        def meth(self):
+            pass
+
+        def _hidden(self):
+            pass
+
+    for obj in (func, _private, Cls):
+        obj.__module__ = module.__name__
+        setattr(module, obj.__name__, obj)
+    module.imported = threading.Thread
+    return module, func, Cls
+
+
+def test_iter_members():
+    module, func, Cls = _module()
+    assert_equal(list(iter_members(module)),
+                 [('class', Cls), ('method', Cls.__dict__['meth']),
+                  ('function', func)])
+    module.__all__ = ['func']
+    assert_equal(list(iter_members(module)), [('function', func)])
+
+
+def test_prefetcher():
+    module, func, Cls = _module()
+    done = []
+    finished = threading.Event()
+
+    def task(what, obj):
+        done.append((what, obj))
+        if len(done) == 3:
+            finished.set()
+
+    prefetcher = Prefetcher(task, workers=2)
+    assert_equal(prefetcher.submit_module(module), 3)
+    # modules are only queued once
+    assert_equal(prefetcher.submit_module(module), 0)
+    assert_true(finished.wait(5))
+    assert_equal(sorted(what for what, obj in done),
+                 ['class', 'function', 'method'])
+    prefetcher.cancel()
+    assert_equal(prefetcher.submit_module(types.ModuleType('other')), 0)
+
+
+def test_prefetcher_bounded():
+    module, func, Cls = _module()
+    release = threading.Event()
+    prefetcher = Prefetcher(lambda what, obj: release.wait(5), workers=1,
+                            max_pending=1)
+    # at most one object waits while the worker is busy, the rest is
+    # left to be processed on demand
+    assert_true(prefetcher.submit_module(module) < 3)
+    prefetcher.cancel()
+    release.set()
+
+
+def test_prefetch_store():
+    store = PrefetchStore(size=2)
+    for key in 'abc':
+        store.put(key, key.upper())
+    # the oldest entries are dropped, and entries are evicted when used
+    assert_true('a' not in store)
+    assert_equal(store.pop('b'), 'B')
+    assert_equal(store.pop('b'), None)
+    assert_equal(len(store), 1)
+
+    # and at most max_modules modules are prefetched
+    other = types.ModuleType('other')
+    other.func = lambda: None
+    other.func.__module__ = 'other'
+    prefetcher = Prefetcher(lambda what, obj: None, max_modules=1)
+    assert_equal(prefetcher.submit_module(_module()[0]), 3)
+    assert_equal(prefetcher.submit_module(other), 0)
+    prefetcher.cancel()
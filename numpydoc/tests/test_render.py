@@ -0,0 +1,112 @@
+# -*- encoding:utf-8 -*-
+from __future__ import division, absolute_import, print_function
+
+import textwrap
+
+from nose.tools import assert_equal, assert_true
+
+from numpydoc.docscrape import NumpyDocString, FunctionDoc
+from numpydoc import render as render_module
+from numpydoc.render import (render, iter_render, iter_blocks, RENDERERS,
+                             register_renderer, Renderer)
+
+
+doc_txt = textwrap.dedent('''
+    Summary with ``code`` and :func:`~mod.func`.
+
+    Parameters
+    ----------
+    x : int
+        The *x* <value>.
+
+    See Also
+    --------
+    other : Another [1]_.
+
+    Notes
+    -----
+    A list:
+
+    - one
+    - two
+
+    Literal::
+
+        a = 1
+
+    References
+    ----------
+    .. [1] A reference.
+
+    Examples
+    --------
+    >>> 1 + 1
+    2
+    ''')
+
+
+def test_iter_blocks():
+    blocks = list(iter_blocks(['Para', 'graph::', '', '    code', '',
+                               '- a', '- b', '', '>>> x', '1']))
+    assert_equal(blocks, [('paragraph', ['Para', 'graph:']),
+                          ('code', ['code']),
+                          ('list', [['a'], ['b']]),
+                          ('doctest', ['>>> x', '1'])])
+
+
+def test_markdown():
+    md = render(doc_txt, 'markdown')
+    assert_true(md.startswith('Summary with `code` and `func`.\n\n'), md)
+    assert_true('- **x** : *int*\n\n    The *x* \\<value\\>.\n' in md, md)
+    assert_true('- `other`\n\n    Another \\[1\\].\n' in md, md)
+    assert_true('- one\n- two\n' in md, md)
+    assert_true('Literal:\n\n```\na = 1\n```' in md, md)
+    assert_true('```python\n>>> 1 + 1\n2\n```' in md, md)
+
+
+def test_html():
+    html = render(doc_txt, 'html')
+    assert_true('<dt><strong>x</strong> : <span class="numpydoc-type">int'
+                '</span></dt>\n<dd><p>The <em>x</em> &lt;value&gt;.</p>'
+                in html, html)
+    assert_true('<pre><code class="language-python">&gt;&gt;&gt; 1 + 1\n2'
+                in html, html)
+    assert_true('<p>[1] A reference.</p>' in html, html)
+
+
+def test_signature_stars():
+    def f(a, *args, **kw):
+        """Summary."""
+    doc = FunctionDoc(f)
+    md = ''.join(iter_render(doc, 'markdown'))
+    assert_true(md.startswith('```\nf(a, *args, **kw)\n```'), md)
+    html = ''.join(iter_render(doc, 'html'))
+    assert_true('f(a, *args, **kw)' in html, html)
+
+
+def test_text_and_ansi():
+    text = render(doc_txt, 'text')
+    assert_true('Parameters\n----------\nx : int\n    The x <value>.\n'
+                in text, text)
+    assert_true('\x1b[1mx\x1b[0m : int' in render(doc_txt, 'ansi'))
+
+
+def test_streaming_and_cache():
+    doc = NumpyDocString(doc_txt)
+    for fmt in RENDERERS:
+        assert_equal(''.join(iter_render(doc, fmt)), render(doc_txt, fmt))
+    assert_true(render_module._caches['html'][doc_txt] is
+                render(doc_txt, 'html'))
+
+
+def test_register_renderer():
+    @register_renderer('names')
+    class NameRenderer(Renderer):
+        def __iter__(self):
+            for name, type_, desc in self.doc['Parameters']:
+                yield name + '\n'
+    try:
+        assert_equal(render(doc_txt, 'names'), 'x\n')
+    finally:
+        del RENDERERS['names']
+        render_module._caches.pop('names', None)
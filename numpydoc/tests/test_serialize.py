@@ -0,0 +1,53 @@
+# -*- encoding:utf-8 -*-
+from __future__ import division, absolute_import, print_function
+
+import textwrap
+
+from numpydoc.docscrape import NumpyDocString
+from numpydoc.docscrape_sphinx import SphinxDocString
+from numpydoc.serialize import dumps, loads, decode, DecodeError
+from nose.tools import assert_equal, assert_raises, assert_true
+
+from numpydoc.tests.test_docscrape import doc_txt, doc_yields_txt
+
+
+def test_round_trip():
+    for text in (doc_txt, doc_yields_txt, '', 'Just a summary.'):
+        doc = NumpyDocString(text)
+        assert_equal(dict(loads(dumps(doc))), dict(doc))
+
+        sphinx_doc = loads(dumps(doc), cls=SphinxDocString)
+        assert_true(isinstance(sphinx_doc, SphinxDocString))
+        assert_equal(str(sphinx_doc), str(SphinxDocString(text)))
+
+
+def test_unicode_and_interning():
+    doc = NumpyDocString(textwrap.dedent(u"""
+        Summary with ünicode.
+
+        Parameters
+        ----------
+        a : int
+            Ñame.
+        b : int
+            Ñame.
+        """))
+    encoded = dumps(doc)
+    assert_equal(encoded.count(u'Ñame.'.encode('utf-8')), 1)
+    assert_equal(encoded.count(b'int'), 1)
+    assert_equal(decode(memoryview(encoded))['Summary'],
+                 [u'Summary with ünicode.'])
+
+
+def test_bad_input():
+    assert_raises(DecodeError, decode, b'nope')
+    assert_raises(DecodeError, decode, b'NPDS\xff')
+
+    # truncated anywhere, in the header, strings or records
+    encoded = dumps(NumpyDocString(doc_txt))
+    for end in range(len(encoded)):
+        assert_raises(DecodeError, decode, encoded[:end])
+    try:
+        decode(b'NPDS\x01')
+    except DecodeError as e:
+        assert_equal(str(e), 'Truncated data at offset 5')
@@ -0,0 +1,135 @@
+# -*- encoding:utf-8 -*-
+from __future__ import division, absolute_import, print_function
+
+import os
+import shutil
+import sys
+import tempfile
+import threading
+
+from numpydoc.docscrape import NumpyDocString
+from numpydoc.docscrape_sphinx import SphinxDocString
+from numpydoc import server
+from nose.tools import assert_equal, assert_raises, assert_true
+from nose import SkipTest
+
+from numpydoc.tests.test_docscrape import doc_txt
+
+
+def test_service():
+    service = server.RenderService()
+    response = service.handle({'id': 3, 'op': 'parse', 'docstring': doc_txt})
+    assert_equal(response['id'], 3)
+    assert_equal(response['result'], NumpyDocString(doc_txt).to_dict())
+
+    response = service.handle({'op': 'render', 'docstring': doc_txt})
+    assert_equal(response['result'], str(SphinxDocString(doc_txt)))
+
+    response = service.handle({'op': 'render',
+                               'object': 'numpydoc.docscrape.dedent_lines'})
+    assert_true('Deindent a list of lines' in response['result'])
+
+    response = service.handle({'op': 'validate',
+                               'object': 'numpydoc.validate.validate_object'})
+    assert_equal(response['result'], [])
+
+    for bad in ({'op': 'nope', 'docstring': ''}, {'op': 'render'},
+                {'op': 'render', 'object': 'numpydoc.nonexistent'}):
+        assert_true('error' in service.handle(bad))
+    assert_true(b'"error"' in service.handle_line(b'[1, 2'))
+
+
+def test_result_cache():
+    service = server.RenderService(cache_size=2)
+    calls = []
+    op_render = service.op_render
+
+    def counting_render(*args):
+        calls.append(args)
+        return op_render(*args)
+    service.op_render = counting_render
+
+    for docstring in ('A.', 'B.', 'A.', 'C.', 'B.'):
+        service.handle({'op': 'render', 'docstring': docstring})
+    assert_equal([args[0] for args in calls], ['A.', 'B.', 'C.', 'B.'])
+
+    service.handle({'op': 'render', 'docstring': 'C.',
+                    'config': {'use_plots': True}})
+    assert_equal(len(calls), 5)
+
+
+def test_stale_objects():
+    tmpdir = tempfile.mkdtemp()
+    filename = os.path.join(tmpdir, 'npdserver_mod.py')
+
+    def write(source, delay):
+        with open(filename, 'w') as f:
+            f.write(source)
+        # make sure the modification time changes
+        stat = os.stat(filename)
+        os.utime(filename, (stat.st_atime, stat.st_mtime + delay))
+
+    sys.path.insert(0, tmpdir)
+    try:
+        service = server.RenderService(cache_size=2)
+        request = {'op': 'render', 'object': 'npdserver_mod.f'}
+        write('def f():\n    "Old summary."\n', 0)
+        assert_true('Old summary.' in service.handle(request)['result'])
+
+        # the module is imported again once its source changes
+        write('def f():\n    "New summary."\n', 10)
+        assert_true('New summary.' in service.handle(request)['result'])
+
+        # any error raised while importing is reported
+        write('def f(:\n', 20)
+        assert_true(service.handle(request)['error'].startswith(
+            'SyntaxError'))
+
+        # imported objects are bounded too
+        for name in ('Reader', 'NumpyDocString', 'ParseError'):
+            service.resolve('numpydoc.docscrape.' + name)
+        assert_equal(len(service._objects), 2)
+    finally:
+        sys.path.remove(tmpdir)
+        sys.modules.pop('npdserver_mod', None)
+        shutil.rmtree(tmpdir)
+
+
+def test_start_server_keeps_files():
+    if server.asyncio is None or not hasattr(server.socket, 'AF_UNIX'):
+        raise SkipTest("needs asyncio and Unix sockets")
+    tmpdir = tempfile.mkdtemp()
+    path = os.path.join(tmpdir, 'not-a-socket')
+    with open(path, 'w') as f:
+        f.write('data')
+    loop = server.asyncio.new_event_loop()
+    try:
+        assert_raises(ValueError, server.start_server, path, loop=loop)
+        assert_true(os.path.exists(path))
+    finally:
+        loop.close()
+        shutil.rmtree(tmpdir)
+
+
+def test_unix_socket():
+    if server.asyncio is None or not hasattr(server.socket, 'AF_UNIX'):
+        raise SkipTest("needs asyncio and Unix sockets")
+    tmpdir = tempfile.mkdtemp()
+    path = os.path.join(tmpdir, 'numpydoc.sock')
+    loop = server.asyncio.new_event_loop()
+    try:
+        srv = server.start_server(path, loop=loop)
+        thread = threading.Thread(target=loop.run_forever)
+        thread.start()
+        try:
+            rendered = server.request(path, 'render', docstring=doc_txt)
+            assert_equal(rendered, str(SphinxDocString(doc_txt)))
+            assert_raises(RuntimeError, server.request, path, 'render')
+        finally:
+            loop.call_soon_threadsafe(loop.stop)
+            thread.join()
+            srv.close()
+            loop.run_until_complete(srv.wait_closed())
+    finally:
+        loop.close()
+        shutil.rmtree(tmpdir)
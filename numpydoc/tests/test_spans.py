@@ -0,0 +1,74 @@
+# -*- encoding:utf-8 -*-
+from __future__ import division, absolute_import, print_function
+
+from nose.tools import assert_equal, assert_true
+
+from numpydoc.docscrape import NumpyDocString
+from numpydoc.spans import SpanDocString, Span
+
+from numpydoc.tests.test_docscrape import doc_txt, class_doc_txt
+
+
+def _params(section):
+    return [(p.name.text, p.type.text, p.desc.lines())
+            for p in section.params]
+
+
+def test_same_structure_as_numpydocstring():
+    for text in (doc_txt, class_doc_txt):
+        doc = NumpyDocString(text)
+        spans = SpanDocString(text)
+        assert_equal(spans.summary.lines(), doc['Summary'])
+        for name in NumpyDocString._param_sections:
+            if doc[name]:
+                assert_equal(_params(spans[name]), doc[name])
+            else:
+                assert_true(name not in spans)
+        for name in ('Notes', 'Examples', 'References'):
+            if doc[name]:
+                assert_equal(spans[name].body.lines(), doc[name])
+
+
+def test_offsets():
+    text = '''
+    func(x, y=1)
+
+    Summary of
+    the function.
+
+    More.
+
+    parameter
+    ---------
+    x : int
+        The x.
+
+        More about x.
+    y
+
+    Nope
+    ----
+    Unknown.
+    '''
+    doc = SpanDocString(text)
+    assert_equal(doc.signature.text, '    func(x, y=1)')
+    assert_equal(doc.summary.text, '    Summary of\n    the function.')
+    assert_equal(doc.extended_summary.text, '    More.')
+    assert_equal([s.name for s in doc.sections], ['Parameters', 'Nope'])
+
+    section = doc['Parameters']
+    assert_equal(section.title.text, 'parameter')
+    assert_equal(section.title.position(), (8, 4))
+    (x, int_, desc), (y, no_type, no_desc) = section.params
+    for span in (x, int_, desc, y):
+        assert_equal(text[span.start:span.end], span.text)
+    assert_equal((x.text, int_.text), ('x', 'int'))
+    assert_equal(int_.position(), (10, 8))
+    assert_equal(desc.lines(), ['The x.', '', 'More about x.'])
+    assert_equal((y.text, len(no_type), len(no_desc)), ('y', 0, 0))
+    assert_equal(doc['Nope'].body.text, '    Unknown.')
+    assert_equal(Span(text, 0, 4), Span(text, 0, 4))
+    assert_true(Span(text, 0, 4) != Span(text, 0, 5))
+
+    # parameters are split as by NumpyDocString
+    assert_equal(_params(section), NumpyDocString(text)['Parameters'])
@@ -0,0 +1,253 @@
+# -*- encoding:utf-8 -*-
+from __future__ import division, absolute_import, print_function
+
+import os
+import shutil
+import sys
+import tempfile
+import textwrap
+
+from numpydoc.validate import validate_object, validate_package, main
+from nose.tools import assert_equal, assert_raises, assert_true
+
+
+def codes(diagnostics):
+    return [entry.code for entry in diagnostics]
+
+
+def test_parameters_match_signature():
+    def good(a, b=1, *args, **kwargs):
+        """Summary.
+
+        Parameters
+        ----------
+        a, b : int
+            Numbers.
+        *args
+            More.
+        \\*\\*kwargs
+            Even more.
+        """
+
+    def bad(a, c):
+        """Summary.
+
+        Parameters
+        ----------
+        a : int
+            A number.
+        b : int
+            Another number.
+        """
+
+    assert_equal(codes(validate_object(good)), [])
+    messages = [entry.message for entry in validate_object(bad)]
+    assert_equal(messages,
+                 ["Parameter 'b' is documented but not in the signature",
+                  "Parameter 'c' is not documented"])
+
+
+def test_returns_and_yields():
+    def gen():
+        """Summary.
+
+        Returns
+        -------
+        int
+
+        Yields
+        ------
+        int
+        """
+    assert_equal(codes(validate_object(gen)), ['returns-and-yields'])
+
+
+def test_section_order():
+    def func():
+        """Summary.
+
+        Notes
+        -----
+        A note.
+
+        See Also
+        --------
+        other
+        """
+    diagnostics = list(validate_object(func))
+    assert_equal(codes(diagnostics), ['section-order'])
+    assert_equal(diagnostics[0].message,
+                 'Section See Also should come before Notes')
+
+    # underlined output is not a section
+    def table():
+        """Summary.
+
+        Examples
+        --------
+        >>> print_table()
+        Notes
+        -----
+        """
+    assert_equal(codes(validate_object(table)), [])
+
+
+def test_unknown_rules():
+    assert_raises(SystemExit, main, ['numpydoc', '--rules',
+                                     'section-order,nope'])
+
+
+def test_see_also():
+    def func():
+        """Summary.
+
+        See Also
+        --------
+        :meth:`spam`, :bogus:`eggs`, ham-and-eggs
+        """
+    assert_equal([entry.message for entry in validate_object(func)],
+                 ["See Also target 'eggs' has unknown role 'bogus'",
+                  "See Also target 'ham-and-eggs' is not a valid name"])
+
+
+def test_custom_rules():
+    def no_examples(doc, obj):
+        if not doc['Examples']:
+            yield 'No examples'
+
+    def func():
+        """Summary."""
+    diagnostics = validate_object(func, rules=[('examples', no_examples)])
+    assert_equal(codes(diagnostics), ['examples'])
+
+
+def test_validate_package():
+    tmpdir = tempfile.mkdtemp()
+    try:
+        pkgdir = os.path.join(tmpdir, 'npdvalpkg')
+        os.mkdir(pkgdir)
+        with open(os.path.join(pkgdir, '__init__.py'), 'w') as f:
+            f.write('')
+        with open(os.path.join(pkgdir, 'mod.py'), 'w') as f:
+            f.write(textwrap.dedent('''
+                def func(a):
+                    """Summary.
+
+                    Parameters
+                    ----------
+                    b : int
+                        Not a.
+                    """
+
+
+                class Klass(object):
+                    def method(self, x):
+                        """Summary.
+
+                        Parameters
+                        ----------
+                        x : int
+                            An x.
+                        """
+                '''))
+        cache = os.path.join(tmpdir, 'cache.json')
+        sys.path.insert(0, tmpdir)
+        try:
+            results = validate_package('npdvalpkg', cache=cache)
+        finally:
+            sys.path.remove(tmpdir)
+        assert_equal(codes(results), ['parameters', 'parameters'])
+        assert_true(results[0].obj.endswith('func'))
+        assert_equal(results[0].line, 2)
+
+        # unchanged modules are not even imported again
+        sys.modules.pop('npdvalpkg.mod')
+        assert_equal(validate_package('npdvalpkg', cache=cache), results)
+        assert_true('npdvalpkg.mod' not in sys.modules)
+    finally:
+        shutil.rmtree(tmpdir)
+        sys.modules.pop('npdvalpkg', None)
+        sys.modules.pop('npdvalpkg.mod', None)
+
+
+def test_reexported_objects():
+    tmpdir = tempfile.mkdtemp()
+    pkgdir = os.path.join(tmpdir, 'npdvalpkg2')
+    modules = {
+        '__init__': '''
+            from ._impl import func, Sub
+            __all__ = ['func', 'Sub']
+            ''',
+        'mod': '''
+            from ._impl import func
+            __all__ = ['func']
+            ''',
+        '_impl': '''
+            from ._base import Base
+
+
+            def func(a, b):
+                """Summary.
+
+                Parameters
+                ----------
+                a : int
+                    An a.
+                """
+
+
+            class Sub(Base):
+                """Summary."""
+
+                def method(self, x):
+                    pass
+            ''',
+        '_base': '''
+            class Base(object):
+                def method(self, x):
+                    """Summary.
+
+                    Parameters
+                    ----------
+                    y : int
+                        Not x.
+                    """
+            '''}
+
+    def write(name, source):
+        with open(os.path.join(pkgdir, name + '.py'), 'w') as f:
+            f.write(textwrap.dedent(source))
+
+    def validate():
+        for name in list(sys.modules):
+            if name.startswith('npdvalpkg2'):
+                del sys.modules[name]
+        return [(d.obj, d.message) for d in
+                validate_package('npdvalpkg2', cache=cache)]
+
+    try:
+        os.mkdir(pkgdir)
+        for name, source in modules.items():
+            write(name, source)
+        cache = os.path.join(tmpdir, 'cache.json')
+        sys.path.insert(0, tmpdir)
+        try:
+            # found through __all__, and reported once
+            assert_equal(validate(), [
+                ('npdvalpkg2._impl.func', "Parameter 'b' is not documented"),
+                ('npdvalpkg2._impl.Sub.method',
+                 "Parameter 'x' is not documented"),
+                ('npdvalpkg2._impl.Sub.method',
+                 "Parameter 'y' is documented but not in the signature")])
+
+            # inherited docstrings are validated again when they change
+            write('_base', modules['_base'].replace('y : int', 'x : int')
+                                            .replace('Not x.', 'The x.'))
+            assert_equal(len(validate()), 1)
+        finally:
+            sys.path.remove(tmpdir)
+    finally:
+        shutil.rmtree(tmpdir)
+        for name in list(sys.modules):
+            if name.startswith('npdvalpkg2'):
+                del sys.modules[name]
@@ -0,0 +1,503 @@
+"""Check docstrings of a whole package against the numpydoc conventions.
+
+Each public object is parsed with :class:`~numpydoc.docscrape.NumpyDocString`
+and passed through a set of rules.  Rules are plain functions registered
+with :func:`register_rule`; they take the parsed docstring and the
+documented object, and yield one message per problem found.
+
+Modules are validated in parallel worker processes, and results are cached
+per module, keyed on a hash of its source and of the files the docstrings
+it exports come from, so that re-validating an unchanged package does not
+even import it.  Results are
+:class:`~numpydoc.diagnostics.Diagnostic` records, and can be written as
+JSON::
+
+    python -m numpydoc.validate mypackage --jobs 4 --cache .numpydoc-cache
+
+"""
+from __future__ import division, absolute_import, print_function
+
+import argparse
+import collections
+import hashlib
+import importlib
+import inspect
+import io
+import json
+import os
+import pkgutil
+import re
+import sys
+
+from .docscrape import NumpyDocString, ParseError, section_name
+from .diagnostics import (Diagnostic, DiagnosticsCollector,
+                          _module_source_file)
+from . import __version__
+
+try:
+    from concurrent.futures import ProcessPoolExecutor
+except ImportError:  # Python 2 without the futures backport
+    ProcessPoolExecutor = None
+
+
+RULES = collections.OrderedDict()
+
+
+def register_rule(code):
+    """Decorator adding a function to the default rule set.
+
+    The function is called as ``rule(doc, obj)``, with ``doc`` the parsed
+    :class:`~numpydoc.docscrape.NumpyDocString` of ``obj``, and should
+    yield a message for every problem it finds.  Rules are run in worker
+    processes, so they must be importable module-level functions.
+
+    Parameters
+    ----------
+    code : str
+        Identifier reported along with the messages of the rule.
+    """
+    def decorator(func):
+        RULES[code] = func
+        return func
+    return decorator
+
+
+# ------------------------------------------------------------------------------
+# Rules
+# ------------------------------------------------------------------------------
+
+def _signature_params(obj):
+    """Names of the parameters of ``obj``, or None if not introspectable"""
+    if inspect.isclass(obj):
+        obj = obj.__init__
+        if not (inspect.isfunction(obj) or inspect.ismethod(obj)):
+            return None  # no Python-level __init__
+    try:
+        if sys.version_info[0] >= 3:
+            sig = inspect.signature(obj)
+            names = []
+            for param in sig.parameters.values():
+                if param.kind == param.VAR_POSITIONAL:
+                    names.append('*' + param.name)
+                elif param.kind == param.VAR_KEYWORD:
+                    names.append('**' + param.name)
+                else:
+                    names.append(param.name)
+        else:
+            argspec = inspect.getargspec(obj)
+            names = list(argspec.args)
+            if argspec.varargs:
+                names.append('*' + argspec.varargs)
+            if argspec.keywords:
+                names.append('**' + argspec.keywords)
+    except (TypeError, ValueError):
+        return None
+    if names and names[0] in ('self', 'cls'):
+        names = names[1:]
+    return names
+
+
+def _normalize_param(name):
+    return name.strip().replace('\\', '').lstrip('*')
+
+
+@register_rule('parameters')
+def check_parameters(doc, obj):
+    """Documented parameters must match the signature"""
+    documented = []
+    for section in ('Parameters', 'Other Parameters'):
+        for names, _, _ in doc[section]:
+            documented.extend(_normalize_param(name)
+                              for name in names.split(','))
+    if not documented or not callable(obj):
+        return
+    params = _signature_params(obj)
+    if params is None:
+        return
+    params = [_normalize_param(name) for name in params]
+
+    for name in documented:
+        if name not in params:
+            yield ("Parameter '%s' is documented but not in the signature"
+                   % name)
+    for name in params:
+        if name not in documented:
+            yield "Parameter '%s' is not documented" % name
+
+
+CANONICAL_ORDER = ['Parameters', 'Attributes', 'Methods', 'Returns',
+                   'Yields', 'Other Parameters', 'Raises', 'Warns',
+                   'Warnings', 'See Also', 'Notes', 'References', 'Examples']
+
+
+def _section_headers(doc):
+    """Yield the section names of ``doc``, in order of appearance.
+
+    Sections are found again as the parser found them, so that, say,
+    underlined output in Examples is not taken for a section.
+    """
+    reader = doc._doc
+    reader.reset()
+    while not doc._is_at_section() and not reader.eof():
+        reader.read_to_next_empty_line()
+    for name, content in doc._read_sections():
+        if not name.startswith('..'):
+            yield section_name(name)
+
+
+@register_rule('section-order')
+def check_section_order(doc, obj):
+    """Sections must appear in the order of the numpydoc format guide"""
+    last = -1
+    last_name = None
+    for name in _section_headers(doc):
+        if name not in CANONICAL_ORDER:
+            continue
+        position = CANONICAL_ORDER.index(name)
+        if position < last:
+            yield "Section %s should come before %s" % (name, last_name)
+        else:
+            last, last_name = position, name
+
+
+_see_also_name_re = re.compile(r'^~?[a-zA-Z_]\w*(\.[a-zA-Z_]\w*)*$')
+_see_also_roles = frozenset(['func', 'meth', 'class', 'obj', 'attr', 'mod',
+                             'data', 'exc', 'const', 'ref', 'c:func',
+                             'c:type', 'c:data', 'c:macro', 'c:member'])
+
+
+@register_rule('see-also')
+def check_see_also(doc, obj):
+    """See Also targets must be valid, optionally role-qualified, names"""
+    for name, desc, role in doc['See Also']:
+        if not _see_also_name_re.match(name):
+            yield "See Also target '%s' is not a valid name" % name
+        if role is not None and role not in _see_also_roles:
+            yield "See Also target '%s' has unknown role '%s'" % (name, role)
+
+
+# ------------------------------------------------------------------------------
+# Drivers
+# ------------------------------------------------------------------------------
+
+def validate_object(obj, rules=None, diagnostics=None, doc=None):
+    """Validate the docstring of a single object.
+
+    Parameters
+    ----------
+    obj : object
+        The documented object.
+    rules : sequence of (code, callable) pairs, optional
+        The rules to apply.  Defaults to all registered rules.
+    diagnostics : DiagnosticsCollector, optional
+        Where problems are recorded.  A new collector is made if not given.
+    doc : str, optional
+        The docstring, if not that of ``obj``.
+
+    Returns
+    -------
+    diagnostics : DiagnosticsCollector
+    """
+    if rules is None:
+        rules = list(RULES.items())
+    if diagnostics is None:
+        diagnostics = DiagnosticsCollector()
+    if doc is None:
+        doc = inspect.getdoc(obj) or ''
+
+    parse_diagnostics = DiagnosticsCollector()
+    try:
+        parsed = NumpyDocString(doc, config={'diagnostics':
+                                             parse_diagnostics})
+    except (ValueError, ParseError) as e:
+        parsed = None
+        if not len(parse_diagnostics):
+            diagnostics.add(obj, 'parse-error', e.args[0])
+    for entry in parse_diagnostics:
+        diagnostics.add(obj, entry.code, entry.message)
+    if parsed is None:
+        return diagnostics
+
+    for code, rule in rules:
+        for message in rule(parsed, obj):
+            diagnostics.add(obj, code, message)
+    return diagnostics
+
+
+def _is_private_module(modname):
+    return any(part.startswith('_') for part in modname.split('.'))
+
+
+def iter_public_objects(module):
+    """Find the public functions, classes and methods of a module.
+
+    With ``__all__``, these are the names it lists, wherever they were
+    defined.  Otherwise, they are the public names of objects defined in
+    the module or in a private module, such as ``package._impl``, whose
+    public API it re-exports.  Other imported objects are skipped.  Each
+    object is yielded once, under its first name.
+
+    Yields
+    ------
+    name : str
+        Fully qualified name, such as ``'package.module.Class.method'``.
+    obj : object
+    """
+    names = getattr(module, '__all__', None)
+    listed = names is not None
+    if not listed:
+        names = sorted(name for name in vars(module)
+                       if not name.startswith('_'))
+    seen = set()
+    for name in names:
+        obj = getattr(module, name, None)
+        if not (inspect.isclass(obj) or inspect.isroutine(obj)):
+            continue
+        defined_in = getattr(obj, '__module__', None) or ''
+        if not (listed or defined_in == module.__name__ or
+                _is_private_module(defined_in)):
+            continue  # imported from another public module, checked there
+        if id(obj) in seen:
+            continue
+        seen.add(id(obj))
+        qualname = '%s.%s' % (module.__name__, name)
+        yield qualname, obj
+        if inspect.isclass(obj):
+            for member_name, member in sorted(vars(obj).items()):
+                if member_name.startswith('_'):
+                    continue
+                if isinstance(member, (staticmethod, classmethod)):
+                    member = member.__func__
+                if inspect.isroutine(member) or isinstance(member, property):
+                    yield '%s.%s' % (qualname, member_name), member
+
+
+def _docstring_files(obj):
+    """Source files the docstrings of ``obj`` and its members may come from
+
+    Docstrings of classes and of their members may be inherited from base
+    classes defined in other files.
+    """
+    classes = inspect.getmro(obj) if inspect.isclass(obj) else [obj]
+    files = set()
+    for cls in classes:
+        modname = getattr(cls, '__module__', None)
+        filename = _module_source_file(modname) if modname else None
+        if filename is not None:
+            files.add(filename)
+    return files
+
+
+def validate_module(modname, rules=None, files=None):
+    """Validate all public objects of a module.
+
+    Parameters
+    ----------
+    modname : str
+    rules : sequence of (code, callable) pairs, optional
+    files : set, optional
+        Where the source files of the docstrings checked are added.
+
+    Returns
+    -------
+    results : list of Diagnostic
+    """
+    module = importlib.import_module(modname)
+    diagnostics = DiagnosticsCollector()
+    for name, obj in iter_public_objects(module):
+        validate_object(obj, rules, diagnostics)
+        if files is not None:
+            files.update(_docstring_files(obj))
+    return list(diagnostics)
+
+
+def iter_modules(package):
+    """Find the modules of a package without importing them.
+
+    Private modules, whose names start with an underscore, are skipped;
+    the API they define is found through the public modules re-exporting
+    it, see `iter_public_objects`.
+
+    Yields
+    ------
+    modname : str
+    filename : str
+    """
+    loader = pkgutil.get_loader(package)
+    if loader is None:
+        raise ImportError("No module named %s" % package)
+    filename = loader.get_filename(package)
+    if os.path.basename(filename) not in ('__init__.py', '__init__.pyc'):
+        yield package, filename
+        return
+
+    root = os.path.dirname(filename)
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = sorted(d for d in dirnames
+                             if not d.startswith(('_', '.')) and
+                             os.path.exists(os.path.join(dirpath, d,
+                                                         '__init__.py')))
+        relpath = os.path.relpath(dirpath, root)
+        prefix = package
+        if relpath != os.curdir:
+            prefix += '.' + relpath.replace(os.sep, '.')
+        for fname in sorted(filenames):
+            if not fname.endswith('.py'):
+                continue
+            if fname == '__init__.py':
+                modname = prefix
+            elif fname.startswith('_'):
+                continue
+            else:
+                modname = prefix + '.' + fname[:-3]
+            yield modname, os.path.join(dirpath, fname)
+
+
+def _file_hash(filename):
+    with open(filename, 'rb') as f:
+        return hashlib.sha1(f.read()).hexdigest()
+
+
+def _load_cache(path, key):
+    try:
+        with io.open(path, encoding='utf-8') as f:
+            cache = json.load(f)
+    except (IOError, OSError, ValueError):
+        return {}
+    if cache.get('key') != key:
+        return {}
+    return cache['files']
+
+
+def _save_cache(path, key, files):
+    with io.open(path, 'w', encoding='utf-8') as f:
+        f.write(json.dumps({'key': key, 'files': files}, ensure_ascii=False))
+
+
+def _validate_module_task(args):
+    modname, rules = args
+    files = set()
+    try:
+        results = [entry._asdict()
+                   for entry in validate_module(modname, rules, files)]
+    except Exception as e:
+        results = [Diagnostic(modname, None, None, 'import-error',
+                              '%s: %s' % (type(e).__name__, e))._asdict()]
+    return results, sorted(files)
+
+
+def _dependencies_changed(entry):
+    for filename, digest in entry.get('dependencies', {}).items():
+        try:
+            if _file_hash(filename) != digest:
+                return True
+        except (IOError, OSError):
+            return True
+    return False
+
+
+def validate_package(package, rules=None, jobs=1, cache=None):
+    """Validate all public objects of a package.
+
+    Parameters
+    ----------
+    package : str
+        Importable name of a package or module.
+    rules : sequence of (code, callable) pairs, optional
+        The rules to apply.  Defaults to all registered rules.
+    jobs : int
+        Number of worker processes.  With 1, modules are validated in this
+        process.
+    cache : str, optional
+        Path to a JSON file in which results are kept between runs.  Only
+        modules whose source, or the source of the docstrings they export
+        or inherit, changed since the last run are validated.
+
+    Returns
+    -------
+    results : list of Diagnostic
+        Sorted by file and line.  Objects exported by several modules are
+        only reported once.
+    """
+    if rules is None:
+        rules = list(RULES.items())
+    rules = list(rules)
+    cache_key = '%s:%s' % (__version__, ','.join(code for code, _ in rules))
+
+    modules = collections.OrderedDict(iter_modules(package))
+    cached = _load_cache(cache, cache_key) if cache else {}
+    files = {}
+    results = []
+    todo = []
+    for modname, filename in modules.items():
+        entry = cached.get(modname)
+        digest = _file_hash(filename)
+        if (entry is not None and entry['hash'] == digest and
+                not _dependencies_changed(entry)):
+            files[modname] = entry
+            results.extend(entry['results'])
+        else:
+            files[modname] = {'hash': digest}
+            todo.append(modname)
+
+    tasks = [(modname, rules) for modname in todo]
+    if jobs > 1 and len(tasks) > 1 and ProcessPoolExecutor is not None:
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            outputs = list(executor.map(_validate_module_task, tasks))
+    else:
+        outputs = [_validate_module_task(task) for task in tasks]
+    for modname, (output, dependencies) in zip(todo, outputs):
+        files[modname]['results'] = output
+        files[modname]['dependencies'] = dict(
+            (filename, _file_hash(filename)) for filename in dependencies
+            if filename != modules[modname])
+        results.extend(output)
+
+    if cache:
+        _save_cache(cache, cache_key, files)
+    # objects exported by several modules are reported once
+    results = sorted(set(Diagnostic(**entry) for entry in results),
+                     key=lambda d: (d.file or '', d.line or 0, d.obj or '',
+                                    d.code, d.message))
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Validate the docstrings of a package against the "
+                    "numpydoc conventions.")
+    parser.add_argument('package', help="importable package or module name")
+    parser.add_argument('-j', '--jobs', type=int, default=1,
+                        help="number of worker processes")
+    parser.add_argument('--cache',
+                        help="JSON file caching results of unchanged modules")
+    parser.add_argument('--rules',
+                        help="comma-separated codes of the rules to apply "
+                             "(default: all of %s)" % ', '.join(RULES))
+    parser.add_argument('--format', choices=['text', 'json'], default='text')
+    args = parser.parse_args(argv)
+
+    rules = None
+    if args.rules:
+        codes = args.rules.split(',')
+        unknown = [code for code in codes if code not in RULES]
+        if unknown:
+            parser.error('unknown rule code(s): %s' % ', '.join(unknown))
+        rules = [(code, RULES[code]) for code in codes]
+
+    results = validate_package(args.package, rules=rules, jobs=args.jobs,
+                               cache=args.cache)
+    if args.format == 'json':
+        print(json.dumps([entry._asdict() for entry in results], indent=1))
+    else:
+        for entry in results:
+            location = entry.file or entry.obj
+            if entry.line:
+                location = '%s:%d' % (location, entry.line)
+            print('%s: %s %s (in %s)' % (location, entry.code,
+                                         entry.message, entry.obj))
+    return 1 if results else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())